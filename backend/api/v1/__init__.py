@@ -7,6 +7,8 @@ from .routes.agents import router as agents_router
 from .routes.categories import router as categories_router
 from .routes.consultation import router as consultation_router
 from .routes.districts import router as districts_router
+from .routes.export import router as export_router
+from .routes.health import router as health_router
 from .routes.user_request import router as user_request_router
 from .routes.users import router as users_router
 from .routes.dev import dev_router
@@ -24,4 +26,6 @@ router.include_router(users_router)
 router.include_router(user_request_router)
 router.include_router(consultation_router)
 router.include_router(agents_router)
-router.include_router(dev_router)
\ No newline at end of file
+router.include_router(export_router)
+router.include_router(dev_router)
+router.include_router(health_router)
\ No newline at end of file
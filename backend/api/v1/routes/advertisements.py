@@ -1,15 +1,26 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from backend.app.config import config
 from backend.app.dependencies import get_repo
-from backend.core.filters.advertisement import AdvertisementFilter
+from backend.core.filters.advertisement import (
+    AdvertisementChangesFilter,
+    AdvertisementFilter,
+    AdvertisementSearchFilter,
+)
 from backend.core.interfaces.advertisement import (
+    AdvertisementChangeDTO,
+    AdvertisementChangesDTO,
     AdvertisementDetailDTO,
     AdvertisementDTO,
+    AdvertisementFacetsDTO,
+    FacetCountDTO,
     PaginatedAdvertisementDTO,
+    PriceRangeCountDTO,
 )
+from infrastructure.cache.facets import cache_facets, get_cached_facets
+from infrastructure.cache.unique_ids import find_advertisement_by_unique_id
 from infrastructure.database.repo.requests import RequestsRepo
 
 router = APIRouter(
@@ -24,7 +35,7 @@ async def get_advertisements(
     repo: Annotated[RequestsRepo, Depends(get_repo)],
 ) -> PaginatedAdvertisementDTO:
 
-    advertisements = await repo.advertisements.get_filtered_advertisements(filters)
+    advertisements = await repo.catalogue.get_filtered_advertisements(filters)
     count = advertisements["total_count"]
 
     advertisements = [
@@ -40,35 +51,115 @@ async def get_advertisements(
     )
 
 
+@router.get("/facets")
+async def get_advertisement_facets(
+    filters: Annotated[AdvertisementFilter, Query()],
+    repo: Annotated[RequestsRepo, Depends(get_repo)],
+) -> AdvertisementFacetsDTO:
+
+    cache_key, cached = await get_cached_facets(filters)
+    if cached is not None:
+        return AdvertisementFacetsDTO.model_validate_json(cached)
+
+    facets = await repo.advertisements.get_advertisement_facets(filters)
+
+    def counts(name):
+        return [FacetCountDTO(value=value, count=count) for value, count in facets[name]]
+
+    result = AdvertisementFacetsDTO(
+        total=facets["total"],
+        categories=counts("category_id"),
+        districts=counts("district_id"),
+        rooms=counts("rooms"),
+        repair_types=counts("repair_type"),
+        prices=[
+            PriceRangeCountDTO(price_from=price_from, price_to=price_to, count=count)
+            for price_from, price_to, count in facets["price_bucket"]
+        ],
+    )
+    await cache_facets(cache_key, result.model_dump_json())
+    return result
+
+
+@router.get("/search")
+async def search_advertisements(
+    filters: Annotated[AdvertisementSearchFilter, Query()],
+    repo: Annotated[RequestsRepo, Depends(get_repo)],
+) -> PaginatedAdvertisementDTO:
+
+    advertisements = await repo.advertisements.search_advertisements(filters)
+
+    return PaginatedAdvertisementDTO(
+        total=advertisements["total_count"],
+        limit=filters.limit,
+        offset=filters.offset,
+        results=[
+            AdvertisementDTO.model_validate(obj, from_attributes=True)
+            for obj in advertisements["data"]
+        ],
+    )
+
+
+@router.get("/changes")
+async def get_advertisement_changes(
+    filters: Annotated[AdvertisementChangesFilter, Query()],
+    repo: Annotated[RequestsRepo, Depends(get_repo)],
+) -> AdvertisementChangesDTO:
+    """Объявления, измененные после курсора, для инкрементальной синхронизации.
+
+    Клиент запоминает next_since и передает его в следующий раз; пока
+    has_more, можно запрашивать дальше сразу. Журнал хранится 30 дней.
+    """
+    after_txid, after_id = map(int, (filters.since or "0-0").split("-"))
+    rows = await repo.advertisements.get_changes(after_txid, after_id, filters.limit)
+
+    # в пределах страницы клиенту нужна только последняя операция по объявлению
+    changes = {}
+    for row in rows:
+        changes.pop(row.advertisement_id, None)
+        changes[row.advertisement_id] = AdvertisementChangeDTO(
+            id=row.advertisement_id, operation=row.operation, changed_at=row.changed_at
+        )
+
+    return AdvertisementChangesDTO(
+        next_since=f"{rows[-1].txid}-{rows[-1].id}" if rows else filters.since or "0-0",
+        has_more=len(rows) == filters.limit,
+        changes=list(changes.values()),
+    )
+
+
 @router.get("/{advertisement_id}")
 async def get_advertisement(
     advertisement_id: int,
     repo: Annotated[RequestsRepo, Depends(get_repo)],
-) -> AdvertisementDetailDTO | dict:
+) -> AdvertisementDetailDTO:
 
-    _advertisement = await repo.advertisements.get_advertisement_by_id(
+    _advertisement = await repo.catalogue.get_advertisement_by_id(
         advertisement_id=advertisement_id
     )
+    if _advertisement is None:
+        raise HTTPException(status_code=404, detail="Advertisement not found")
+
+    # связи и фотографии уже лежат в витрине в готовом виде
     advertisement = AdvertisementDetailDTO.model_validate(
         _advertisement, from_attributes=True
     )
-
-    related_objects = (
-        await repo.advertisements.get_advertisements_by_category_id_and_operation_type(
-            category_id=advertisement.category.id,
-            operation_type=_advertisement.operation_type,
-        )
-    )
-
-    advertisement.related_objects = related_objects
-
-    advertisement.images = sorted(
-        [i.model_dump() for i in advertisement.images],
-        key=lambda l: l["id"],
+    related_objects = await repo.catalogue.get_related_advertisements(
+        advertisement_id
     )
-
-    if advertisement is None:
-        return {"detail": "Advertisement not found"}
+    if not related_objects:
+        # рекомендации для новых объявлений появятся после следующего расчета
+        related_objects = (
+            await repo.catalogue.get_advertisements_by_category_id_and_operation_type(
+                category_id=_advertisement.category_id,
+                operation_type=_advertisement.operation_type,
+                exclude_id=advertisement_id,
+            )
+        )
+    advertisement.related_objects = [
+        AdvertisementDTO.model_validate(obj, from_attributes=True)
+        for obj in related_objects
+    ]
 
     return advertisement
 
@@ -78,9 +169,10 @@ async def get_advertisement_by_unique_id(
     unique_id: str,
     repo: Annotated[RequestsRepo, Depends(get_repo)],
 ):
-    advertisement = await repo.advertisements.get_advertisement_by_unique_id(
-        unique_id=unique_id
+    # для ответа связанные модели не нужны
+    advertisement = await find_advertisement_by_unique_id(
+        unique_id, repo, load=repo.advertisements.get_advertisement_without_relations
     )
     if advertisement is None:
-        return {"detail": "Advertisement not found"}
+        raise HTTPException(status_code=404, detail="Advertisement not found")
     return AdvertisementDTO.model_validate(advertisement, from_attributes=True)
@@ -1,11 +1,17 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from backend.app.config import config
 from backend.app.dependencies import get_repo
+from backend.core.filters.agent import AgentAdvertisementsFilter, AgentFilter
 from backend.core.interfaces.advertisement import AdvertisementDTO
-from backend.core.interfaces.agent import AgentDetailDTO, AgentListDTO
+from backend.core.interfaces.agent import (
+    AgentDetailDTO,
+    AgentListDTO,
+    PaginatedAgentDTO,
+)
+from infrastructure.cache.agents import cache_agents, get_cached_agents
 from infrastructure.database.repo.requests import RequestsRepo
 
 router = APIRouter(
@@ -16,22 +22,43 @@ router = APIRouter(
 
 @router.get("/")
 async def get_all_agents(
+    filters: Annotated[AgentFilter, Query()],
     repo: Annotated[RequestsRepo, Depends(get_repo)],
-) -> list[AgentListDTO]:
-    agents = await repo.users.get_users_by_role(role="REALTOR")
-    return agents
+) -> PaginatedAgentDTO:
+    cache_key, cached = await get_cached_agents(filters)
+    if cached is not None:
+        return PaginatedAgentDTO.model_validate_json(cached)
+
+    agents = await repo.catalogue.get_agents(limit=filters.limit, offset=filters.offset)
+    result = PaginatedAgentDTO(
+        total=agents["total_count"],
+        limit=filters.limit,
+        offset=filters.offset,
+        results=[
+            AgentListDTO.model_validate(row, from_attributes=True)
+            for row in agents["data"]
+        ],
+    )
+    await cache_agents(cache_key, result.model_dump_json())
+    return result
 
 
 @router.get("/{agent_id}/")
 async def get_agent_detail(
     agent_id: int,
+    filters: Annotated[AgentAdvertisementsFilter, Query()],
     repo: Annotated[RequestsRepo, Depends(get_repo)],
 ) -> AgentDetailDTO:
-    agent = await repo.users.get_user_by_id(user_id=agent_id)
-    advertisements = await repo.advertisements.get_user_advertisements(user_id=agent.id)
+    agent = await repo.catalogue.get_agent_summary(agent_id)
+    if agent is None:
+        raise HTTPException(status_code=404, detail="Agent not found")
+
+    advertisements = await repo.catalogue.get_agent_advertisements(
+        agent_id, limit=filters.limit, offset=filters.offset
+    )
     advertisements = [
-        AdvertisementDTO.model_validate(obj, from_attributes=True)
-        for obj in advertisements
+        AdvertisementDTO.model_validate(row, from_attributes=True)
+        for row in advertisements
     ]
 
     return AgentDetailDTO(
@@ -41,5 +68,10 @@ async def get_agent_detail(
         tg_username=agent.tg_username,
         phone_number=agent.phone_number,
         user_photo=agent.profile_image,
+        rent_count=agent.rent_count,
+        buy_count=agent.buy_count,
+        total=agent.rent_count + agent.buy_count,
+        limit=filters.limit,
+        offset=filters.offset,
         advertisements=advertisements,
     )
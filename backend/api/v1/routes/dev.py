@@ -1,10 +1,19 @@
 import math
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Path, Query
+from fastapi.responses import StreamingResponse
 from backend.app.config import config
-from backend.core.interfaces.advertisement import AdvertisementForReportDTO, PaginatedAdvertisementForReportDTO
+from backend.core.interfaces.advertisement import (
+    AdvertisementForReportDTO,
+    AdvertisementForReportFeedDTO,
+    PaginatedAdvertisementForReportDTO,
+)
+from backend.core.interfaces.analytics import MonthlyReportDTO
+from infrastructure.analytics.monthly_report import get_monthly_report
 
+from config.db_config import API
 from infrastructure.database.repo.requests import RequestsRepo
+from infrastructure.database.setup import get_session_pool
 
 from backend.app.dependencies import get_repo
 from typing import Annotated
@@ -48,4 +57,58 @@ async def get_all_advertisements(
         page_size=page_size,
         pages=pages,
         advertisements=advertisements,
-    )
\ No newline at end of file
+    )
+
+
+@dev_router.get('/advertisements/feed/', response_model=AdvertisementForReportFeedDTO)
+async def get_advertisements_feed(
+        repo: Annotated[RequestsRepo, Depends(get_repo)],
+        operation_type: str,
+        after_id: Annotated[int, Query(ge=0)] = 0,
+        limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+):
+    # постраничный обход по id: страницы не сдвигаются при добавлении объявлений
+    advertisements = await repo.advertisements.get_advertisements_by_operation_type_after(
+        operation_type=operation_type, after_id=after_id, limit=limit
+    )
+
+    return AdvertisementForReportFeedDTO(
+        next_after_id=advertisements[-1].id if len(advertisements) == limit else None,
+        advertisements=[
+            AdvertisementForReportDTO.model_validate(obj, from_attributes=True)
+            for obj in advertisements
+        ],
+    )
+
+
+@dev_router.get('/advertisements/stream/')
+async def stream_advertisements(operation_type: str) -> StreamingResponse:
+    # все объявления типа операции одним ответом, по объекту JSON на строку;
+    # сессию открывает генератор, зависимости закрываются до отправки тела
+    session_pool = get_session_pool(config.db, role=API)
+
+    async def lines():
+        async with session_pool() as session:
+            partitions = RequestsRepo(
+                session
+            ).advertisements.stream_advertisements_by_operation_type(operation_type)
+            async for partition in partitions:
+                yield "".join(
+                    AdvertisementForReportDTO.model_validate(
+                        obj, from_attributes=True
+                    ).model_dump_json()
+                    + "\n"
+                    for obj in partition
+                )
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@dev_router.get('/analytics/{year}/{month}/', response_model=MonthlyReportDTO)
+async def get_monthly_analytics(
+        repo: Annotated[RequestsRepo, Depends(get_repo)],
+        year: Annotated[int, Path(ge=2024, le=2100)],
+        month: Annotated[int, Path(ge=1, le=12)],
+):
+    # статистика объявлений, созданных за месяц, кешируется по месяцу
+    return await get_monthly_report(repo, year, month)
@@ -0,0 +1,45 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from backend.app.config import config
+from backend.app.dependencies import require_export_token
+from backend.core.filters.advertisement import AdvertisementFilter
+from config.db_config import API
+from infrastructure.database.setup import get_session_pool
+from infrastructure.export.advertisements import (
+    CONTENT_TYPES,
+    ExportFormat,
+    iter_csv,
+    iter_xlsx,
+)
+
+router = APIRouter(
+    prefix=config.api_prefix.v1.export,
+    tags=["Export"],
+    dependencies=[Depends(require_export_token)],
+)
+
+
+@router.get("/advertisements/{export_format}")
+async def export_advertisements(
+    export_format: ExportFormat,
+    filters: Annotated[AdvertisementFilter, Query()],
+) -> StreamingResponse:
+    # зависимости с yield закрываются до отправки тела ответа,
+    # поэтому сессию открывает сам генератор выгрузки
+    session_pool = get_session_pool(config.db, role=API)
+    if export_format == ExportFormat.csv:
+        content = iter_csv(session_pool, filters)
+    else:
+        content = iter_xlsx(session_pool, filters)
+    return StreamingResponse(
+        content,
+        media_type=CONTENT_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="advertisements.{export_format.value}"'
+            )
+        },
+    )
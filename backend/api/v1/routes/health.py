@@ -0,0 +1,32 @@
+import time
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import text
+
+from backend.app.config import config
+from backend.app.dependencies import get_repo
+from config.db_config import API
+from infrastructure.database.repo.requests import RequestsRepo
+from infrastructure.database.setup import get_engine, pool_status
+
+router = APIRouter(
+    prefix=config.api_prefix.v1.health,
+    tags=["Health"],
+)
+
+
+@router.get("/db")
+async def get_database_health(
+    repo: Annotated[RequestsRepo, Depends(get_repo)],
+) -> dict:
+    started = time.perf_counter()
+    await repo.session.execute(text("SELECT 1"))
+    ping_ms = (time.perf_counter() - started) * 1000
+
+    # статистика пула этого процесса, соединения всех процессов
+    # показывает python -m scripts.db_connections
+    return {
+        "ping_ms": round(ping_ms, 2),
+        "pool": pool_status(get_engine(config.db, role=API)),
+    }
@@ -1,16 +1,28 @@
+import hmac
+
+from fastapi import Header, HTTPException
+
 from backend.app.config import config
+from config.db_config import API
 from infrastructure.database.repo.requests import RequestsRepo
-from infrastructure.database.setup import create_engine, create_session_pool
+from infrastructure.database.setup import get_session_pool
 from infrastructure.googlesheets.main import GoogleSheet
 
-engine = create_engine(config.db, echo=True)
-session_pool = create_session_pool(engine)
-
 
 async def get_repo():
+    session_pool = get_session_pool(config.db, role=API)
     async with session_pool() as session:
         yield RequestsRepo(session)
 
 
 def get_google_sheet():
     return GoogleSheet(spreadsheet_id=config.google_sheet.spreadsheet_id)
+
+
+async def require_export_token(x_export_token: str = Header("")):
+    if not config.run_api.export_token:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not hmac.compare_digest(
+        x_export_token.encode(), config.run_api.export_token.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Invalid export token")
@@ -0,0 +1,129 @@
+import hmac
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from pyinstrument import Profiler
+from starlette.responses import Response
+
+from infrastructure.database.query_stats import collect_query_stats
+
+PROFILE_HEADER = b"x-profile-token"
+# запросы, не попавшие ни в один маршрут, пишем одной меткой
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUEST_DURATION = Histogram(
+    "api_request_duration_seconds",
+    "Время обработки запроса",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "api_response_size_bytes",
+    "Размер тела ответа",
+    ["method", "route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "api_request_db_queries",
+    "Количество запросов к базе за один запрос API",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_DURATION = Histogram(
+    "api_request_db_duration_seconds",
+    "Суммарное время запросов к базе за один запрос API",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware с гистограммами задержки, размера ответа и работы с базой.
+
+    Запрос с заголовком X-Profile-Token, равным ``profile_token``, вместо
+    ответа возвращает HTML отчет семплирующего профилировщика pyinstrument.
+    """
+
+    def __init__(self, app, profile_token: str = ""):
+        self.app = app
+        self.profile_token = profile_token.encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        if self._should_profile(scope):
+            return await self._profile(scope, receive, send)
+
+        status = 500
+        size = 0
+
+        async def send_with_metrics(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        started = time.perf_counter()
+        with collect_query_stats() as stats:
+            try:
+                await self.app(scope, receive, send_with_metrics)
+            finally:
+                elapsed = time.perf_counter() - started
+
+                # шаблон пути вида /advertisements/{advertisement_id}, а не сам путь
+                route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+                method = scope["method"]
+                REQUEST_DURATION.labels(method, route, status).observe(elapsed)
+                RESPONSE_SIZE.labels(method, route).observe(size)
+                REQUEST_DB_QUERIES.labels(method, route).observe(stats.queries)
+                REQUEST_DB_DURATION.labels(method, route).observe(stats.seconds)
+
+    def _should_profile(self, scope) -> bool:
+        if not self.profile_token:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, self.profile_token)
+        return False
+
+    async def _profile(self, scope, receive, send):
+        async def discard(message):
+            pass
+
+        # async_mode учитывает только этот запрос, а не соседние задачи loop
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+
+        response = Response(profiler.output_html(), media_type="text/html")
+        await response(scope, receive, send)
+
+
+async def metrics_endpoint() -> Response:
+    """Метрики в текстовом формате Prometheus.
+
+    При нескольких воркерах uvicorn метрики собираются из каталога
+    PROMETHEUS_MULTIPROC_DIR, иначе каждый воркер отдавал бы только свои.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -40,3 +40,17 @@ class AdvertisementFilter(BaseModel):
 
     limit: Optional[int] = Field(15)
     offset: Optional[int] = Field(0)
+
+
+class AdvertisementSearchFilter(BaseModel):
+    q: str = Field(..., min_length=2, max_length=200)
+    operation_type: Optional[AdvertisementOperationType] = Field(None)
+
+    limit: Optional[int] = Field(15, ge=1, le=100)
+    offset: Optional[int] = Field(0, ge=0)
+
+
+class AdvertisementChangesFilter(BaseModel):
+    # курсор из next_since прошлого ответа, без него журнал читается с начала
+    since: Optional[str] = Field(None, pattern=r"^\d+-\d+$")
+    limit: Optional[int] = Field(500, ge=1, le=1000)
@@ -0,0 +1,13 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class AgentAdvertisementsFilter(BaseModel):
+    limit: Optional[int] = Field(15, ge=1, le=100)
+    offset: Optional[int] = Field(0, ge=0)
+
+
+class AgentFilter(BaseModel):
+    limit: Optional[int] = Field(20, ge=1, le=100)
+    offset: Optional[int] = Field(0, ge=0)
@@ -40,6 +40,12 @@ class PaginatedAdvertisementForReportDTO(BaseModel):
     advertisements: list[AdvertisementForReportDTO]
 
 
+class AdvertisementForReportFeedDTO(BaseModel):
+    # id для следующего запроса, None на последней странице
+    next_after_id: Optional[int]
+    advertisements: list[AdvertisementForReportDTO]
+
+
 class AdvertisementDTO(BaseModel):
     id: int
     unique_id: str
@@ -105,3 +111,36 @@ class PaginatedAdvertisementDTO(BaseModel):
     limit: int
     offset: int
     results: list[AdvertisementDTO]
+
+
+class FacetCountDTO(BaseModel):
+    value: Optional[int | str]
+    count: int
+
+
+class PriceRangeCountDTO(BaseModel):
+    price_from: Optional[int]
+    price_to: Optional[int]
+    count: int
+
+
+class AdvertisementFacetsDTO(BaseModel):
+    total: int
+    categories: list[FacetCountDTO]
+    districts: list[FacetCountDTO]
+    rooms: list[FacetCountDTO]
+    repair_types: list[FacetCountDTO]
+    prices: list[PriceRangeCountDTO]
+
+
+class AdvertisementChangeDTO(BaseModel):
+    id: int
+    # insert, update или delete
+    operation: str
+    changed_at: datetime
+
+
+class AdvertisementChangesDTO(BaseModel):
+    next_since: str
+    has_more: bool
+    changes: list[AdvertisementChangeDTO]
@@ -10,6 +10,15 @@ class AgentListDTO(BaseModel):
     lastname: Optional[str]
     tg_username: Optional[str]
     phone_number: Optional[str]
+    rent_count: int = 0
+    buy_count: int = 0
+
+
+class PaginatedAgentDTO(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    results: list[AgentListDTO]
 
 
 class AgentDetailDTO(BaseModel):
@@ -19,4 +28,10 @@ class AgentDetailDTO(BaseModel):
     tg_username: Optional[str]
     phone_number: Optional[str]
     user_photo: Optional[str]
+    # опубликованные объявления агента, список ниже - одна страница из total
+    rent_count: int
+    buy_count: int
+    total: int
+    limit: int
+    offset: int
     advertisements: list[Optional[AdvertisementDTO]]
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class AgentStatsDTO(BaseModel):
+    user_id: Optional[int]
+    agent: Optional[str]
+    listings: int
+    moderated: int
+
+
+class GroupPriceStatsDTO(BaseModel):
+    operation_type: str
+    name: Optional[str]
+    listings: int
+    median_price: float
+
+
+class ModerationStatsDTO(BaseModel):
+    moderated: int
+    median_hours: Optional[float]
+    p90_hours: Optional[float]
+
+
+class PriceChangeStatsDTO(BaseModel):
+    operation_type: str
+    changed: int
+    median_change_percent: float
+
+
+class MonthlyReportDTO(BaseModel):
+    year: int
+    month: int
+    listings: int
+    agents: list[AgentStatsDTO]
+    districts: list[GroupPriceStatsDTO]
+    categories: list[GroupPriceStatsDTO]
+    moderation: ModerationStatsDTO
+    price_changes: list[PriceChangeStatsDTO]
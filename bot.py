@@ -2,16 +2,24 @@ import asyncio
 import logging
 
 import betterlogging as bl
-from aiogram import Bot, Dispatcher
+from aiogram import Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
-from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.memory import MemoryStorage, SimpleEventIsolation
+from prometheus_client import start_http_server
 
+from config.db_config import BOT
 from config.loader import Config, load_config
-from infrastructure.database.setup import create_engine, create_session_pool
+from infrastructure.cache.redis import close_redis
+from infrastructure.database.setup import dispose_engine, get_session_pool
 from tgbot.handlers import routers_list
+from tgbot.middlewares.concurrency import ConcurrencyLimitMiddleware
 from tgbot.middlewares.config import ConfigMiddleware
 from tgbot.middlewares.database import DatabaseMiddleware
+from tgbot.middlewares.metrics import HandlerNameMiddleware, UpdateMetricsMiddleware
+from tgbot.utils.bot_factory import close_bot, create_bot
+from tgbot.utils.metrics_summary import send_metrics_summaries
+from tgbot.utils.webhook import run_webhook
 
 # from tgbot.scheduler.main import scheduler
 
@@ -29,6 +37,17 @@ def setup_logging():
 
 
 def register_global_middlewares(dp: Dispatcher, config: Config, session_pool=None):
+    if config.tg_bot.max_concurrent_updates:
+        dp.update.outer_middleware(
+            ConcurrencyLimitMiddleware(config.tg_bot.max_concurrent_updates)
+        )
+
+    # метрики первыми, чтобы в замер попали остальные middleware и фильтры
+    dp.message.outer_middleware(UpdateMetricsMiddleware("message"))
+    dp.callback_query.outer_middleware(UpdateMetricsMiddleware("callback_query"))
+    dp.message.middleware(HandlerNameMiddleware())
+    dp.callback_query.middleware(HandlerNameMiddleware())
+
     middleware_types = [
         ConfigMiddleware(config),
         DatabaseMiddleware(session_pool),
@@ -39,31 +58,61 @@ def register_global_middlewares(dp: Dispatcher, config: Config, session_pool=Non
         dp.callback_query.outer_middleware(middleware_type)
 
 
+def create_dispatcher(config: Config, session_pool) -> Dispatcher:
+    storage = MemoryStorage()
+    # апдейты обрабатываются параллельно, а блокировка по пользователю не дает
+    # двум быстрым нажатиям одного пользователя прочитать одно состояние FSM;
+    # в состоянии лежат Message и модели, поэтому хранилище только в памяти
+    dp = Dispatcher(storage=storage, events_isolation=SimpleEventIsolation())
+    dp["config"] = config
+
+    dp.include_routers(*routers_list)
+
+    register_global_middlewares(dp, config, session_pool)
+    return dp
+
+
 async def main():
     setup_logging()
 
     # scheduler.start()
 
     config = load_config(".env")
-    storage = MemoryStorage()
-    bot = Bot(
-        token=config.tg_bot.token,
+    bot = create_bot(
+        config,
         default=DefaultBotProperties(
             parse_mode=ParseMode.HTML, link_preview_is_disabled=True
         ),
     )
 
-    dp = Dispatcher(storage=storage)
-    dp["config"] = config
-
-    dp.include_routers(*routers_list)
+    session_pool = get_session_pool(config.db, role=BOT)
+    dp = create_dispatcher(config, session_pool)
+    dp.shutdown.register(close_bot)
+    dp.shutdown.register(dispose_engine)
+    dp.shutdown.register(close_redis)
+
+    if config.tg_bot.metrics_port:
+        start_http_server(config.tg_bot.metrics_port)
+
+    summary_task = None
+    if config.tg_bot.metrics_summary_minutes:
+        summary_task = asyncio.create_task(
+            send_metrics_summaries(
+                bot,
+                config.tg_bot.test_main_chat_id,
+                config.tg_bot.metrics_summary_minutes,
+            )
+        )
 
-    engine = create_engine(db=config.db)
-    session_pool = create_session_pool(engine=engine)
-
-    register_global_middlewares(dp, config, session_pool)
-
-    await dp.start_polling(bot)
+    try:
+        if config.tg_bot.webhook_url:
+            await run_webhook(dp, bot, config.tg_bot)
+        else:
+            await bot.delete_webhook()
+            await dp.start_polling(bot)
+    finally:
+        if summary_task is not None:
+            summary_task.cancel()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 from backend.app.config import config
 
 celery_app_dev = Celery(
@@ -14,4 +15,26 @@ celery_app_dev.conf.update(
     timezone="Asia/Tashkent",
     enable_utc=True,
     include=["celery_tasks.tasks"],
+    beat_schedule={
+        "sweep-advertisement-reminders": {
+            "task": "celery_tasks.tasks.sweep_advertisement_reminders",
+            "schedule": config.reminder_config.sweep_interval_seconds,
+            # не копим пропущенные запуски, следующий заберет все просроченное
+            "options": {"expires": config.reminder_config.sweep_interval_seconds},
+        },
+        # витрина обновляется по событиям, ночная пересборка подбирает правки
+        # категорий и районов и изменения, сделанные в базе вручную
+        "rebuild-catalogue": {
+            "task": "celery_tasks.tasks.rebuild_catalogue",
+            "schedule": crontab(hour=4, minute=0),
+        },
+        "prune-advertisement-changes": {
+            "task": "celery_tasks.tasks.prune_advertisement_changes",
+            "schedule": crontab(hour=4, minute=30),
+        },
+        "rebuild-related-advertisements": {
+            "task": "celery_tasks.tasks.rebuild_related_advertisements",
+            "schedule": crontab(minute=30),
+        },
+    },
 )
@@ -0,0 +1,34 @@
+import asyncio
+
+from celery.signals import worker_process_shutdown, worker_shutdown
+
+from infrastructure.cache.redis import close_redis
+from infrastructure.database.setup import dispose_engine
+
+# процесс prefork воркера выполняет задачи по одной, поэтому один event loop
+# на процесс позволяет переиспользовать соединения с базой и Redis между
+# задачами вместо нового подключения в каждом asyncio.run
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def run_async(coro):
+    """Выполняем корутину задачи в общем event loop процесса."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
+
+async def _close_connections():
+    await dispose_engine()
+    await close_redis()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_loop(**_):
+    if _loop is None or _loop.is_closed():
+        return
+    _loop.run_until_complete(_close_connections())
+    _loop.close()
@@ -1,19 +1,37 @@
 import time
 from datetime import datetime, timedelta
+from itertools import groupby
+
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
 
 from backend.app.config import config
 from celery_tasks.app import celery_app_dev
-from tgbot.keyboards.user.inline import is_advertisement_actual_kb
+from celery_tasks.loop import run_async
+from config.db_config import WORKER
+from tgbot.keyboards.user.inline import is_advertisement_actual_kb, reminder_digest_kb
 from tgbot.misc.constants import MONTHS_DICT
+from tgbot.templates.messages import advertisement_reminder_digest_message
+from tgbot.utils.broadcaster import broadcast
 from tgbot.utils.google_sheet import (
     client_init_json,
     get_table_by_url,
     fill_row_with_data,
 )
 from tgbot.utils.helpers import deserialize_media_group
-from infrastructure.database.setup import create_engine, create_session_pool
+from infrastructure.database.setup import get_session_pool
 from infrastructure.database.repo.requests import RequestsRepo
-from tgbot.utils.helpers import send_message_to_rent_topic
+from tgbot.utils.helpers import (
+    get_channel_name_by_operation_type,
+    send_message_to_rent_topic,
+)
+from tgbot.utils.bot_factory import close_bot, create_bot
+from tgbot.utils.media_cache import CHANNEL, get_advertisement_media_group
+from infrastructure.utils.recommendations import top_related
+
+# Telegram ограничивает клавиатуру, поэтому длинный дайджест делится на части
+REMINDER_DIGEST_SIZE = 30
+# потребители журнала изменений, отставшие сильнее, делают полную сверку
+ADVERTISEMENT_CHANGES_RETENTION_DAYS = 30
 
 
 @celery_app_dev.task
@@ -32,90 +50,199 @@ def fill_report(month: int, data: dict, operation_type: str):
 
 @celery_app_dev.task
 def send_delayed_message(chat_id, media_group):
-    from aiogram import Bot
-    import asyncio
-
     async def send_media_group():
-        bot = Bot(token=config.tg_bot.token)
+        bot = create_bot(config)
         _media = deserialize_media_group(media_group)
         await bot.send_media_group(chat_id=chat_id, media=_media)
-        await bot.session.close()
+        await close_bot(bot)
 
-    asyncio.run(send_media_group())
+    run_async(send_media_group())
 
 
 @celery_app_dev.task
 def remind_agent_to_update_advertisement(unique_id, agent_chat_id: int, advertisement_id: int):
-    import asyncio
-    from aiogram import Bot
-
     async def send_reminder():
-        bot = Bot(token=config.tg_bot.token)
+        bot = create_bot(config)
         msg = f"""
 Объявление: №{unique_id} актуально?
 """
         await bot.send_message(
             agent_chat_id, msg, parse_mode='HTML', reply_markup=is_advertisement_actual_kb(advertisement_id)
         )
-        await bot.session.close()
+        await close_bot(bot)
 
-    asyncio.run(send_reminder())
+    run_async(send_reminder())
 
 
+# напоминания отправляет sweep_advertisement_reminders, задачи ниже оставлены
+# пустыми, чтобы уже поставленные ETA задачи не дублировали напоминания
 @celery_app_dev.task
-def remind_agent_to_update_advertisement_extended(
-        advertisement_unique_id,
-        advertisement_id,
-        agent_chat_id,
-        media_group
-):
-    import asyncio
-    from aiogram import Bot
+def remind_agent_to_update_advertisement_extended(*_legacy_args):
+    pass
 
-    async def send_reminder():
-        bot = Bot(token=config.tg_bot.token)
-        await bot.send_message(agent_chat_id, "Проверка актуальности")
-        await bot.send_media_group(chat_id=agent_chat_id, media=media_group)
-        await bot.send_message(
-            chat_id=agent_chat_id,
-            text=f"Объявление: №{advertisement_unique_id} актуально?",
-            reply_markup=is_advertisement_actual_kb(advertisement_id)
+
+@celery_app_dev.task
+def remind_agent_about_advertisement(*_legacy_args):
+    pass
+
+
+async def _send_reminder_digests(bot, reminders) -> list[int]:
+    """Отправляем каждому агенту одно сообщение со всеми его объявлениями.
+
+    Возвращает id объявлений, напоминания по которым стоит повторить.
+    """
+    by_chat_id = {
+        chat_id: list(rows)
+        for chat_id, rows in groupby(reminders, key=lambda row: row.tg_chat_id)
+        if chat_id is not None
+    }
+    retry_ids = []
+    # части дайджеста уходят по очереди, ошибка может случиться на середине
+    sent_ids = set()
+
+    async def send_digest(bot, chat_id):
+        rows = by_chat_id[chat_id]
+        for i in range(0, len(rows), REMINDER_DIGEST_SIZE):
+            chunk = rows[i:i + REMINDER_DIGEST_SIZE]
+            await bot.send_message(
+                chat_id,
+                advertisement_reminder_digest_message([row.unique_id for row in chunk]),
+                reply_markup=reminder_digest_kb(chunk),
+            )
+            sent_ids.update(row.id for row in chunk)
+
+    async def on_error(bot, chat_id, error):
+        # агент заблокировал бота или чат не существует: повтор не поможет
+        if isinstance(error, (TelegramForbiddenError, TelegramBadRequest)):
+            return
+        retry_ids.extend(
+            row.id for row in by_chat_id[chat_id] if row.id not in sent_ids
         )
 
-        await bot.session.close()
+    await broadcast(bot, by_chat_id, send_digest, on_error=on_error)
+    return retry_ids
 
-    asyncio.run(send_reminder())
 
 @celery_app_dev.task
-def send_message_by_queue(
-        advertisement_id,
-        price,
-        media_group,
-        operation_type,
-        channel_name,
-        user_chat_id,
-        director_chat_id
-):
-    import asyncio
-    from aiogram import Bot
+def sweep_advertisement_reminders():
+    """Периодически рассылаем напоминания о проверке актуальности.
 
-    # bot object
-    bot = Bot(token=config.tg_bot.token)
+    Объявления забираются пачками с блокировкой строк, поэтому задачу можно
+    запускать на нескольких воркерах одновременно без повторных напоминаний.
+    """
+    batch_size = config.reminder_config.sweep_batch_size
+
+    async def sweep():
+        session_pool = get_session_pool(config.db, role=WORKER)
+        bot = create_bot(config)
+        retry_ids = []
+        try:
+            while True:
+                async with session_pool() as session:
+                    repo = RequestsRepo(session)
+                    reminders = await repo.advertisements.claim_due_reminders(
+                        now=datetime.utcnow(), limit=batch_size
+                    )
+                if not reminders:
+                    break
+                retry_ids += await _send_reminder_digests(bot, reminders)
+                if len(reminders) < batch_size:
+                    break
+
+            # неотправленные напоминания заберет следующий запуск
+            if retry_ids:
+                async with session_pool() as session:
+                    repo = RequestsRepo(session)
+                    await repo.advertisements.release_reminders(retry_ids)
+        finally:
+            await close_bot(bot)
+
+    run_async(sweep())
+
+
+@celery_app_dev.task
+def rebuild_catalogue():
+    """Полностью пересобираем витрину объявлений для публичного API."""
+
+    async def rebuild():
+        session_pool = get_session_pool(config.db, role=WORKER)
+        async with session_pool() as session:
+            await RequestsRepo(session).catalogue.rebuild()
+
+    run_async(rebuild())
+
+
+@celery_app_dev.task
+def prune_advertisement_changes():
+    """Удаляем старые записи журнала изменений объявлений."""
+
+    async def prune():
+        session_pool = get_session_pool(config.db, role=WORKER)
+        async with session_pool() as session:
+            await RequestsRepo(session).advertisements.delete_changes_before(
+                datetime.now() - timedelta(days=ADVERTISEMENT_CHANGES_RETENTION_DAYS)
+            )
+
+    run_async(prune())
+
+
+@celery_app_dev.task
+def rebuild_related_advertisements():
+    """Пересчитываем похожие объявления для карточек на сайте.
 
-    # database connection
-    engine = create_engine(config.db)
-    session_pool = create_session_pool(engine=engine)
+    Соседей ищем только среди объявлений с тем же типом операции, цены
+    аренды и продажи между собой не сравнимы.
+    """
 
-    async def send_test():
+    async def rebuild():
+        session_pool = get_session_pool(config.db, role=WORKER)
         async with session_pool() as session:
             repo = RequestsRepo(session)
+            features = await repo.catalogue.get_recommendation_features()
+
+            rows = []
+            for _, group in groupby(features, key=lambda row: row.operation_type):
+                group = list(group)
+                rows += top_related(
+                    ids=[row.id for row in group],
+                    category_ids=[row.category_id for row in group],
+                    district_ids=[row.district_id for row in group],
+                    prices=[row.price for row in group],
+                    rooms=[row.rooms_quantity for row in group],
+                )
+            await repo.catalogue.replace_related_advertisements(rows)
+
+    run_async(rebuild())
+
+
+async def post_queued_advertisement(advertisement_id: int):
+    """Отправляем объявление из очереди в топики супергруппы и канал."""
+    session_pool = get_session_pool(config.db, role=WORKER)
+    async with session_pool() as session:
+        repo = RequestsRepo(session)
 
         # обновляем объявление в очереди
         await repo.advertisement_queue.update_advertisement_queue(advertisement_id=advertisement_id)
 
+        advertisement = await repo.advertisements.get_advertisement_summary(
+            advertisement_id
+        )
+        if advertisement is None:  # объявление удалили, пока оно было в очереди
+            return
+
+        media_group = await get_advertisement_media_group(
+            advertisement_id, CHANNEL, repo
+        )
+
+    operation_type = advertisement.operation_type.value
+    channel_name = get_channel_name_by_operation_type(operation_type)
+
+    # bot object
+    bot = create_bot(config)
+    try:
         await send_message_to_rent_topic(
             bot=bot,
-            price=price,
+            price=advertisement.price,
             media_group=media_group,
             operation_type=operation_type
         )
@@ -128,7 +255,15 @@ def send_message_by_queue(
         except Exception as e:
             await bot.send_message(chat_id=config.tg_bot.test_main_chat_id,
                                                text=f'ошибка при отправке медиа группы\n{str(e)}')
+    finally:
+        await close_bot(bot)  # closing bot session
+
 
-        await bot.session.close()  # closing bot session
+@celery_app_dev.task
+def send_message_by_queue(advertisement_id, *_legacy_args):
+    """Отправляем объявление из очереди по id.
 
-    asyncio.run(send_test())
+    Остальные аргументы принимаются только для задач, поставленных
+    в очередь до смены сигнатуры.
+    """
+    run_async(post_queued_advertisement(advertisement_id))
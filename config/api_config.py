@@ -7,12 +7,23 @@ from environs import Env
 class RunConfig:
     api_host: str
     api_port: int
+    # debug включает отладочные ответы FastAPI и перезапуск при изменении кода
+    debug: bool = False
+    workers: int = 1
+    # запрос с этим значением в X-Profile-Token вернет отчет профилировщика
+    profile_token: str = ""
+    # токен выгрузки объявлений (X-Export-Token), пустой отключает выгрузку
+    export_token: str = ""
 
     @staticmethod
     def from_env(env: Env) -> "RunConfig":
         return RunConfig(
             api_host=env.str("API_HOST"),
             api_port=env.int("API_PORT"),
+            debug=env.bool("API_DEBUG", False),
+            workers=env.int("API_WORKERS", 1),
+            profile_token=env.str("API_PROFILE_TOKEN", ""),
+            export_token=env.str("API_EXPORT_TOKEN", ""),
         )
 
 
@@ -27,6 +38,8 @@ class ApiV1Prefix:
     consultation: str = "/consultation"
     agents: str = "/agents"
     dev: str = '/dev'
+    export: str = "/export"
+    health: str = "/health"
 
 
 @dataclass
@@ -1,8 +1,31 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from environs import Env
 from sqlalchemy.engine.url import URL
 
+# роли процессов, для каждой свой размер пула соединений
+API = "api"
+BOT = "bot"
+WORKER = "worker"
+SCRIPT = "script"
+
+
+@dataclass
+class PoolConfig:
+    size: int
+    max_overflow: int
+    timeout: int = 30
+
+
+def default_pool_profiles() -> dict[str, PoolConfig]:
+    # API отвечает на параллельные запросы, воркер выполняет одну задачу за раз
+    return {
+        API: PoolConfig(size=10, max_overflow=10),
+        BOT: PoolConfig(size=5, max_overflow=5),
+        WORKER: PoolConfig(size=2, max_overflow=2),
+        SCRIPT: PoolConfig(size=2, max_overflow=0),
+    }
+
 
 @dataclass
 class DbConfig:
@@ -12,6 +35,17 @@ class DbConfig:
     database: str
     port: int = 5432
 
+    pool_profiles: dict[str, PoolConfig] = field(default_factory=default_pool_profiles)
+    # соединения старше pool_recycle секунд переоткрываются при выдаче из пула
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    # PgBouncer в режиме transaction не поддерживает подготовленные запросы asyncpg
+    pgbouncer: bool = False
+    application_name: str = "realty"
+    # вместо echo логируем запросы дольше slow_query_ms и долю sample_rate остальных
+    slow_query_ms: int = 200
+    query_sample_rate: float = 0.0
+
     def construct_sqlalchemy_url(self, driver='asyncpg') -> str:
         return URL.create(
             drivername=f'postgresql+{driver}',
@@ -22,12 +56,32 @@ class DbConfig:
             port=self.port,
         ).render_as_string(hide_password=False)
 
+    def pool_for(self, role: str) -> PoolConfig:
+        return self.pool_profiles.get(role, self.pool_profiles[SCRIPT])
+
     @staticmethod
     def from_env(env: Env) -> "DbConfig":
+        pool_profiles = {
+            role: PoolConfig(
+                size=env.int(f'DB_POOL_{role.upper()}_SIZE', default.size),
+                max_overflow=env.int(
+                    f'DB_POOL_{role.upper()}_MAX_OVERFLOW', default.max_overflow
+                ),
+                timeout=env.int(f'DB_POOL_{role.upper()}_TIMEOUT', default.timeout),
+            )
+            for role, default in default_pool_profiles().items()
+        }
         return DbConfig(
             host=env.str('DB_HOST'),
             user=env.str('DB_USER'),
             password=env.str('DB_PASSWORD'),
             database=env.str('DB_NAME'),
             port=env.int('DB_PORT'),
+            pool_profiles=pool_profiles,
+            pool_recycle=env.int('DB_POOL_RECYCLE', 1800),
+            pool_pre_ping=env.bool('DB_POOL_PRE_PING', True),
+            pgbouncer=env.bool('DB_PGBOUNCER', False),
+            application_name=env.str('DB_APPLICATION_NAME', 'realty'),
+            slow_query_ms=env.int('DB_SLOW_QUERY_MS', 200),
+            query_sample_rate=env.float('DB_QUERY_SAMPLE_RATE', 0.0),
         )
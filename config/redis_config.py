@@ -6,10 +6,13 @@ import environs
 class RedisConfig:
     broker_url: str
     backend_url: str
+    cache_url: str
 
     @staticmethod
     def from_env(env: environs.Env) -> "RedisConfig":
+        broker_url = env.str("REDIS_BROKER_URL")
         return RedisConfig(
-            broker_url=env.str("REDIS_BROKER_URL"),
+            broker_url=broker_url,
             backend_url=env.str("REDIS_BACKEND_URL"),
-        )
\ No newline at end of file
+            cache_url=env.str("REDIS_CACHE_URL", "") or broker_url,
+        )
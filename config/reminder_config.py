@@ -10,6 +10,10 @@ class ReminderConfig:
     buy_reminder_minutes: int
     rent_reminder_minutes: int
 
+    # периодическая проверка объявлений, которым пора напомнить
+    sweep_interval_seconds: int = 60
+    sweep_batch_size: int = 500
+
     @staticmethod
     def from_env(env: environs.Env) -> "ReminderConfig":
         return ReminderConfig(
@@ -18,4 +22,7 @@ class ReminderConfig:
 
             rent_reminder_minutes=env.int("RENT_REMINDER_MINUTES"),
             buy_reminder_minutes=env.int("BUY_REMINDER_MINUTES"),
+
+            sweep_interval_seconds=env.int("REMINDER_SWEEP_INTERVAL_SECONDS", 60),
+            sweep_batch_size=env.int("REMINDER_SWEEP_BATCH_SIZE", 500),
         )
@@ -1,4 +1,6 @@
+from bisect import bisect_right
 from dataclasses import dataclass
+from functools import cached_property
 
 from environs import Env
 import json
@@ -13,6 +15,22 @@ class TgBot:
     main_chat_id: int
     test_main_chat_id: int
     supergroup_id: int
+    # порт HTTP сервера с метриками Prometheus, 0 выключает сервер
+    metrics_port: int = 0
+    # раз в сколько минут отправлять сводку в test_main_chat_id, 0 выключает
+    metrics_summary_minutes: int = 0
+    # адрес своего или тестового сервера Bot API, пусто - api.telegram.org
+    api_server: str = ""
+    # публичный адрес вебхука, пусто - режим long polling
+    webhook_url: str = ""
+    webhook_path: str = "/webhook"
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 8080
+    webhook_secret: str = ""
+    # сколько одновременных соединений Telegram открывает к вебхуку
+    webhook_max_connections: int = 40
+    # сколько апдейтов обрабатывается одновременно, 0 - без ограничения
+    max_concurrent_updates: int = 50
 
     @staticmethod
     def from_env(env: Env) -> "TgBot":
@@ -23,10 +41,45 @@ class TgBot:
             base_channel_name=env.str("BASE_CHANNEL"),
             main_chat_id=env.int("MAIN_CHAT_ID"),
             test_main_chat_id=env.int("TEST_MAIN_CHAT_ID"),
-            supergroup_id=env.int("SUPERGROUP_ID")
+            supergroup_id=env.int("SUPERGROUP_ID"),
+            metrics_port=env.int("BOT_METRICS_PORT", 0),
+            metrics_summary_minutes=env.int("BOT_METRICS_SUMMARY_MINUTES", 0),
+            api_server=env.str("BOT_API_SERVER", ""),
+            webhook_url=env.str("BOT_WEBHOOK_URL", ""),
+            webhook_path=env.str("BOT_WEBHOOK_PATH", "/webhook"),
+            webhook_host=env.str("BOT_WEBHOOK_HOST", "0.0.0.0"),
+            webhook_port=env.int("BOT_WEBHOOK_PORT", 8080),
+            webhook_secret=env.str("BOT_WEBHOOK_SECRET", ""),
+            webhook_max_connections=env.int("BOT_WEBHOOK_MAX_CONNECTIONS", 40),
+            max_concurrent_updates=env.int("BOT_MAX_CONCURRENT_UPDATES", 50),
         )
 
 
+class TopicPriceRouter:
+    """Таблица топиков супергруппы по диапазонам цен ``[от, до)``.
+
+    Границы всех диапазонов делят ось цен на отрезки, для каждого отрезка
+    заранее сохраняем подходящие топики, поэтому поиск - один bisect.
+    """
+
+    def __init__(self, topics: dict[int, list[int]]):
+        self._bounds = sorted({bound for prices in topics.values() for bound in prices})
+        self._segments = tuple(
+            tuple(
+                thread_id
+                for thread_id, (price_from, price_to) in topics.items()
+                if price_from <= start and end <= price_to
+            )
+            for start, end in zip(self._bounds, self._bounds[1:])
+        )
+
+    def get_thread_ids(self, price: int) -> tuple[int, ...]:
+        idx = bisect_right(self._bounds, price) - 1
+        if idx < 0 or idx >= len(self._segments):
+            return ()
+        return self._segments[idx]
+
+
 @dataclass
 class TgSuperGroupConfig:
     rent_supergroup_id: str
@@ -38,6 +91,15 @@ class TgSuperGroupConfig:
     buy_topic_thread_ids: str
     buy_topic_prices: str
 
+    @cached_property
+    def topic_routers(self) -> dict[str, TopicPriceRouter]:
+        # разбираем таблицы топиков один раз при первой публикации в топики,
+        # чтобы процессы без топиков запускались и с пустыми настройками
+        return {
+            topic_type: TopicPriceRouter(self.make_forum_topics_data(topic_type))
+            for topic_type in ("Аренда", "Покупка")
+        }
+
     @staticmethod
     def from_env(env: Env) -> "TgSuperGroupConfig":
         return TgSuperGroupConfig(
@@ -73,4 +135,7 @@ class TgSuperGroupConfig:
         prices = self.get_topic_prices(topic_type)
         return dict(zip(thread_ids, prices))
 
-
+    def get_topic_thread_ids_by_price(self, topic_type: str, price: int):
+        if topic_type not in self.topic_routers:
+            raise ValueError(f'Invalid topic type: {topic_type}')
+        return self.topic_routers[topic_type].get_thread_ids(price)
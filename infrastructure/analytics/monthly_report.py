@@ -0,0 +1,129 @@
+"""Месячная статистика объявлений для директоров.
+
+Колонки объявлений за месяц загружаются одним запросом в DataFrame, все
+агрегаты считаются группировками pandas без циклов по строкам. Готовый
+отчет кешируется в Redis по месяцу.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from backend.core.interfaces.analytics import (
+    AgentStatsDTO,
+    GroupPriceStatsDTO,
+    ModerationStatsDTO,
+    MonthlyReportDTO,
+    PriceChangeStatsDTO,
+)
+from infrastructure.cache.analytics import cache_report, get_cached_report
+from infrastructure.database.repo.requests import RequestsRepo
+
+
+def _month_bounds(year: int, month: int) -> tuple[datetime, datetime]:
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+
+def _moderation_stats(frame: pd.DataFrame) -> ModerationStatsDTO:
+    """Часы от создания объявления до первой публикации."""
+    hours = (
+        (frame["moderated_at"] - frame["created_at"]).dt.total_seconds().dropna()
+        / 3600
+    )
+    if hours.empty:
+        return ModerationStatsDTO(moderated=0, median_hours=None, p90_hours=None)
+    median_hours, p90_hours = np.percentile(hours, [50, 90]).round(1)
+    return ModerationStatsDTO(
+        moderated=len(hours), median_hours=median_hours, p90_hours=p90_hours
+    )
+
+
+def _price_stats(published: pd.DataFrame, column: str) -> list[GroupPriceStatsDTO]:
+    """Медианная цена по группе отдельно для аренды и покупки."""
+    grouped = (
+        published.groupby(["operation_type", column], dropna=False)["price"]
+        .agg(listings="size", median_price="median")
+        .reset_index()
+        .sort_values(["operation_type", "listings"], ascending=[True, False])
+    )
+    return [
+        GroupPriceStatsDTO(
+            operation_type=row.operation_type,
+            name=None if pd.isna(getattr(row, column)) else getattr(row, column),
+            listings=row.listings,
+            median_price=row.median_price,
+        )
+        for row in grouped.itertuples(index=False)
+    ]
+
+
+def compute_monthly_report(
+    frame: pd.DataFrame, year: int, month: int
+) -> MonthlyReportDTO:
+    frame = frame.astype(
+        {"price": "float64", "old_price": "float64", "new_price": "float64"}
+    )
+    for column in ("created_at", "moderated_at"):
+        frame[column] = pd.to_datetime(frame[column], utc=True)
+    frame["is_moderated"] = frame["is_moderated"].eq(True)
+    published = frame[frame["is_moderated"]]
+
+    agents = (
+        frame.groupby(["user_id", "agent"], dropna=False)
+        .agg(listings=("id", "size"), moderated=("is_moderated", "sum"))
+        .reset_index()
+        .sort_values("listings", ascending=False)
+    )
+
+    # цена, указанная агентом при подтверждении актуальности, против исходной
+    changed = frame[frame["new_price"].notna() & (frame["old_price"] > 0)]
+    change = (changed["new_price"] - changed["old_price"]) / changed["old_price"] * 100
+    changes = (
+        changed.assign(change=change)
+        .groupby("operation_type")["change"]
+        .agg(changed="size", median_change_percent="median")
+        .reset_index()
+    )
+
+    return MonthlyReportDTO(
+        year=year,
+        month=month,
+        listings=len(frame),
+        agents=[
+            AgentStatsDTO(
+                user_id=None if pd.isna(row.user_id) else int(row.user_id),
+                agent=None if pd.isna(row.agent) else row.agent,
+                listings=row.listings,
+                moderated=row.moderated,
+            )
+            for row in agents.itertuples(index=False)
+        ],
+        districts=_price_stats(published, "district"),
+        categories=_price_stats(published, "category"),
+        moderation=_moderation_stats(frame),
+        price_changes=[
+            PriceChangeStatsDTO(
+                operation_type=row.operation_type,
+                changed=row.changed,
+                median_change_percent=round(row.median_change_percent, 1),
+            )
+            for row in changes.itertuples(index=False)
+        ],
+    )
+
+
+async def get_monthly_report(
+    repo: RequestsRepo, year: int, month: int
+) -> MonthlyReportDTO:
+    cached = await get_cached_report(year, month)
+    if cached is not None:
+        return MonthlyReportDTO.model_validate_json(cached)
+
+    columns, rows = await repo.advertisements.get_analytics_rows(
+        *_month_bounds(year, month)
+    )
+    report = compute_monthly_report(pd.DataFrame(rows, columns=columns), year, month)
+    await cache_report(year, month, report.model_dump_json())
+    return report
@@ -0,0 +1,35 @@
+import logging
+
+from redis.exceptions import RedisError
+
+from backend.app.config import config
+from backend.core.filters.agent import AgentFilter
+from infrastructure.cache.facets import FACETS_GENERATION_KEY
+from infrastructure.cache.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# счетчики агентов меняются вместе с фасетами (модерация и удаление объявлений),
+# поэтому ключ берет их поколение; правки профилей агентов видны через AGENTS_TTL
+AGENTS_TTL = 60
+
+
+async def get_cached_agents(_filter: AgentFilter) -> tuple[str | None, str | None]:
+    """Возвращаем ключ для сохранения и закешированную страницу агентов."""
+    redis = get_redis(config.redis_config.cache_url)
+    try:
+        generation = await redis.get(FACETS_GENERATION_KEY) or "0"
+        key = f"agents:{generation}:{_filter.limit}:{_filter.offset}"
+        return key, await redis.get(key)
+    except RedisError as e:
+        logger.warning("agents cache is unavailable: %s", e)
+        return None, None
+
+
+async def cache_agents(key: str | None, payload: str) -> None:
+    if key is None:
+        return
+    try:
+        await get_redis(config.redis_config.cache_url).set(key, payload, ex=AGENTS_TTL)
+    except RedisError as e:
+        logger.warning("agents cache is unavailable: %s", e)
@@ -0,0 +1,39 @@
+import logging
+from datetime import date
+
+from redis.exceptions import RedisError
+
+from backend.app.config import config
+from infrastructure.cache.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# прошедшие месяцы почти не меняются, текущий пересчитываем чаще
+CLOSED_MONTH_TTL = 60 * 60 * 24
+CURRENT_MONTH_TTL = 60 * 10
+
+
+def _cache_key(year: int, month: int) -> str:
+    return f"analytics:monthly:{year}-{month:02d}"
+
+
+async def get_cached_report(year: int, month: int) -> str | None:
+    try:
+        return await get_redis(config.redis_config.cache_url).get(
+            _cache_key(year, month)
+        )
+    except RedisError as e:
+        logger.warning("analytics cache is unavailable: %s", e)
+        return None
+
+
+async def cache_report(year: int, month: int, payload: str) -> None:
+    today = date.today()
+    closed = (year, month) < (today.year, today.month)
+    ttl = CLOSED_MONTH_TTL if closed else CURRENT_MONTH_TTL
+    try:
+        await get_redis(config.redis_config.cache_url).set(
+            _cache_key(year, month), payload, ex=ttl
+        )
+    except RedisError as e:
+        logger.warning("analytics cache is unavailable: %s", e)
@@ -0,0 +1,52 @@
+import hashlib
+import json
+import logging
+
+from redis.exceptions import RedisError
+
+from backend.app.config import config
+from backend.core.filters.advertisement import AdvertisementFilter
+from infrastructure.cache.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# поколение меняется при модерации и удалении, старые ключи доживают до TTL;
+# правки уже опубликованных объявлений попадают в фасеты по истечении TTL
+FACETS_GENERATION_KEY = "advertisement_facets:generation"
+FACETS_TTL = 60 * 5
+
+
+def _cache_key(generation: str, _filter: AdvertisementFilter) -> str:
+    params = _filter.model_dump(
+        mode="json", exclude={"limit", "offset"}, exclude_none=True
+    )
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    return f"advertisement_facets:{generation}:{digest}"
+
+
+async def get_cached_facets(_filter: AdvertisementFilter) -> tuple[str | None, str | None]:
+    """Возвращаем ключ для сохранения и закешированные фасеты, если они есть."""
+    redis = get_redis(config.redis_config.cache_url)
+    try:
+        generation = await redis.get(FACETS_GENERATION_KEY) or "0"
+        key = _cache_key(generation, _filter)
+        return key, await redis.get(key)
+    except RedisError as e:
+        logger.warning("facets cache is unavailable: %s", e)
+        return None, None
+
+
+async def cache_facets(key: str | None, payload: str) -> None:
+    if key is None:
+        return
+    try:
+        await get_redis(config.redis_config.cache_url).set(key, payload, ex=FACETS_TTL)
+    except RedisError as e:
+        logger.warning("facets cache is unavailable: %s", e)
+
+
+async def invalidate_facets() -> None:
+    try:
+        await get_redis(config.redis_config.cache_url).incr(FACETS_GENERATION_KEY)
+    except RedisError as e:
+        logger.warning("failed to invalidate facets cache: %s", e)
@@ -0,0 +1,26 @@
+import asyncio
+import weakref
+
+from redis.asyncio import Redis
+
+# клиент redis.asyncio привязан к event loop, а у API, бота, воркеров Celery
+# и скриптов свои loop, поэтому храним клиента на loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Redis]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_redis(url: str) -> Redis:
+    """Возвращаем клиента Redis для текущего event loop."""
+    loop = asyncio.get_running_loop()
+    clients = _clients.setdefault(loop, {})
+    if url not in clients:
+        clients[url] = Redis.from_url(url, decode_responses=True)
+    return clients[url]
+
+
+async def close_redis() -> None:
+    """Закрываем клиентов текущего event loop."""
+    loop = asyncio.get_running_loop()
+    for client in _clients.pop(loop, {}).values():
+        await client.aclose()
@@ -0,0 +1,78 @@
+import logging
+from typing import Awaitable, Callable
+
+from redis.exceptions import RedisError
+
+from backend.app.config import config
+from infrastructure.cache.redis import get_redis
+from infrastructure.database.repo.requests import RequestsRepo
+
+logger = logging.getLogger(__name__)
+
+# hash unique_id -> id, пополняется при промахах и при создании объявлений
+UNIQUE_IDS_KEY = "advertisement_unique_ids"
+
+
+def _redis():
+    return get_redis(config.redis_config.cache_url)
+
+
+async def remember_unique_id(unique_id: str, advertisement_id: int) -> None:
+    try:
+        await _redis().hset(UNIQUE_IDS_KEY, unique_id, advertisement_id)
+    except RedisError as e:
+        logger.warning("unique_id cache is unavailable: %s", e)
+
+
+async def forget_unique_id(unique_id: str) -> None:
+    try:
+        await _redis().hdel(UNIQUE_IDS_KEY, unique_id)
+    except RedisError as e:
+        logger.warning("unique_id cache is unavailable: %s", e)
+
+
+async def resolve_advertisement_id(
+    unique_id: str, repo: "RequestsRepo"
+) -> int | None:
+    """Получаем id объявления по его уникальному номеру."""
+    try:
+        cached = await _redis().hget(UNIQUE_IDS_KEY, unique_id)
+    except RedisError as e:
+        logger.warning("unique_id cache is unavailable: %s", e)
+        cached = None
+
+    if cached is not None:
+        return int(cached)
+
+    advertisement_id = await repo.advertisements.get_advertisement_id_by_unique_id(
+        unique_id
+    )
+    if advertisement_id is not None:
+        await remember_unique_id(unique_id, advertisement_id)
+    return advertisement_id
+
+
+async def find_advertisement_by_unique_id(
+    unique_id: str,
+    repo: "RequestsRepo",
+    load: Callable[[int], Awaitable],
+):
+    """Находим объявление по уникальному номеру через кеш и загружаем его по id.
+
+    ``load`` загружает объявление по первичному ключу, так вызывающий код сам
+    решает, какие связанные модели ему нужны. Устаревшая запись кеша
+    (объявление удалено или номер изменен) удаляется и номер ищется в базе.
+    """
+    if not unique_id:
+        return None
+
+    for _ in range(2):
+        advertisement_id = await resolve_advertisement_id(unique_id, repo)
+        if advertisement_id is None:
+            return None
+
+        advertisement = await load(advertisement_id)
+        if advertisement is not None and advertisement.unique_id == unique_id:
+            return advertisement
+        await forget_unique_id(unique_id)
+    return None
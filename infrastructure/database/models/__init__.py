@@ -1,5 +1,12 @@
-from .advertisement import Advertisement, AdvertisementImage, AdvertisementQueue
+from .advertisement import (
+    Advertisement,
+    AdvertisementImage,
+    AdvertisementQueue,
+    AdvertisementUniqueId,
+)
+from .advertisement_change import AdvertisementChange
 from .base import Base
+from .catalogue import CatalogueAdvertisement, CatalogueRelatedAdvertisement
 from .category import Category
 from .consultation import ConsultationRequest
 from .district import District
@@ -1,8 +1,19 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, String
-from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy import (
+    TIMESTAMP,
+    Column,
+    Computed,
+    FetchedValue,
+    ForeignKey,
+    Index,
+    Sequence,
+    String,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ENUM, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, created_at
@@ -45,12 +56,29 @@ class RepairTypeUz(str, enum.Enum):
     PRE_FINISHED = "Tugallanmagan ta’mir"
 
 
+# русские поля разбираются русским словарем, узбекские без стемминга
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(name_uz, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(address, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(address_uz, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(description_uz, '')), 'C')"
+)
+# текст для нечеткого поиска по триграммам (опечатки, части слов)
+SEARCH_TEXT_EXPRESSION = (
+    "lower(coalesce(name, '') || ' ' || coalesce(name_uz, '') || ' ' || "
+    "coalesce(address, '') || ' ' || coalesce(address_uz, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(description_uz, ''))"
+)
+
+
 class Advertisement(Base, IntIdMixin):
     name: Mapped[str] = mapped_column(String, index=True)
     name_uz: Mapped[str] = mapped_column(String, nullable=True)
 
     unique_id: Mapped[str] = mapped_column(
-        String(6), nullable=True
+        String(6), nullable=True, unique=True, index=True
     )
 
     owner_phone_number: Mapped[str] = mapped_column(nullable=True)
@@ -120,6 +148,10 @@ class Advertisement(Base, IntIdMixin):
     floor_from: Mapped[int]
     floor_to: Mapped[int]
     is_moderated: Mapped[bool] = mapped_column(nullable=True)
+    # первая публикация директором, для аналитики времени модерации
+    moderated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
 
     preview: Mapped[str] = mapped_column(nullable=True)
     for_base_channel: Mapped[bool] = mapped_column(nullable=True, default=False)
@@ -134,6 +166,38 @@ class Advertisement(Base, IntIdMixin):
     user = relationship("User", back_populates="advertisement")
     queue = relationship("AdvertisementQueue", back_populates="advertisement")
     created_at: Mapped[created_at]
+    # обновляет триггер базы при любом изменении строки и ее фотографий
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        server_onupdate=FetchedValue(),
+    )
+
+    # колонки поиска есть только в таблице: ORM их не загружает и не возвращает
+    # из INSERT/UPDATE ... RETURNING, запросы обращаются к __table__.c
+    search_vector = Column(
+        TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)
+    )
+    search_text = Column(String, Computed(SEARCH_TEXT_EXPRESSION, persisted=True))
+    __mapper_args__ = {"exclude_properties": ["search_vector", "search_text"]}
+
+    __table_args__ = (
+        Index(
+            "ix_advertisements_search_vector", "search_vector", postgresql_using="gin"
+        ),
+        Index(
+            "ix_advertisements_search_text",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        # частичный индекс для выборки объявлений, которым пора напомнить
+        Index(
+            "ix_advertisements_due_reminders",
+            "reminder_time",
+            postgresql_where=text("is_reminded = false AND is_moderated = true"),
+        ),
+    )
 
 
 class AdvertisementImage(Base, IntIdMixin):
@@ -153,4 +217,27 @@ class AdvertisementQueue(Base, IntIdMixin):
     )
     advertisement: Mapped["Advertisement"] = relationship(back_populates="queue")
     time_to_send: Mapped[datetime] = mapped_column(nullable=True)
-    is_sent: Mapped[bool] = mapped_column(default=False)
\ No newline at end of file
+    is_sent: Mapped[bool] = mapped_column(default=False)
+
+
+# номера 100000-999999 выдаются по кругу из последовательности
+unique_id_sequence = Sequence(
+    "advertisement_unique_id_seq",
+    start=0,
+    minvalue=0,
+    maxvalue=899999,
+    cycle=True,
+    metadata=Base.metadata,
+)
+
+
+class AdvertisementUniqueId(Base):
+    """Выданные уникальные номера объявлений.
+
+    Номер резервируется в начале создания объявления, первичный ключ
+    гарантирует, что два агента не получат один и тот же номер.
+    """
+
+    unique_id: Mapped[str] = mapped_column(String(6), primary_key=True)
+    created_at: Mapped[created_at]
+
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, BigInteger, Identity, Index, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class AdvertisementChange(Base):
+    """Журнал изменений объявлений для инкрементальной синхронизации.
+
+    Строки пишут триггеры базы на вставку, изменение и удаление объявлений,
+    а также на изменение их фотографий, поэтому в журнал попадает любой путь
+    записи. txid - номер транзакции: читатель берет только завершенные
+    транзакции и идет по (txid, id), так изменения не теряются, даже если
+    транзакции завершаются не в порядке своих номеров.
+    """
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    # без внешнего ключа: запись об удалении переживает само объявление
+    advertisement_id: Mapped[int]
+    operation: Mapped[str] = mapped_column(String(6))
+    txid: Mapped[int] = mapped_column(
+        BigInteger, server_default=text("pg_current_xact_id()::text::bigint")
+    )
+    changed_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index("ix_advertisement_changes_txid_id", "txid", "id"),
+        Index("ix_advertisement_changes_changed_at", "changed_at"),
+    )
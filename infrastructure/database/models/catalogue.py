@@ -0,0 +1,112 @@
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, Float, ForeignKey, Index, SmallInteger, String, func
+from sqlalchemy.dialects.postgresql import ENUM, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .advertisement import (
+    OperationType,
+    PropertyType,
+    PropertyTypeUz,
+    RepairType,
+    RepairTypeUz,
+)
+from .base import Base, created_at
+
+
+class CatalogueAdvertisement(Base):
+    """Витрина опубликованных объявлений для публичного API.
+
+    Строка собирается из объявления, категории, района, фотографий и контактов
+    агента и обновляется при модерации и изменениях объявления, поэтому сайт
+    не читает таблицу, которую в это время редактируют агенты.
+    """
+
+    id: Mapped[int] = mapped_column(
+        ForeignKey("advertisements.id", ondelete="CASCADE"), primary_key=True
+    )
+    unique_id: Mapped[str] = mapped_column(String(6), nullable=True)
+
+    name: Mapped[str]
+    name_uz: Mapped[str] = mapped_column(nullable=True)
+    description: Mapped[str]
+    description_uz: Mapped[str] = mapped_column(nullable=True)
+    address: Mapped[str]
+    address_uz: Mapped[str] = mapped_column(nullable=True)
+
+    price: Mapped[int]
+    old_price: Mapped[int] = mapped_column(nullable=True)
+
+    rooms_quantity: Mapped[int] = mapped_column(nullable=True)
+    quadrature: Mapped[int] = mapped_column(nullable=True)
+    quadrature_from: Mapped[int] = mapped_column(nullable=True)
+    quadrature_to: Mapped[int] = mapped_column(nullable=True)
+    house_quadrature_from: Mapped[int] = mapped_column(nullable=True)
+    house_quadrature_to: Mapped[int] = mapped_column(nullable=True)
+    floor_from: Mapped[int]
+    floor_to: Mapped[int]
+    creation_year: Mapped[int] = mapped_column(nullable=True)
+
+    # типы в базе общие с таблицей объявлений
+    operation_type: Mapped["OperationType"] = mapped_column(
+        ENUM(OperationType, create_type=False)
+    )
+    property_type: Mapped["PropertyType"] = mapped_column(
+        ENUM(PropertyType, create_type=False)
+    )
+    property_type_uz: Mapped["PropertyTypeUz"] = mapped_column(
+        ENUM(PropertyTypeUz, create_type=False), nullable=True
+    )
+    repair_type: Mapped["RepairType"] = mapped_column(
+        ENUM(RepairType, create_type=False)
+    )
+    repair_type_uz: Mapped["RepairTypeUz"] = mapped_column(
+        ENUM(RepairTypeUz, create_type=False), nullable=True
+    )
+
+    is_moderated: Mapped[bool] = mapped_column(default=True)
+    preview: Mapped[str] = mapped_column(nullable=True)
+    first_image: Mapped[str] = mapped_column(nullable=True)
+
+    category_id: Mapped[int] = mapped_column(nullable=True)
+    district_id: Mapped[int] = mapped_column(nullable=True)
+    user_id: Mapped[int] = mapped_column(nullable=True)
+
+    # связанные модели хранятся в том виде, в котором их отдает API
+    category: Mapped[dict] = mapped_column(JSONB, nullable=True)
+    district: Mapped[dict] = mapped_column(JSONB, nullable=True)
+    user: Mapped[dict] = mapped_column(JSONB, nullable=True)
+    images: Mapped[list] = mapped_column(JSONB, server_default="[]")
+
+    created_at: Mapped[created_at]
+    refreshed_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_catalogue_advertisements_operation_type_created_at",
+            "operation_type",
+            "created_at",
+        ),
+        Index("ix_catalogue_advertisements_category_id", "category_id"),
+        Index("ix_catalogue_advertisements_user_id", "user_id"),
+    )
+
+
+class CatalogueRelatedAdvertisement(Base):
+    """Заранее посчитанные похожие объявления для карточки на сайте.
+
+    Таблицу целиком пересобирает фоновая задача. Ссылки идут на объявления,
+    а не на витрину, чтобы обновление строки витрины не стирало рекомендации;
+    снятые с публикации отсекаются соединением с витриной при чтении.
+    """
+
+    advertisement_id: Mapped[int] = mapped_column(
+        ForeignKey("advertisements.id", ondelete="CASCADE"), primary_key=True
+    )
+    position: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    related_id: Mapped[int] = mapped_column(
+        ForeignKey("advertisements.id", ondelete="CASCADE"), index=True
+    )
+    score: Mapped[float] = mapped_column(Float)
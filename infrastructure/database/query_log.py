@@ -0,0 +1,86 @@
+import hashlib
+import logging
+import random
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# литералы и списки параметров не влияют на форму запроса
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|\$\d+|%\(\w+\)s")
+# asyncpg добавляет к параметрам приведение типа: IN ($1::INTEGER, $2::INTEGER)
+_LISTS = re.compile(r"\(\s*\?(?:::\w+)?(?:\s*,\s*\?(?:::\w+)?)*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+STATEMENT_LOG_LENGTH = 300
+
+
+def fingerprint(statement: str) -> tuple[str, str]:
+    """Нормализованный текст запроса и короткий хеш для группировки в логах.
+
+    Списки IN разной длины дают один отпечаток:
+
+    >>> fingerprint("SELECT 1 WHERE id IN ($1::INTEGER, $2::INTEGER)")[1]
+    'SELECT ? WHERE id IN (?)'
+    >>> fingerprint("SELECT 1 WHERE id IN ($1::INTEGER)")[0] == (
+    ...     fingerprint("SELECT 1 WHERE id IN ($1::INTEGER, $2::INTEGER, $3::INTEGER)")[0]
+    ... )
+    True
+    """
+    normalized = _SPACES.sub(" ", _LITERALS.sub("?", statement)).strip()
+    normalized = _LISTS.sub("(?)", normalized)
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12], normalized
+
+
+def register_query_logging(
+    engine: AsyncEngine, role: str, slow_query_ms: int, sample_rate: float
+):
+    """Логируем медленные запросы и случайную долю остальных с длительностью.
+
+    Заменяет echo: пишется одна строка на запрос и только для отобранных.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+
+        if elapsed_ms >= slow_query_ms:
+            level, kind = logging.WARNING, "slow query"
+        elif sample_rate and random.random() < sample_rate:
+            level, kind = logging.INFO, "sampled query"
+        else:
+            return
+
+        digest, normalized = fingerprint(statement)
+        logger.log(
+            level,
+            "%s %.1f ms role=%s fingerprint=%s rows=%s: %s",
+            kind,
+            elapsed_ms,
+            role,
+            digest,
+            cursor.rowcount,
+            normalized[:STATEMENT_LOG_LENGTH],
+            extra={
+                "duration_ms": round(elapsed_ms, 1),
+                "role": role,
+                "fingerprint": digest,
+            },
+        )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        # после ошибки after_cursor_execute не вызывается
+        if context.connection is None:
+            return
+        started = context.connection.info.get("query_started")
+        if started:
+            started.pop()
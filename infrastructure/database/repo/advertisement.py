@@ -1,14 +1,88 @@
 from datetime import datetime
 
-from sqlalchemy import delete, desc, func, select, update
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import selectinload
-
-from backend.core.filters.advertisement import AdvertisementFilter
-from infrastructure.database.models import Advertisement, AdvertisementImage, AdvertisementQueue
+from sqlalchemy import (
+    BigInteger,
+    String,
+    cast,
+    delete,
+    desc,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import array, insert
+from sqlalchemy.orm import joinedload, selectinload
+
+from backend.core.filters.advertisement import (
+    AdvertisementFilter,
+    AdvertisementOperationType,
+    AdvertisementSearchFilter,
+)
+from infrastructure.database.models import (
+    Advertisement,
+    AdvertisementChange,
+    AdvertisementImage,
+    AdvertisementQueue,
+    AdvertisementUniqueId,
+    Category,
+    District,
+    User,
+)
+from infrastructure.database.models.advertisement import unique_id_sequence
 from .base import BaseRepo
 
 
+# границы ценовых диапазонов для фасетов
+RENT_PRICE_BOUNDS = [200, 300, 400, 500, 700, 1000, 1500, 2000, 3000]
+BUY_PRICE_BOUNDS = [20000, 30000, 40000, 50000, 70000, 100000, 150000, 200000, 300000]
+# строк в одной пачке выгрузки, больше в памяти не держим
+EXPORT_BATCH_SIZE = 1000
+REPORT_STREAM_BATCH_SIZE = 500
+
+
+def apply_advertisement_filter(query, _filter: AdvertisementFilter, model=Advertisement):
+    """Добавляем к запросу условия фильтра объявлений.
+
+    ``model`` позволяет применить тот же фильтр к витрине объявлений.
+    """
+    query = query.filter(model.is_moderated == True)
+
+    if _filter.rooms:
+        rooms = [int(i) for i in _filter.rooms.split(",")]
+        query = query.filter(model.rooms_quantity.in_(rooms))
+    if _filter.operation_type:
+        query = query.filter(model.operation_type == _filter.operation_type)
+    if _filter.property_type:
+        query = query.filter(model.property_type == _filter.property_type)
+    if _filter.repair_type:
+        query = query.filter(model.repair_type == _filter.repair_type)
+    if _filter.floor_from:
+        query = query.filter(model.floor_from >= _filter.floor_from)
+    if _filter.floor_to:
+        query = query.filter(model.floor_to <= _filter.floor_to)
+    if _filter.house_quadrature_from:
+        query = query.filter(model.house_quadrature_from >= _filter.house_quadrature_from)
+    if _filter.house_quadrature_to:
+        query = query.filter(model.house_quadrature_to <= _filter.house_quadrature_to)
+    if _filter.price_from:
+        query = query.filter(model.price >= _filter.price_from)
+    if _filter.price_to:
+        query = query.filter(model.price <= _filter.price_to)
+    if _filter.quadrature_from:
+        query = query.filter(model.quadrature >= _filter.quadrature_from)
+    if _filter.quadrature_to:
+        query = query.filter(model.quadrature <= _filter.quadrature_to)
+    if _filter.category_id:
+        query = query.filter(model.category_id == _filter.category_id)
+    if _filter.district_id:
+        query = query.filter(model.district_id == _filter.district_id)
+    return query
+
+
 class AdvertisementRepo(BaseRepo):
     async def get_advertisements_by_month(self, month: int, operation_type: str):
         query = (
@@ -115,6 +189,53 @@ class AdvertisementRepo(BaseRepo):
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def claim_due_reminders(self, now: datetime, limit: int):
+        """Забираем пачку объявлений, которым пора отправить напоминание.
+
+        Строки блокируются через ``FOR UPDATE SKIP LOCKED`` и сразу помечаются
+        ``is_reminded``, поэтому параллельные воркеры не получат одно и то же
+        объявление дважды.
+        """
+        due = (
+            select(Advertisement.id)
+            .where(
+                Advertisement.is_reminded == False,
+                Advertisement.is_moderated == True,
+                Advertisement.reminder_time <= now,
+            )
+            .order_by(Advertisement.reminder_time)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        claimed = (
+            update(Advertisement)
+            .where(Advertisement.id.in_(due))
+            .values(is_reminded=True)
+            .returning(
+                Advertisement.id, Advertisement.unique_id, Advertisement.user_id
+            )
+            .cte("claimed")
+        )
+        stmt = (
+            select(claimed.c.id, claimed.c.unique_id, User.tg_chat_id)
+            .join(User, User.id == claimed.c.user_id)
+            .order_by(User.tg_chat_id, claimed.c.id)
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.all()
+
+    async def release_reminders(self, advertisement_ids: list[int]):
+        """Возвращаем напоминания в очередь, если их не удалось отправить."""
+        stmt = (
+            update(Advertisement)
+            .where(Advertisement.id.in_(advertisement_ids))
+            .values(is_reminded=False)
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
     async def update_advertisement_reminder_time(self, advertisement_id: int, reminder_time: datetime):
         stmt = (
             update(Advertisement)
@@ -138,6 +259,11 @@ class AdvertisementRepo(BaseRepo):
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_advertisement_id_by_unique_id(self, unique_id: str) -> int | None:
+        stmt = select(Advertisement.id).where(Advertisement.unique_id == unique_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def get_advertisements(self, limit: int = 15, offset: int = 0):
         stmt = (
             select(Advertisement)
@@ -151,41 +277,7 @@ class AdvertisementRepo(BaseRepo):
 
     async def get_filtered_advertisements(self, _filter: AdvertisementFilter):
         # Создаем базовый запрос для фильтрации
-        query = select(Advertisement).filter(Advertisement.is_moderated == True)
-
-        if _filter.rooms:
-            rooms = [int(i) for i in _filter.rooms.split(",")]
-            query = query.filter(Advertisement.rooms_quantity.in_(rooms))
-        if _filter.operation_type:
-            query = query.filter(Advertisement.operation_type == _filter.operation_type)
-        if _filter.property_type:
-            query = query.filter(Advertisement.property_type == _filter.property_type)
-        if _filter.repair_type:
-            query = query.filter(Advertisement.repair_type == _filter.repair_type)
-        if _filter.floor_from:
-            query = query.filter(Advertisement.floor_from >= _filter.floor_from)
-        if _filter.floor_to:
-            query = query.filter(Advertisement.floor_to <= _filter.floor_to)
-        if _filter.house_quadrature_from:
-            query = query.filter(
-                Advertisement.house_quadrature_from >= _filter.house_quadrature_from
-            )
-        if _filter.house_quadrature_to:
-            query = query.filter(
-                Advertisement.house_quadrature_to <= _filter.house_quadrature_to
-            )
-        if _filter.price_from:
-            query = query.filter(Advertisement.price >= _filter.price_from)
-        if _filter.price_to:
-            query = query.filter(Advertisement.price <= _filter.price_to)
-        if _filter.quadrature_from:
-            query = query.filter(Advertisement.quadrature >= _filter.quadrature_from)
-        if _filter.quadrature_to:
-            query = query.filter(Advertisement.quadrature <= _filter.quadrature_to)
-        if _filter.category_id:
-            query = query.filter(Advertisement.category_id == _filter.category_id)
-        if _filter.district_id:
-            query = query.filter(Advertisement.district_id == _filter.district_id)
+        query = apply_advertisement_filter(select(Advertisement), _filter)
 
         # Подсчитываем общее количество отфильтрованных записей (без пагинации)
         count_query = query.with_only_columns(func.count().label("total_count"))
@@ -204,6 +296,105 @@ class AdvertisementRepo(BaseRepo):
         # Возвращаем результат: данные и общее количество
         return {"data": result.scalars().all(), "total_count": total_count}
 
+    async def get_advertisement_facets(self, _filter: AdvertisementFilter):
+        """Считаем количество объявлений по каждому значению фасетов одним запросом.
+
+        Фильтр применяется во вложенном запросе, а GROUPING SETS дает отдельную
+        группировку для каждого фасета и общий итог.
+        """
+        if _filter.operation_type == AdvertisementOperationType.rent:
+            price_bounds = RENT_PRICE_BOUNDS
+        elif _filter.operation_type == AdvertisementOperationType.buy:
+            price_bounds = BUY_PRICE_BOUNDS
+        else:
+            price_bounds = sorted(RENT_PRICE_BOUNDS + BUY_PRICE_BOUNDS)
+
+        filtered = apply_advertisement_filter(
+            select(
+                Advertisement.category_id.label("category_id"),
+                Advertisement.district_id.label("district_id"),
+                Advertisement.rooms_quantity.label("rooms"),
+                Advertisement.repair_type.label("repair_type"),
+                func.width_bucket(Advertisement.price, array(price_bounds)).label(
+                    "price_bucket"
+                ),
+            ),
+            _filter,
+        ).subquery()
+
+        facets = [
+            filtered.c.category_id,
+            filtered.c.district_id,
+            filtered.c.rooms,
+            filtered.c.repair_type,
+            filtered.c.price_bucket,
+        ]
+        stmt = select(
+            *facets,
+            func.count().label("count"),
+            func.grouping(*facets).label("grouping"),
+        ).group_by(func.grouping_sets(*(tuple_(facet) for facet in facets), tuple_()))
+        rows = (await self.session.execute(stmt)).all()
+
+        result = {"total": 0, **{facet.name: [] for facet in facets}}
+        for row in rows:
+            # бит grouping равен 0 у колонки, по которой сгруппирована строка
+            for position, facet in enumerate(facets):
+                if not row.grouping >> (len(facets) - 1 - position) & 1:
+                    result[facet.name].append((row[position], row.count))
+                    break
+            else:
+                result["total"] = row.count
+
+        # тип ремонта отдаем именем, как его принимает фильтр
+        result["repair_type"] = [
+            (repair_type.name if repair_type else None, count)
+            for repair_type, count in result["repair_type"]
+        ]
+        result["price_bucket"] = [
+            (
+                price_bounds[bucket - 1] if bucket > 0 else None,
+                price_bounds[bucket] if bucket < len(price_bounds) else None,
+                count,
+            )
+            for bucket, count in sorted(result["price_bucket"])
+        ]
+        return result
+
+    async def search_advertisements(self, _filter: AdvertisementSearchFilter):
+        """Полнотекстовый поиск с ранжированием и нечетким совпадением.
+
+        Слова ищутся по tsvector (русский словарь и simple для узбекского),
+        опечатки и части слов добиваются триграммным сравнением.
+        """
+        columns = Advertisement.__table__.c
+        text_query = _filter.q.strip().lower()
+        ts_query = func.websearch_to_tsquery(
+            literal_column("'russian'"), text_query
+        ).op("||")(func.websearch_to_tsquery(literal_column("'simple'"), text_query))
+
+        matched = or_(
+            columns.search_vector.op("@@")(ts_query),
+            literal(text_query).op("<%")(columns.search_text),
+        )
+        query = select(Advertisement).where(Advertisement.is_moderated == True, matched)
+        if _filter.operation_type:
+            query = query.where(Advertisement.operation_type == _filter.operation_type)
+
+        count_query = query.with_only_columns(func.count().label("total_count"))
+        total_count = (await self.session.execute(count_query)).scalar()
+
+        rank = func.ts_rank_cd(columns.search_vector, ts_query) + func.word_similarity(
+            text_query, columns.search_text
+        )
+        query = (
+            query.order_by(rank.desc(), desc(Advertisement.created_at))
+            .offset(_filter.offset)
+            .limit(_filter.limit)
+        )
+        result = await self.session.execute(query)
+        return {"total_count": total_count, "data": result.scalars().all()}
+
     async def get_advertisement_by_id(self, advertisement_id: int):
         stmt = (
             select(Advertisement)
@@ -218,6 +409,23 @@ class AdvertisementRepo(BaseRepo):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_advertisement_without_relations(self, advertisement_id: int):
+        stmt = select(Advertisement).where(Advertisement.id == advertisement_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_advertisement_summary(self, advertisement_id: int):
+        """Легкая выборка полей, нужных для рассылки, без загрузки связей."""
+        stmt = select(
+            Advertisement.id,
+            Advertisement.unique_id,
+            Advertisement.price,
+            Advertisement.operation_type,
+            Advertisement.user_id,
+        ).where(Advertisement.id == advertisement_id)
+        result = await self.session.execute(stmt)
+        return result.one_or_none()
+
     async def get_advertisement_by_title(self, title: str):
         stmt = select(Advertisement).where(Advertisement.name == title)
         result = await self.session.execute(stmt)
@@ -243,6 +451,11 @@ class AdvertisementRepo(BaseRepo):
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def get_user_advertisement_ids(self, user_id: int) -> list[int]:
+        stmt = select(Advertisement.id).where(Advertisement.user_id == user_id)
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
     async def update_advertisement_preview(self, advertisement_id: int, url: str):
         stmt = (
             update(Advertisement)
@@ -269,6 +482,15 @@ class AdvertisementRepo(BaseRepo):
         await self.session.commit()
         return updated.scalar_one()
 
+    async def confirm_moderation(self, advertisement_id: int):
+        """Публикуем объявление, время первой модерации не перезаписывается."""
+        return await self.update_advertisement(
+            advertisement_id,
+            is_moderated=True,
+            is_reminded=False,
+            moderated_at=func.coalesce(Advertisement.moderated_at, func.now()),
+        )
+
     async def delete_advertisement(self, advertisement_id: int):
         stmt = delete(Advertisement).where(Advertisement.id == advertisement_id)
         await self.session.execute(stmt)
@@ -279,6 +501,112 @@ class AdvertisementRepo(BaseRepo):
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def stream_advertisements_for_export(self, _filter: AdvertisementFilter):
+        """Отдаем строки выгрузки пачками через серверный курсор.
+
+        limit и offset фильтра не учитываются, выгружается вся выборка.
+        """
+        stmt = (
+            select(
+                Advertisement.unique_id,
+                Advertisement.name,
+                Advertisement.operation_type,
+                Advertisement.property_type,
+                Advertisement.repair_type,
+                Category.name.label("category"),
+                District.name.label("district"),
+                Advertisement.address,
+                Advertisement.price,
+                Advertisement.old_price,
+                Advertisement.rooms_quantity,
+                Advertisement.quadrature,
+                Advertisement.floor_from,
+                Advertisement.floor_to,
+                Advertisement.creation_year,
+                # fullname заполняют только скрипты, бот сохраняет имя и фамилию
+                func.coalesce(
+                    User.fullname, func.concat_ws(" ", User.first_name, User.lastname)
+                ).label("agent"),
+                User.phone_number.label("agent_phone_number"),
+                Advertisement.owner_phone_number,
+                Advertisement.created_at,
+            )
+            .outerjoin(Category, Category.id == Advertisement.category_id)
+            .outerjoin(District, District.id == Advertisement.district_id)
+            .outerjoin(User, User.id == Advertisement.user_id)
+            .order_by(Advertisement.id)
+        )
+        stmt = apply_advertisement_filter(stmt, _filter).execution_options(
+            yield_per=EXPORT_BATCH_SIZE
+        )
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    async def get_changes(self, after_txid: int, after_id: int, limit: int):
+        """Записи журнала после курсора (txid, id) из завершенных транзакций.
+
+        Транзакции с номером не меньше xmin снимка еще могут записать в журнал,
+        поэтому их записи отдаем в следующий раз.
+        """
+        xmin = cast(
+            cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), String), BigInteger
+        )
+        stmt = (
+            select(
+                AdvertisementChange.id,
+                AdvertisementChange.advertisement_id,
+                AdvertisementChange.operation,
+                AdvertisementChange.txid,
+                AdvertisementChange.changed_at,
+            )
+            .where(AdvertisementChange.txid < xmin)
+            .where(
+                tuple_(AdvertisementChange.txid, AdvertisementChange.id)
+                > tuple_(after_txid, after_id)
+            )
+            .order_by(AdvertisementChange.txid, AdvertisementChange.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def delete_changes_before(self, moment: datetime) -> int:
+        stmt = delete(AdvertisementChange).where(AdvertisementChange.changed_at < moment)
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.rowcount
+
+    async def get_analytics_rows(self, start: datetime, end: datetime):
+        """Колонки объявлений, созданных за период, для отчета директорам.
+
+        Возвращает названия колонок и строки без ORM объектов.
+        """
+        stmt = (
+            select(
+                Advertisement.id,
+                Advertisement.user_id,
+                func.coalesce(
+                    User.fullname, func.concat_ws(" ", User.first_name, User.lastname)
+                ).label("agent"),
+                cast(Advertisement.operation_type, String).label("operation_type"),
+                Category.name.label("category"),
+                District.name.label("district"),
+                Advertisement.price,
+                Advertisement.old_price,
+                Advertisement.new_price,
+                Advertisement.is_moderated,
+                Advertisement.created_at,
+                Advertisement.moderated_at,
+            )
+            .outerjoin(Category, Category.id == Advertisement.category_id)
+            .outerjoin(District, District.id == Advertisement.district_id)
+            .outerjoin(User, User.id == Advertisement.user_id)
+            .where(Advertisement.created_at >= start, Advertisement.created_at < end)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.keys()), result.all()
+
     async def get_all_moderated_advertisements(self, operation_type: str):
         stmt = (
             select(Advertisement)
@@ -335,24 +663,90 @@ class AdvertisementRepo(BaseRepo):
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
-    async def get_advertisements_by_operation_type(
-            self, operation_type: str, limit: int = 20, offset: int = 0
-    ):
-        stmt = (
+    @staticmethod
+    def _report_query(operation_type: str):
+        """Опубликованные объявления для отчетов в порядке id.
+
+        Агент, категория и район - связи многие к одному, поэтому подгружаются
+        JOIN в том же запросе.
+        """
+        return (
             select(Advertisement)
             .options(
-                selectinload(Advertisement.user),
-                selectinload(Advertisement.category),
-                selectinload(Advertisement.district),
+                joinedload(Advertisement.user),
+                joinedload(Advertisement.category),
+                joinedload(Advertisement.district),
             )
             .where(Advertisement.operation_type == operation_type)
             .where(Advertisement.is_moderated == True)
+            .order_by(Advertisement.id)
+        )
+
+    async def get_advertisements_by_operation_type(
+            self, operation_type: str, limit: int = 20, offset: int = 0
+    ):
+        stmt = self._report_query(operation_type).limit(limit).offset(offset)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_advertisements_by_operation_type_after(
+            self, operation_type: str, after_id: int = 0, limit: int = 20
+    ):
+        """Страница после объявления ``after_id``, без OFFSET и подсчета."""
+        stmt = (
+            self._report_query(operation_type)
+            .where(Advertisement.id > after_id)
             .limit(limit)
-            .offset(offset)
         )
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def stream_advertisements_by_operation_type(self, operation_type: str):
+        """Все объявления типа операции пачками через серверный курсор."""
+        stmt = self._report_query(operation_type).execution_options(
+            yield_per=REPORT_STREAM_BATCH_SIZE
+        )
+        result = await self.session.stream_scalars(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+
+class AdvertisementUniqueIdRepo(BaseRepo):
+    # номер = 100000 + (n * A + B) mod 900000, A взаимно просто с 900000,
+    # поэтому номера идут вразнобой и не повторяются в пределах круга
+    UNIQUE_ID_SPACE = 900000
+    UNIQUE_ID_MULTIPLIER = 386447
+    UNIQUE_ID_OFFSET = 271829
+    MAX_ATTEMPTS = 100
+
+    async def allocate_unique_id(self) -> str:
+        """Резервируем новый уникальный номер объявления за один запрос.
+
+        Конфликт возможен только с номерами, выданными до появления
+        последовательности, в этом случае берем следующее значение.
+        """
+        code = cast(
+            (
+                unique_id_sequence.next_value() * self.UNIQUE_ID_MULTIPLIER
+                + self.UNIQUE_ID_OFFSET
+            )
+            % self.UNIQUE_ID_SPACE
+            + 100000,
+            String,
+        )
+        stmt = (
+            insert(AdvertisementUniqueId)
+            .values(unique_id=code)
+            .on_conflict_do_nothing()
+            .returning(AdvertisementUniqueId.unique_id)
+        )
+        for _ in range(self.MAX_ATTEMPTS):
+            unique_id = (await self.session.execute(stmt)).scalar_one_or_none()
+            if unique_id is not None:
+                await self.session.commit()
+                return unique_id
+        raise RuntimeError("Failed to allocate advertisement unique_id")
+
 
 class AdvertisementImageRepo(BaseRepo):
     async def insert_advertisement_image(
@@ -0,0 +1,387 @@
+from sqlalchemy import case, delete, desc, func, literal_column, null, select, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+
+from backend.core.filters.advertisement import AdvertisementFilter
+from infrastructure.database.models import (
+    Advertisement,
+    AdvertisementImage,
+    CatalogueAdvertisement,
+    CatalogueRelatedAdvertisement,
+    Category,
+    District,
+    User,
+)
+from infrastructure.database.models.advertisement import OperationType
+from infrastructure.database.models.user import UserRole
+from .advertisement import apply_advertisement_filter
+from .base import BaseRepo
+
+RELATED_INSERT_BATCH_SIZE = 10000
+
+# поля, которые переносятся в витрину без изменений
+COPIED_COLUMNS = (
+    "id",
+    "unique_id",
+    "name",
+    "name_uz",
+    "description",
+    "description_uz",
+    "address",
+    "address_uz",
+    "price",
+    "old_price",
+    "rooms_quantity",
+    "quadrature",
+    "quadrature_from",
+    "quadrature_to",
+    "house_quadrature_from",
+    "house_quadrature_to",
+    "floor_from",
+    "floor_to",
+    "creation_year",
+    "operation_type",
+    "property_type",
+    "property_type_uz",
+    "repair_type",
+    "repair_type_uz",
+    "is_moderated",
+    "preview",
+    "category_id",
+    "district_id",
+    "user_id",
+    "created_at",
+)
+
+
+def _json_object(model, *fields):
+    """jsonb объект связанной модели или NULL, если связи нет."""
+    pairs = []
+    for field in fields:
+        pairs += [literal_column(f"'{field}'"), getattr(model, field)]
+    return case((model.id.is_(None), null()), else_=func.jsonb_build_object(*pairs))
+
+
+def _snapshot_query():
+    """Собираем строки витрины из опубликованных объявлений."""
+    images = (
+        select(
+            func.coalesce(
+                func.jsonb_agg(
+                    aggregate_order_by(
+                        func.jsonb_build_object(
+                            literal_column("'id'"),
+                            AdvertisementImage.id,
+                            literal_column("'url'"),
+                            AdvertisementImage.url,
+                        ),
+                        AdvertisementImage.id,
+                    )
+                ),
+                literal_column("'[]'::jsonb"),
+            )
+        )
+        .where(AdvertisementImage.advertisement_id == Advertisement.id)
+        .scalar_subquery()
+    )
+    first_image = (
+        select(AdvertisementImage.url)
+        .where(AdvertisementImage.advertisement_id == Advertisement.id)
+        .order_by(AdvertisementImage.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    return (
+        select(
+            *(getattr(Advertisement, column) for column in COPIED_COLUMNS),
+            images,
+            first_image,
+            _json_object(Category, "id", "name", "name_uz", "slug"),
+            _json_object(District, "id", "name", "name_uz", "slug"),
+            _json_object(
+                User,
+                "id",
+                "fullname",
+                "first_name",
+                "lastname",
+                "tg_username",
+                "phone_number",
+                "profile_image",
+            ),
+        )
+        .outerjoin(Category, Category.id == Advertisement.category_id)
+        .outerjoin(District, District.id == Advertisement.district_id)
+        .outerjoin(User, User.id == Advertisement.user_id)
+        .where(Advertisement.is_moderated == True)
+    )
+
+
+# поля карточки в списках (AdvertisementDTO), остальное витрины списку не нужно
+LIST_COLUMNS = (
+    "id",
+    "unique_id",
+    "name",
+    "name_uz",
+    "price",
+    "old_price",
+    "address",
+    "address_uz",
+    "rooms_quantity",
+    "quadrature_from",
+    "quadrature_to",
+    "quadrature",
+    "floor_from",
+    "floor_to",
+    "preview",
+    "is_moderated",
+    "created_at",
+)
+
+SNAPSHOT_COLUMNS = (
+    *COPIED_COLUMNS,
+    "images",
+    "first_image",
+    "category",
+    "district",
+    "user",
+)
+
+
+class CatalogueRepo(BaseRepo):
+    async def _upsert_snapshot(self, snapshot_query):
+        """Вставляем или обновляем строки витрины без промежуточного удаления.
+
+        При DELETE и INSERT два параллельных обновления одного объявления
+        могли не увидеть строки друг друга и упасть на первичном ключе.
+        """
+        stmt = insert(CatalogueAdvertisement).from_select(
+            SNAPSHOT_COLUMNS, snapshot_query
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CatalogueAdvertisement.id],
+            set_={
+                **{
+                    column: stmt.excluded[column]
+                    for column in SNAPSHOT_COLUMNS
+                    if column != "id"
+                },
+                # onupdate для ON CONFLICT не применяется
+                "refreshed_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def refresh_advertisements(self, advertisement_ids: list[int]):
+        """Пересобираем строки витрины для указанных объявлений.
+
+        Снятые с публикации объявления из витрины удаляются, удаленные
+        объявления убирает внешний ключ с ON DELETE CASCADE.
+        """
+        if not advertisement_ids:
+            return
+        await self._upsert_snapshot(
+            _snapshot_query().where(Advertisement.id.in_(advertisement_ids))
+        )
+        published = select(Advertisement.id).where(
+            Advertisement.id.in_(advertisement_ids), Advertisement.is_moderated == True
+        )
+        await self.session.execute(
+            delete(CatalogueAdvertisement)
+            .where(CatalogueAdvertisement.id.in_(advertisement_ids))
+            .where(CatalogueAdvertisement.id.not_in(published))
+        )
+        await self.session.commit()
+
+    async def rebuild(self):
+        """Полностью пересобираем витрину, например после ручных правок в базе."""
+        await self._upsert_snapshot(_snapshot_query())
+        published = select(Advertisement.id).where(Advertisement.is_moderated == True)
+        await self.session.execute(
+            delete(CatalogueAdvertisement).where(
+                CatalogueAdvertisement.id.not_in(published)
+            )
+        )
+        await self.session.commit()
+
+    async def get_filtered_advertisements(self, _filter: AdvertisementFilter):
+        query = apply_advertisement_filter(
+            select(CatalogueAdvertisement), _filter, model=CatalogueAdvertisement
+        )
+
+        count_query = query.with_only_columns(func.count().label("total_count"))
+        total_count = (await self.session.execute(count_query)).scalar()
+
+        query = (
+            query.order_by(desc(CatalogueAdvertisement.created_at))
+            .offset(_filter.offset)
+            .limit(_filter.limit)
+        )
+        result = await self.session.execute(query)
+        return {"data": result.scalars().all(), "total_count": total_count}
+
+    async def get_advertisement_by_id(self, advertisement_id: int):
+        stmt = select(CatalogueAdvertisement).where(
+            CatalogueAdvertisement.id == advertisement_id
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_agents(self, limit: int, offset: int):
+        """Страница агентов с числом опубликованных объявлений по типам.
+
+        Считаем объявления только агентов страницы, чтобы не группировать
+        всю витрину.
+        """
+        page = (
+            select(
+                User.id,
+                User.first_name,
+                User.lastname,
+                User.tg_username,
+                User.phone_number,
+            )
+            .where(User.role == UserRole.REALTOR)
+            .order_by(User.id)
+            .offset(offset)
+            .limit(limit)
+            .cte("agents_page")
+        )
+        counts = (
+            select(
+                CatalogueAdvertisement.user_id,
+                func.count()
+                .filter(CatalogueAdvertisement.operation_type == OperationType.RENT)
+                .label("rent_count"),
+                func.count()
+                .filter(CatalogueAdvertisement.operation_type == OperationType.BUY)
+                .label("buy_count"),
+            )
+            .where(CatalogueAdvertisement.user_id.in_(select(page.c.id)))
+            .group_by(CatalogueAdvertisement.user_id)
+            .subquery()
+        )
+        stmt = (
+            select(
+                page,
+                func.coalesce(counts.c.rent_count, 0).label("rent_count"),
+                func.coalesce(counts.c.buy_count, 0).label("buy_count"),
+            )
+            .outerjoin(counts, counts.c.user_id == page.c.id)
+            .order_by(page.c.id)
+        )
+        total_count = await self.session.scalar(
+            select(func.count()).where(User.role == UserRole.REALTOR)
+        )
+        result = await self.session.execute(stmt)
+        return {"data": result.all(), "total_count": total_count}
+
+    async def get_agent_summary(self, agent_id: int):
+        """Агент и число его опубликованных объявлений по типам одним запросом.
+
+        Возвращает None, если агента нет.
+        """
+        counts = (
+            select(
+                func.count()
+                .filter(CatalogueAdvertisement.operation_type == OperationType.RENT)
+                .label("rent_count"),
+                func.count()
+                .filter(CatalogueAdvertisement.operation_type == OperationType.BUY)
+                .label("buy_count"),
+            )
+            .where(CatalogueAdvertisement.user_id == agent_id)
+            .subquery()
+        )
+        stmt = (
+            select(
+                User.id,
+                User.first_name,
+                User.lastname,
+                User.tg_username,
+                User.phone_number,
+                User.profile_image,
+                counts.c.rent_count,
+                counts.c.buy_count,
+            )
+            .join(counts, true())
+            .where(User.id == agent_id)
+        )
+        result = await self.session.execute(stmt)
+        return result.one_or_none()
+
+    async def get_agent_advertisements(self, agent_id: int, limit: int, offset: int):
+        stmt = (
+            select(
+                *(getattr(CatalogueAdvertisement, column) for column in LIST_COLUMNS)
+            )
+            .where(CatalogueAdvertisement.user_id == agent_id)
+            .order_by(
+                desc(CatalogueAdvertisement.created_at),
+                desc(CatalogueAdvertisement.id),
+            )
+            .offset(offset)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def get_advertisements_by_category_id_and_operation_type(
+        self, category_id: int, operation_type, exclude_id: int | None = None
+    ):
+        stmt = (
+            select(CatalogueAdvertisement)
+            .where(CatalogueAdvertisement.category_id == category_id)
+            .where(CatalogueAdvertisement.operation_type == operation_type)
+            .where(CatalogueAdvertisement.id != exclude_id)
+            .limit(12)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_related_advertisements(self, advertisement_id: int):
+        stmt = (
+            select(CatalogueAdvertisement)
+            .join(
+                CatalogueRelatedAdvertisement,
+                CatalogueRelatedAdvertisement.related_id == CatalogueAdvertisement.id,
+            )
+            .where(CatalogueRelatedAdvertisement.advertisement_id == advertisement_id)
+            .order_by(CatalogueRelatedAdvertisement.position)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_recommendation_features(self):
+        """Признаки опубликованных объявлений для расчета похожих."""
+        stmt = select(
+            CatalogueAdvertisement.id,
+            CatalogueAdvertisement.operation_type,
+            CatalogueAdvertisement.category_id,
+            CatalogueAdvertisement.district_id,
+            CatalogueAdvertisement.price,
+            CatalogueAdvertisement.rooms_quantity,
+        ).order_by(CatalogueAdvertisement.operation_type, CatalogueAdvertisement.id)
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def replace_related_advertisements(
+        self, rows: list[tuple[int, int, int, float]]
+    ):
+        """Заменяем рекомендации одной транзакцией, сайт до коммита видит старые."""
+        await self.session.execute(delete(CatalogueRelatedAdvertisement))
+        for start in range(0, len(rows), RELATED_INSERT_BATCH_SIZE):
+            await self.session.execute(
+                insert(CatalogueRelatedAdvertisement),
+                [
+                    {
+                        "advertisement_id": advertisement_id,
+                        "position": position,
+                        "related_id": related_id,
+                        "score": score,
+                    }
+                    for advertisement_id, position, related_id, score in rows[
+                        start : start + RELATED_INSERT_BATCH_SIZE
+                    ]
+                ],
+            )
+        await self.session.commit()
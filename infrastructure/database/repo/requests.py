@@ -2,7 +2,13 @@ from dataclasses import dataclass
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .advertisement import AdvertisementRepo, AdvertisementImageRepo, AdvertisementQueueRepo
+from .advertisement import (
+    AdvertisementRepo,
+    AdvertisementImageRepo,
+    AdvertisementQueueRepo,
+    AdvertisementUniqueIdRepo,
+)
+from .catalogue import CatalogueRepo
 from .category import CategoryRepo
 from .consultation import ConsultationRepo
 from .district import DistrictRepo
@@ -14,6 +20,10 @@ from .user_request import UserRequestRepo
 class RequestsRepo:
     session: AsyncSession
 
+    @property
+    def catalogue(self) -> CatalogueRepo:
+        return CatalogueRepo(self.session)
+
     @property
     def categories(self) -> CategoryRepo:
         return CategoryRepo(self.session)
@@ -38,6 +48,10 @@ class RequestsRepo:
     def advertisement_queue(self) -> AdvertisementQueueRepo:
         return AdvertisementQueueRepo(self.session)
 
+    @property
+    def advertisement_unique_ids(self) -> AdvertisementUniqueIdRepo:
+        return AdvertisementUniqueIdRepo(self.session)
+
     @property
     def user_request(self) -> UserRequestRepo:
         return UserRequestRepo(self.session)
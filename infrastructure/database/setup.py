@@ -1,20 +1,123 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+import asyncio
+from dataclasses import asdict, dataclass
+from uuid import uuid4
+from weakref import WeakKeyDictionary
 
-from config.db_config import DbConfig
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 
+from config.db_config import SCRIPT, DbConfig
+from .query_log import register_query_logging
 
-def create_engine(db: DbConfig, echo=False):
+
+@dataclass
+class PoolStats:
+    role: str
+    connects: int = 0
+    checkouts: int = 0
+    invalidations: int = 0
+    max_checked_out: int = 0
+
+
+_pool_stats: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def _connect_args(db: DbConfig, role: str) -> dict:
+    connect_args = {
+        "server_settings": {"application_name": f"{db.application_name}:{role}"}
+    }
+    if db.pgbouncer:
+        # за PgBouncer соединение с сервером меняется между транзакциями,
+        # поэтому кеш подготовленных запросов отключаем, а имена делаем уникальными
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+    return connect_args
+
+
+def _track_pool(engine: AsyncEngine, role: str):
+    pool = engine.sync_engine.pool
+    stats = _pool_stats[pool] = PoolStats(role=role)
+
+    @event.listens_for(pool, "connect")
+    def on_connect(*_):
+        stats.connects += 1
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(*_):
+        stats.checkouts += 1
+        stats.max_checked_out = max(stats.max_checked_out, pool.checkedout())
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(*_):
+        stats.invalidations += 1
+
+
+def create_engine(db: DbConfig, echo=False, role: str = SCRIPT):
+    pool = db.pool_for(role)
     engine = create_async_engine(
         db.construct_sqlalchemy_url(),
         query_cache_size=1200,
-        pool_size=20,
-        max_overflow=200,
+        pool_size=pool.size,
+        max_overflow=pool.max_overflow,
+        pool_timeout=pool.timeout,
+        pool_recycle=db.pool_recycle,
+        pool_pre_ping=db.pool_pre_ping,
+        connect_args=_connect_args(db, role),
         future=True,
         echo=echo,
     )
+    _track_pool(engine, role)
+    register_query_logging(
+        engine, role, db.slow_query_ms, sample_rate=db.query_sample_rate
+    )
     return engine
 
 
+def pool_status(engine: AsyncEngine) -> dict:
+    """Текущее состояние пула и счетчики с момента создания движка."""
+    pool = engine.sync_engine.pool
+    return {
+        **asdict(_pool_stats[pool]),
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool считает overflow от -size, пока основной пул не заполнен
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
 def create_session_pool(engine):
     session_pool = async_sessionmaker(bind=engine, expire_on_commit=False)
     return session_pool
+
+
+# соединения asyncpg привязаны к event loop, поэтому движок один на loop;
+# в процессе обычно один loop, и роль задает первый вызов
+_engines: "WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = WeakKeyDictionary()
+
+
+def get_engine(db: DbConfig, role: str = SCRIPT) -> AsyncEngine:
+    """Возвращаем общий движок текущего event loop, создавая его при первом вызове."""
+    return _get_registered(db, role)[0]
+
+
+def get_session_pool(db: DbConfig, role: str = SCRIPT) -> async_sessionmaker:
+    return _get_registered(db, role)[1]
+
+
+def _get_registered(db: DbConfig, role: str) -> tuple:
+    loop = asyncio.get_running_loop()
+    if loop not in _engines:
+        engine = create_engine(db, role=role)
+        _engines[loop] = (engine, create_session_pool(engine))
+    return _engines[loop]
+
+
+async def dispose_engine() -> None:
+    """Закрываем соединения движка текущего event loop."""
+    registered = _engines.pop(asyncio.get_running_loop(), None)
+    if registered is not None:
+        await registered[0].dispose()
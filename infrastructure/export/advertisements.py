@@ -0,0 +1,116 @@
+"""Выгрузка объявлений в CSV и XLSX без загрузки всей выборки в память.
+
+Строки читаются из базы пачками, CSV отдается по мере чтения, XLSX пишется
+в режиме write-only openpyxl во временный файл.
+"""
+import asyncio
+import csv
+import enum
+import io
+import os
+import tempfile
+from datetime import datetime
+from typing import AsyncIterator
+
+from openpyxl import Workbook
+
+from backend.core.filters.advertisement import AdvertisementFilter
+from infrastructure.database.repo.requests import RequestsRepo
+
+# колонка запроса и заголовок в файле
+COLUMNS = (
+    ("unique_id", "ID"),
+    ("name", "Название"),
+    ("operation_type", "Тип операции"),
+    ("property_type", "Тип недвижимости"),
+    ("repair_type", "Ремонт"),
+    ("category", "Категория"),
+    ("district", "Район"),
+    ("address", "Адрес"),
+    ("price", "Цена"),
+    ("old_price", "Старая цена"),
+    ("rooms_quantity", "Комнат"),
+    ("quadrature", "Площадь"),
+    ("floor_from", "Этаж"),
+    ("floor_to", "Этажность"),
+    ("creation_year", "Год постройки"),
+    ("agent", "Агент"),
+    ("agent_phone_number", "Телефон агента"),
+    ("owner_phone_number", "Телефон собственника"),
+    ("created_at", "Создано"),
+)
+HEADERS = [header for _, header in COLUMNS]
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class ExportFormat(str, enum.Enum):
+    csv = "csv"
+    xlsx = "xlsx"
+
+
+CONTENT_TYPES = {
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    ExportFormat.xlsx: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _values(row) -> list:
+    values = []
+    for name, _ in COLUMNS:
+        value = row._mapping[name]
+        if isinstance(value, enum.Enum):
+            value = value.value
+        elif isinstance(value, datetime):
+            # openpyxl не пишет даты с часовым поясом
+            value = value.replace(tzinfo=None)
+        values.append(value)
+    return values
+
+
+async def _partitions(session_pool, _filter: AdvertisementFilter):
+    async with session_pool() as session:
+        repo = RequestsRepo(session)
+        async for partition in repo.advertisements.stream_advertisements_for_export(
+            _filter
+        ):
+            yield partition
+
+
+async def iter_csv(session_pool, _filter: AdvertisementFilter) -> AsyncIterator[bytes]:
+    """CSV по пачкам, BOM нужен, чтобы Excel открыл кириллицу."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(HEADERS)
+    async for partition in _partitions(session_pool, _filter):
+        writer.writerows(_values(row) for row in partition)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _append_rows(sheet, partition):
+    for row in partition:
+        sheet.append(_values(row))
+
+
+async def write_xlsx(session_pool, _filter: AdvertisementFilter, path: str) -> None:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Объявления")
+    sheet.append(HEADERS)
+    async for partition in _partitions(session_pool, _filter):
+        # запись и сжатие файла не должны держать event loop
+        await asyncio.to_thread(_append_rows, sheet, partition)
+    await asyncio.to_thread(workbook.save, path)
+
+
+async def iter_xlsx(session_pool, _filter: AdvertisementFilter) -> AsyncIterator[bytes]:
+    """XLSX собирается во временном файле и отдается частями."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "advertisements.xlsx")
+        await write_xlsx(session_pool, _filter, path)
+        with open(path, "rb") as file:
+            while chunk := file.read(FILE_CHUNK_SIZE):
+                yield chunk
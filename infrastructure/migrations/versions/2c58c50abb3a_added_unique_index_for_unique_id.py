@@ -0,0 +1,57 @@
+"""added unique index for unique_id
+
+Revision ID: 2c58c50abb3a
+Revises: 4b253424214c
+Create Date: 2026-10-19 17:21:03.557190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c58c50abb3a'
+down_revision: Union[str, None] = '4b253424214c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# то же преобразование, что и в AdvertisementUniqueIdRepo.allocate_unique_id
+ALLOCATE_UNIQUE_ID = sa.text(
+    "INSERT INTO advertisement_unique_ids (unique_id) "
+    "VALUES (CAST((nextval('advertisement_unique_id_seq') * 386447 + 271829) "
+    "% 900000 + 100000 AS VARCHAR)) "
+    "ON CONFLICT DO NOTHING RETURNING unique_id"
+)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+
+    # старые номера генерировались случайно и могли повторяться,
+    # у дубликатов (кроме самого раннего объявления) номер заменяем новым
+    duplicate_ids = connection.execute(
+        sa.text(
+            "SELECT id FROM ("
+            "SELECT id, row_number() OVER (PARTITION BY unique_id ORDER BY id) AS rn "
+            "FROM advertisements WHERE unique_id IS NOT NULL"
+            ") AS numbered WHERE rn > 1"
+        )
+    ).scalars().all()
+
+    for advertisement_id in duplicate_ids:
+        unique_id = None
+        while unique_id is None:
+            unique_id = connection.execute(ALLOCATE_UNIQUE_ID).scalar_one_or_none()
+        connection.execute(
+            sa.text("UPDATE advertisements SET unique_id = :unique_id WHERE id = :id"),
+            {"unique_id": unique_id, "id": advertisement_id},
+        )
+
+    op.create_index(op.f('ix_advertisements_unique_id'), 'advertisements', ['unique_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_advertisements_unique_id'), table_name='advertisements')
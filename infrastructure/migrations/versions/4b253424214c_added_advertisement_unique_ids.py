@@ -0,0 +1,48 @@
+"""added advertisement unique ids
+
+Revision ID: 4b253424214c
+Revises: aa0dca48fe0a
+Create Date: 2026-10-19 16:48:37.102954
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b253424214c'
+down_revision: Union[str, None] = 'aa0dca48fe0a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        sa.schema.CreateSequence(
+            sa.Sequence(
+                'advertisement_unique_id_seq',
+                start=0,
+                minvalue=0,
+                maxvalue=899999,
+                cycle=True,
+            )
+        )
+    )
+    op.create_table('advertisement_unique_ids',
+    sa.Column('unique_id', sa.String(length=6), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('unique_id')
+    )
+    # уже выданные номера резервируем, чтобы последовательность их пропускала
+    op.execute(
+        "INSERT INTO advertisement_unique_ids (unique_id) "
+        "SELECT DISTINCT unique_id FROM advertisements WHERE unique_id IS NOT NULL "
+        "ON CONFLICT DO NOTHING"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('advertisement_unique_ids')
+    op.execute(sa.schema.DropSequence(sa.Sequence('advertisement_unique_id_seq')))
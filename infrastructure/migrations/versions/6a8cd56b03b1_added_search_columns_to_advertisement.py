@@ -0,0 +1,49 @@
+"""added search columns to advertisement
+
+Revision ID: 6a8cd56b03b1
+Revises: 2c58c50abb3a
+Create Date: 2026-10-19 17:58:44.210375
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a8cd56b03b1'
+down_revision: Union[str, None] = '2c58c50abb3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(name_uz, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(address, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(address_uz, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(description_uz, '')), 'C')"
+)
+SEARCH_TEXT_EXPRESSION = (
+    "lower(coalesce(name, '') || ' ' || coalesce(name_uz, '') || ' ' || "
+    "coalesce(address, '') || ' ' || coalesce(address_uz, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(description_uz, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('advertisements', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True), nullable=True))
+    op.add_column('advertisements', sa.Column('search_text', sa.String(), sa.Computed(SEARCH_TEXT_EXPRESSION, persisted=True), nullable=True))
+    op.create_index('ix_advertisements_search_vector', 'advertisements', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_advertisements_search_text', 'advertisements', ['search_text'], unique=False, postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_advertisements_search_text', table_name='advertisements', postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'})
+    op.drop_index('ix_advertisements_search_vector', table_name='advertisements', postgresql_using='gin')
+    op.drop_column('advertisements', 'search_text')
+    op.drop_column('advertisements', 'search_vector')
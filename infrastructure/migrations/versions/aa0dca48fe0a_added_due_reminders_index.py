@@ -0,0 +1,45 @@
+"""added due reminders index
+
+Revision ID: aa0dca48fe0a
+Revises: c7c7a25853cc
+Create Date: 2026-10-19 16:05:12.418213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'aa0dca48fe0a'
+down_revision: Union[str, None] = 'c7c7a25853cc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # напоминания с прошедшим временем уже отправлены ETA задачами,
+    # иначе периодическая проверка разошлет их повторно
+    op.execute(
+        "UPDATE advertisements SET is_reminded = true "
+        "WHERE reminder_time <= now() AT TIME ZONE 'utc'"
+    )
+    op.execute(
+        "UPDATE advertisements SET is_reminded = false WHERE is_reminded IS NULL"
+    )
+    op.create_index(
+        'ix_advertisements_due_reminders',
+        'advertisements',
+        ['reminder_time'],
+        unique=False,
+        postgresql_where=sa.text('is_reminded = false AND is_moderated = true'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_advertisements_due_reminders',
+        table_name='advertisements',
+        postgresql_where=sa.text('is_reminded = false AND is_moderated = true'),
+    )
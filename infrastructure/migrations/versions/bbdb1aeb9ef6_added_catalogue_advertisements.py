@@ -0,0 +1,118 @@
+"""added catalogue advertisements
+
+Revision ID: bbdb1aeb9ef6
+Revises: 6a8cd56b03b1
+Create Date: 2026-10-19 19:12:31.508126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bbdb1aeb9ef6'
+down_revision: Union[str, None] = '6a8cd56b03b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COPIED_COLUMNS = (
+    "id, unique_id, name, name_uz, description, description_uz, address, "
+    "address_uz, price, old_price, rooms_quantity, quadrature, quadrature_from, "
+    "quadrature_to, house_quadrature_from, house_quadrature_to, floor_from, "
+    "floor_to, creation_year, operation_type, property_type, property_type_uz, "
+    "repair_type, repair_type_uz, is_moderated, preview, category_id, "
+    "district_id, user_id, created_at"
+)
+
+BACKFILL = f"""
+INSERT INTO catalogue_advertisements (
+    {COPIED_COLUMNS}, images, first_image, category, district, "user"
+)
+SELECT
+    {', '.join('a.' + column.strip() for column in COPIED_COLUMNS.split(','))},
+    (
+        SELECT coalesce(
+            jsonb_agg(jsonb_build_object('id', i.id, 'url', i.url) ORDER BY i.id),
+            '[]'::jsonb
+        )
+        FROM advertisement_images i WHERE i.advertisement_id = a.id
+    ),
+    (
+        SELECT i.url FROM advertisement_images i
+        WHERE i.advertisement_id = a.id ORDER BY i.id LIMIT 1
+    ),
+    CASE WHEN c.id IS NULL THEN NULL ELSE jsonb_build_object(
+        'id', c.id, 'name', c.name, 'name_uz', c.name_uz, 'slug', c.slug
+    ) END,
+    CASE WHEN d.id IS NULL THEN NULL ELSE jsonb_build_object(
+        'id', d.id, 'name', d.name, 'name_uz', d.name_uz, 'slug', d.slug
+    ) END,
+    CASE WHEN u.id IS NULL THEN NULL ELSE jsonb_build_object(
+        'id', u.id, 'fullname', u.fullname, 'first_name', u.first_name,
+        'lastname', u.lastname, 'tg_username', u.tg_username,
+        'phone_number', u.phone_number, 'profile_image', u.profile_image
+    ) END
+FROM advertisements a
+LEFT JOIN categories c ON c.id = a.category_id
+LEFT JOIN districts d ON d.id = a.district_id
+LEFT JOIN users u ON u.id = a.user_id
+WHERE a.is_moderated = true
+"""
+
+
+def upgrade() -> None:
+    op.create_table('catalogue_advertisements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('unique_id', sa.String(length=6), nullable=True),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('name_uz', sa.String(), nullable=True),
+    sa.Column('description', sa.String(), nullable=False),
+    sa.Column('description_uz', sa.String(), nullable=True),
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('address_uz', sa.String(), nullable=True),
+    sa.Column('price', sa.Integer(), nullable=False),
+    sa.Column('old_price', sa.Integer(), nullable=True),
+    sa.Column('rooms_quantity', sa.Integer(), nullable=True),
+    sa.Column('quadrature', sa.Integer(), nullable=True),
+    sa.Column('quadrature_from', sa.Integer(), nullable=True),
+    sa.Column('quadrature_to', sa.Integer(), nullable=True),
+    sa.Column('house_quadrature_from', sa.Integer(), nullable=True),
+    sa.Column('house_quadrature_to', sa.Integer(), nullable=True),
+    sa.Column('floor_from', sa.Integer(), nullable=False),
+    sa.Column('floor_to', sa.Integer(), nullable=False),
+    sa.Column('creation_year', sa.Integer(), nullable=True),
+    sa.Column('operation_type', postgresql.ENUM('BUY', 'RENT', name='operationtype', create_type=False), nullable=False),
+    sa.Column('property_type', postgresql.ENUM(name='propertytype', create_type=False), nullable=False),
+    sa.Column('property_type_uz', postgresql.ENUM(name='propertytypeuz', create_type=False), nullable=True),
+    sa.Column('repair_type', postgresql.ENUM(name='repairtype', create_type=False), nullable=False),
+    sa.Column('repair_type_uz', postgresql.ENUM(name='repairtypeuz', create_type=False), nullable=True),
+    sa.Column('is_moderated', sa.Boolean(), nullable=False),
+    sa.Column('preview', sa.String(), nullable=True),
+    sa.Column('first_image', sa.String(), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('district_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('category', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('district', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('user', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('images', postgresql.JSONB(astext_type=sa.Text()), server_default='[]', nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('refreshed_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['id'], ['advertisements.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_catalogue_advertisements_category_id', 'catalogue_advertisements', ['category_id'], unique=False)
+    op.create_index('ix_catalogue_advertisements_operation_type_created_at', 'catalogue_advertisements', ['operation_type', 'created_at'], unique=False)
+    op.create_index('ix_catalogue_advertisements_user_id', 'catalogue_advertisements', ['user_id'], unique=False)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_catalogue_advertisements_user_id', table_name='catalogue_advertisements')
+    op.drop_index('ix_catalogue_advertisements_operation_type_created_at', table_name='catalogue_advertisements')
+    op.drop_index('ix_catalogue_advertisements_category_id', table_name='catalogue_advertisements')
+    op.drop_table('catalogue_advertisements')
@@ -0,0 +1,36 @@
+"""added catalogue related advertisements
+
+Revision ID: c4060b0ead17
+Revises: bbdb1aeb9ef6
+Create Date: 2026-10-19 20:03:17.622904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4060b0ead17'
+down_revision: Union[str, None] = 'bbdb1aeb9ef6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('catalogue_related_advertisements',
+    sa.Column('advertisement_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.SmallInteger(), nullable=False),
+    sa.Column('related_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['advertisement_id'], ['advertisements.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['related_id'], ['advertisements.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('advertisement_id', 'position')
+    )
+    op.create_index(op.f('ix_catalogue_related_advertisements_related_id'), 'catalogue_related_advertisements', ['related_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_catalogue_related_advertisements_related_id'), table_name='catalogue_related_advertisements')
+    op.drop_table('catalogue_related_advertisements')
@@ -0,0 +1,26 @@
+"""added moderated_at to advertisement
+
+Revision ID: e5b2d8c41f07
+Revises: c4060b0ead17
+Create Date: 2026-10-19 21:10:42.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b2d8c41f07'
+down_revision: Union[str, None] = 'c4060b0ead17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('advertisements', sa.Column('moderated_at', sa.TIMESTAMP(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('advertisements', 'moderated_at')
@@ -0,0 +1,119 @@
+"""added updated_at and advertisement_changes
+
+Revision ID: f3a9c6e2d184
+Revises: e5b2d8c41f07
+Create Date: 2026-10-19 22:04:11.730215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c6e2d184'
+down_revision: Union[str, None] = 'e5b2d8c41f07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# updated_at и журнал ведет база, поэтому их не обходят ни bulk запросы,
+# ни ручные правки; pg_current_xact_id появился в PostgreSQL 13
+TRIGGERS_SQL = """
+CREATE FUNCTION advertisements_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER advertisements_touch_updated_at
+    BEFORE UPDATE ON advertisements
+    FOR EACH ROW EXECUTE FUNCTION advertisements_touch_updated_at();
+
+CREATE FUNCTION advertisements_log_change() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO advertisement_changes (advertisement_id, operation)
+    VALUES (CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END, lower(TG_OP));
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER advertisements_log_change
+    AFTER INSERT OR UPDATE OR DELETE ON advertisements
+    FOR EACH ROW EXECUTE FUNCTION advertisements_log_change();
+
+-- фотографии меняют объявление для сайта: трогаем родителя одним UPDATE на
+-- запрос, дальше срабатывают триггеры объявлений; при каскадном удалении
+-- объявления родителя уже нет и UPDATE ничего не меняет
+CREATE FUNCTION advertisement_images_touch_advertisements() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE advertisements SET updated_at = now()
+        WHERE id IN (SELECT advertisement_id FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE advertisements SET updated_at = now()
+        WHERE id IN (SELECT advertisement_id FROM old_rows);
+    ELSE
+        UPDATE advertisements SET updated_at = now()
+        WHERE id IN (OLD.advertisement_id, NEW.advertisement_id);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER advertisement_images_insert
+    AFTER INSERT ON advertisement_images
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION advertisement_images_touch_advertisements();
+
+-- хеши фотографий сайту не нужны, следим только за url; правки фотографий
+-- редкие, поэтому триггер построчный
+CREATE TRIGGER advertisement_images_update
+    AFTER UPDATE ON advertisement_images
+    FOR EACH ROW
+    WHEN (
+        OLD.url IS DISTINCT FROM NEW.url
+        OR OLD.advertisement_id IS DISTINCT FROM NEW.advertisement_id
+    )
+    EXECUTE FUNCTION advertisement_images_touch_advertisements();
+
+CREATE TRIGGER advertisement_images_delete
+    AFTER DELETE ON advertisement_images
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION advertisement_images_touch_advertisements();
+"""
+
+
+def upgrade() -> None:
+    op.create_table('advertisement_changes',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('advertisement_id', sa.Integer(), nullable=False),
+    sa.Column('operation', sa.String(length=6), nullable=False),
+    sa.Column('txid', sa.BigInteger(), server_default=sa.text('pg_current_xact_id()::text::bigint'), nullable=False),
+    sa.Column('changed_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_advertisement_changes_txid_id', 'advertisement_changes', ['txid', 'id'], unique=False)
+    op.create_index('ix_advertisement_changes_changed_at', 'advertisement_changes', ['changed_at'], unique=False)
+
+    op.add_column('advertisements', sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False))
+    # до создания триггеров, чтобы заполнение не попало в журнал
+    op.execute("UPDATE advertisements SET updated_at = coalesce(created_at, now())")
+    op.execute(TRIGGERS_SQL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER advertisement_images_delete ON advertisement_images")
+    op.execute("DROP TRIGGER advertisement_images_update ON advertisement_images")
+    op.execute("DROP TRIGGER advertisement_images_insert ON advertisement_images")
+    op.execute("DROP FUNCTION advertisement_images_touch_advertisements()")
+    op.execute("DROP TRIGGER advertisements_log_change ON advertisements")
+    op.execute("DROP FUNCTION advertisements_log_change()")
+    op.execute("DROP TRIGGER advertisements_touch_updated_at ON advertisements")
+    op.execute("DROP FUNCTION advertisements_touch_updated_at()")
+    op.drop_column('advertisements', 'updated_at')
+    op.drop_index('ix_advertisement_changes_changed_at', table_name='advertisement_changes')
+    op.drop_index('ix_advertisement_changes_txid_id', table_name='advertisement_changes')
+    op.drop_table('advertisement_changes')
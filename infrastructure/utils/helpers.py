@@ -6,9 +6,4 @@ def generate_code():
 
 
 async def get_unique_code(repo):
-    unique_codes = await repo.advertisements.get_all_unique_ids()
-    while True:
-        code = generate_code()
-
-        if code not in unique_codes:
-            return code
+    return await repo.advertisement_unique_ids.allocate_unique_id()
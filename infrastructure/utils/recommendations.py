@@ -0,0 +1,115 @@
+import numpy as np
+
+RELATED_LIMIT = 12
+
+# веса признаков похожести объявлений
+CATEGORY_WEIGHT = 4.0
+DISTRICT_WEIGHT = 2.0
+PRICE_WEIGHT = 3.0
+ROOMS_WEIGHT = 1.0
+# вклад цены и комнат линейно падает до нуля: цены, отличающиеся вдвое,
+# и разница в три комнаты уже не считаются похожими
+PRICE_RANGE = float(np.log(2))
+ROOMS_RANGE = 3.0
+
+# сколько строк матрицы считаем за раз, чтобы память росла линейно
+BLOCK_SIZE = 256
+
+
+def _nullable_ids(values) -> np.ndarray:
+    return np.array([-1 if value is None else value for value in values], dtype=np.int32)
+
+
+def _nullable_numbers(values) -> np.ndarray:
+    return np.array(
+        [np.nan if value is None else value for value in values], dtype=np.float32
+    )
+
+
+def _closeness(values: np.ndarray, rows: slice, scale: float) -> np.ndarray:
+    """max(0, 1 - |a - b| / scale) для строк ``rows``, NaN дает ноль."""
+    result = values[rows, None] - values
+    np.abs(result, out=result)
+    result *= np.float32(-1 / scale)
+    result += 1
+    # fmax в отличие от maximum не пропускает NaN
+    return np.fmax(result, 0, out=result)
+
+
+def score_neighbours(
+    category_ids: np.ndarray,
+    district_ids: np.ndarray,
+    log_prices: np.ndarray,
+    rooms: np.ndarray,
+    rows: slice,
+) -> np.ndarray:
+    """Матрица оценок похожести строк ``rows`` со всеми объявлениями.
+
+    Отсутствующие категория и район обозначены -1, количество комнат NaN,
+    такие признаки ничего не добавляют к оценке.
+    """
+    category = category_ids[rows, None]
+    district = district_ids[rows, None]
+
+    scores = _closeness(log_prices, rows, PRICE_RANGE)
+    scores *= np.float32(PRICE_WEIGHT)
+    rooms_scores = _closeness(rooms, rows, ROOMS_RANGE)
+    rooms_scores *= np.float32(ROOMS_WEIGHT)
+    scores += rooms_scores
+    scores += np.float32(CATEGORY_WEIGHT) * (
+        (category == category_ids) & (category >= 0)
+    )
+    scores += np.float32(DISTRICT_WEIGHT) * (
+        (district == district_ids) & (district >= 0)
+    )
+    return scores
+
+
+def top_related(
+    ids: list[int],
+    category_ids: list[int | None],
+    district_ids: list[int | None],
+    prices: list[int],
+    rooms: list[int | None],
+    limit: int = RELATED_LIMIT,
+) -> list[tuple[int, int, int, float]]:
+    """Ближайшие соседи каждого объявления одного типа операции.
+
+    Возвращает строки (advertisement_id, position, related_id, score),
+    само объявление в свои рекомендации не попадает.
+    """
+    total = len(ids)
+    limit = min(limit, total - 1)
+    if limit <= 0:
+        return []
+
+    ids = np.asarray(ids, dtype=np.int64)
+    category_ids = _nullable_ids(category_ids)
+    district_ids = _nullable_ids(district_ids)
+    log_prices = np.log(np.maximum(np.asarray(prices, dtype=np.float32), 1))
+    rooms = _nullable_numbers(rooms)
+
+    result = []
+    for start in range(0, total, BLOCK_SIZE):
+        rows = slice(start, min(start + BLOCK_SIZE, total))
+        scores = score_neighbours(category_ids, district_ids, log_prices, rooms, rows)
+        block = np.arange(rows.stop - rows.start)
+        scores[block, block + start] = -np.inf
+
+        # argpartition отбирает k лучших за O(n), сортируем только их
+        best = np.argpartition(scores, total - limit, axis=1)[:, total - limit :]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+
+        for advertisement_id, related_ids, related_scores in zip(
+            ids[rows].tolist(), ids[best].tolist(), best_scores.tolist()
+        ):
+            result += [
+                (advertisement_id, position, related_id, score)
+                for position, (related_id, score) in enumerate(
+                    zip(related_ids, related_scores)
+                )
+            ]
+    return result
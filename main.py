@@ -1,3 +1,6 @@
+import logging
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,13 +8,32 @@ from fastapi.staticfiles import StaticFiles
 
 from backend.api import router as api_router
 from backend.app.config import config
+from backend.app.metrics import MetricsMiddleware, metrics_endpoint
+from infrastructure.cache.redis import close_redis
+from infrastructure.database.setup import dispose_engine
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(filename)s:%(lineno)d #%(levelname)-8s [%(asctime)s] - %(name)s - %(message)s",
+)
 
-main_app = FastAPI(debug=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # движок создается при первом запросе и закрывается вместе с приложением
+    yield
+    await dispose_engine()
+    await close_redis()
+
+
+main_app = FastAPI(debug=config.run_api.debug, lifespan=lifespan)
 main_app.include_router(api_router)
+main_app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
 
 main_app.mount("/media", StaticFiles(directory="media"), name="media")
 
-
+main_app.add_middleware(MetricsMiddleware, profile_token=config.run_api.profile_token)
 main_app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -25,5 +47,11 @@ if __name__ == "__main__":
         "main:main_app",
         host=config.run_api.api_host,
         port=config.run_api.api_port,
-        reload=True,
+        reload=config.run_api.debug,
+        # reload работает только с одним процессом
+        workers=1 if config.run_api.debug else config.run_api.workers,
+        # uvloop и httptools, если установлены
+        loop="auto",
+        http="auto",
+        access_log=config.run_api.debug,
     )
@@ -0,0 +1,170 @@
+"""Нагрузочная проверка API: смесь запросов каталога, карточек и агентов.
+
+Запускается против работающего API, базу лучше заранее наполнить
+scripts.benchmarks.seed_api. Идентификаторы объявлений, агентов, категорий
+и районов берутся из самого API. Каждый из ``--concurrency`` клиентов шлет
+запросы без пауз, первые ``--warmup`` секунд в отчет не попадают. С флагом
+--max-p95-ms скрипт завершается с ошибкой, если p95 любого запроса выше порога:
+
+    python -m scripts.benchmarks.api_load --duration 30 --concurrency 32 --max-p95-ms 150
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from scripts.benchmarks.common import percentile, report_latency
+
+API_PREFIX = "/api/v1"
+OPERATION_TYPES = ["RENT", "BUY"]
+PRICE_RANGES = {"RENT": [(0, 500), (500, 1500)], "BUY": [(0, 60000), (60000, 200000)]}
+
+
+class Targets:
+    """Идентификаторы, по которым строятся запросы."""
+
+    def __init__(self, advertisement_ids, agent_ids, category_ids, district_ids):
+        self.advertisement_ids = advertisement_ids
+        self.agent_ids = agent_ids
+        self.category_ids = category_ids
+        self.district_ids = district_ids
+
+
+async def discover(session: ClientSession, base_url: str) -> Targets:
+    async def get(path: str, **params):
+        async with session.get(f"{base_url}{API_PREFIX}{path}", params=params) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    advertisements = await get("/advertisements/", limit=100)
+    agents = await get("/agents/", limit=100)
+    targets = Targets(
+        advertisement_ids=[item["id"] for item in advertisements["results"]],
+        agent_ids=[agent["id"] for agent in agents["results"]],
+        category_ids=[category["id"] for category in await get("/categories/")],
+        district_ids=[district["id"] for district in await get("/districts/")],
+    )
+    if not targets.advertisement_ids or not targets.agent_ids:
+        raise SystemExit("API returned no advertisements or agents, seed the database first")
+    return targets
+
+
+def catalogue_request(targets: Targets) -> tuple[str, str, dict]:
+    """Запрос каталога с одной из типичных для сайта комбинаций фильтров."""
+    operation_type = random.choice(OPERATION_TYPES)
+    price_from, price_to = random.choice(PRICE_RANGES[operation_type])
+    mixes = {
+        "all": {},
+        "operation": {"operation_type": operation_type},
+        "category": {
+            "operation_type": operation_type,
+            "category_id": random.choice(targets.category_ids),
+        },
+        "district+price": {
+            "operation_type": operation_type,
+            "district_id": random.choice(targets.district_ids),
+            "price_from": price_from,
+            "price_to": price_to,
+        },
+        "rooms": {"operation_type": operation_type, "rooms": "1,2"},
+        "deep page": {"operation_type": operation_type, "offset": random.randint(50, 500)},
+    }
+    mix = random.choice(list(mixes))
+    return f"GET /advertisements [{mix}]", "/advertisements/", mixes[mix]
+
+
+def detail_request(targets: Targets) -> tuple[str, str, dict]:
+    advertisement_id = random.choice(targets.advertisement_ids)
+    return "GET /advertisements/{id}", f"/advertisements/{advertisement_id}", {}
+
+
+def agent_request(targets: Targets) -> tuple[str, str, dict]:
+    return "GET /agents/{id}/", f"/agents/{random.choice(targets.agent_ids)}/", {}
+
+
+def dev_request(targets: Targets) -> tuple[str, str, dict]:
+    params = {"operation_type": random.choice(OPERATION_TYPES), "page": random.randint(1, 5)}
+    return "GET /dev/advertisements/", "/dev/advertisements/", params
+
+
+# доли запросов примерно как у сайта: в основном каталог и карточки
+REQUEST_MIX = [
+    (catalogue_request, 50),
+    (detail_request, 35),
+    (agent_request, 10),
+    (dev_request, 5),
+]
+
+
+async def worker(
+    session: ClientSession,
+    base_url: str,
+    targets: Targets,
+    measure_from: float,
+    deadline: float,
+    timings: dict,
+    errors: dict,
+):
+    builders, weights = zip(*REQUEST_MIX)
+    while time.perf_counter() < deadline:
+        name, path, params = random.choices(builders, weights)[0](targets)
+        started = time.perf_counter()
+        try:
+            async with session.get(f"{base_url}{API_PREFIX}{path}", params=params) as response:
+                await response.read()
+                failed = response.status >= 400
+        except Exception:
+            failed = True
+        if started < measure_from:
+            continue
+        if failed:
+            errors[name] += 1
+        else:
+            timings[name].append((time.perf_counter() - started) * 1000)
+
+
+async def main(base_url: str, duration: int, warmup: int, concurrency: int, max_p95_ms: float):
+    timings = defaultdict(list)
+    errors = defaultdict(int)
+    async with ClientSession(
+        connector=TCPConnector(limit=concurrency), timeout=ClientTimeout(total=30)
+    ) as session:
+        targets = await discover(session, base_url)
+        measure_from = time.perf_counter() + warmup
+        deadline = measure_from + duration
+        await asyncio.gather(
+            *(
+                worker(session, base_url, targets, measure_from, deadline, timings, errors)
+                for _ in range(concurrency)
+            )
+        )
+
+    total = sum(map(len, timings.values()))
+    print(f"requests: {total}, errors: {sum(errors.values())}, {total / duration:.0f} rps")
+    slow = []
+    for name in sorted(timings):
+        report_latency(f"{name} ({len(timings[name]) / duration:.0f} rps)", timings[name])
+        if max_p95_ms and percentile(sorted(timings[name]), 0.95) > max_p95_ms:
+            slow.append(name)
+    for name, count in errors.items():
+        print(f"{name}: {count} errors")
+
+    if errors or slow:
+        raise SystemExit(f"failed: errors in {sorted(errors)}, p95 over limit in {slow}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-p95-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(args.base_url, args.duration, args.warmup, args.concurrency, args.max_p95_ms)
+    )
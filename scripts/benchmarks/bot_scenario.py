@@ -0,0 +1,355 @@
+"""Сценарий нагрузки бота: создание объявления, модерация и отправка из очереди.
+
+Бот работает в этом же процессе с настоящими роутерами, базой и Redis,
+а запросы к Telegram уходят в локальную заглушку Bot API. Для каждого
+риелтора создаются тестовые пользователи (риелтор и руководитель), после
+прогона они и их объявления удаляются, поэтому запускать стоит на тестовой базе.
+Задачи Celery из модерации не ставятся: отправку из очереди сценарий
+выполняет сам сразу после модерации, отчет в Google таблицу пропускается.
+
+    BOT_API_SERVER=http://127.0.0.1:8081 python -m scripts.benchmarks.bot_scenario \\
+        --realtors 20 --rounds 3 --latency-ms 50 --flood-rate 0.02
+"""
+import argparse
+import asyncio
+import itertools
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlparse
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+from aiogram.types import CallbackQuery, Chat, Message, PhotoSize, Update, User
+from sqlalchemy import select
+
+from bot import create_dispatcher
+from celery_tasks.tasks import post_queued_advertisement
+from config.db_config import SCRIPT
+from config.loader import load_config
+from infrastructure.database.models import Advertisement, AdvertisementImage
+from infrastructure.database.models.user import UserRole
+from infrastructure.database.repo.requests import RequestsRepo
+from infrastructure.database.setup import dispose_engine, get_session_pool
+from scripts.benchmarks.common import cleanup, report_latency
+from scripts.benchmarks.fake_telegram import FakeTelegram
+from tgbot.handlers.admin import menu as admin_menu
+from tgbot.middlewares.metrics import summary_window
+from tgbot.utils.bot_factory import close_bot, create_bot
+
+FIRST_CHAT_ID = 7_000_000_000
+PHOTOS_PER_ADVERTISEMENT = 3
+
+_update_ids = itertools.count(1)
+_message_ids = itertools.count(1)
+
+
+@dataclass
+class Actor:
+    id: int
+    chat_id: int
+    username: str
+
+
+class DeferredTask:
+    """Запоминает вызовы задачи Celery вместо постановки в очередь брокера."""
+
+    def __init__(self):
+        self.calls = []
+
+    def delay(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+
+    def apply_async(self, args=(), kwargs=None, **options):
+        self.calls.append((tuple(args), kwargs or {}))
+
+
+def _user(actor: Actor) -> User:
+    return User(
+        id=actor.chat_id, is_bot=False, first_name=actor.username, username=actor.username
+    )
+
+
+def _message(actor: Actor, **fields) -> Message:
+    return Message(
+        message_id=next(_message_ids),
+        date=datetime.now(),
+        chat=Chat(id=actor.chat_id, type="private"),
+        from_user=_user(actor),
+        **fields,
+    )
+
+
+def message_update(
+    actor: Actor, text: str | None = None, photo_id: str | None = None
+) -> Update:
+    fields = {"text": text}
+    if photo_id:
+        photo = PhotoSize(file_id=photo_id, file_unique_id=photo_id, width=64, height=64)
+        fields = {"photo": [photo]}
+    return Update(update_id=next(_update_ids), message=_message(actor, **fields))
+
+
+def callback_update(actor: Actor, data: str) -> Update:
+    return Update(
+        update_id=next(_update_ids),
+        callback_query=CallbackQuery(
+            id=str(next(_update_ids)),
+            from_user=_user(actor),
+            chat_instance=str(actor.chat_id),
+            message=_message(actor, text="..."),
+            data=data,
+        ),
+    )
+
+
+def creation_steps(
+    realtor: Actor, category_id: int, district_id: int
+) -> list[tuple[str, Update]]:
+    photo_ids = [f"photo-{uuid.uuid4().hex}" for _ in range(PHOTOS_PER_ADVERTISEMENT)]
+    return [
+        ("create_advertisement", callback_update(realtor, "create_advertisement")),
+        ("operation_type", callback_update(realtor, "operation_type:rent")),
+        ("category", callback_update(realtor, f"chosen_category:{category_id}")),
+        ("photos_quantity", message_update(realtor, str(len(photo_ids)))),
+        *(("photo", message_update(realtor, photo_id=photo_id)) for photo_id in photo_ids),
+        ("title", message_update(realtor, "Квартира для нагрузочного теста")),
+        ("title_uz", message_update(realtor, "Test kvartira")),
+        ("description", message_update(realtor, "Описание " * 20)),
+        ("description_uz", message_update(realtor, "Tavsif " * 20)),
+        ("owner_phone_number", message_update(realtor, "+998901231212 Тест")),
+        ("district", callback_update(realtor, f"chosen_district:{district_id}")),
+        ("address", message_update(realtor, "ул. Тестовая, 1")),
+        ("address_uz", message_update(realtor, "Test ko'chasi, 1")),
+        ("property_type", callback_update(realtor, "property_type:old")),
+        ("price", message_update(realtor, "500")),
+        ("rooms_quantity", message_update(realtor, "2")),
+        ("quadrature", message_update(realtor, "60")),
+        ("floor_from", message_update(realtor, "3")),
+        ("floor_to", message_update(realtor, "9")),
+        ("repair_type", callback_update(realtor, "repair_type:with")),
+    ]
+
+
+async def feed(dp: Dispatcher, bot: Bot, timings: dict, name: str, update: Update):
+    started = time.perf_counter()
+    await dp.feed_update(bot, update)
+    timings[name].append((time.perf_counter() - started) * 1000)
+
+
+async def run_scenario(
+    dp: Dispatcher,
+    bot: Bot,
+    session_pool,
+    realtor: Actor,
+    director: Actor,
+    category_id: int,
+    district_id: int,
+    timings: dict,
+) -> int | None:
+    started = time.perf_counter()
+    for name, update in creation_steps(realtor, category_id, district_id):
+        await feed(dp, bot, timings, name, update)
+
+    async with session_pool() as session:
+        advertisement_id = await session.scalar(
+            select(Advertisement.id)
+            .where(Advertisement.user_id == realtor.id)
+            .order_by(Advertisement.id.desc())
+            .limit(1)
+        )
+    if advertisement_id is None:
+        return None
+    timings["creation total"].append((time.perf_counter() - started) * 1000)
+
+    moderation = callback_update(director, f"moderation_confirm:{advertisement_id}")
+    await feed(dp, bot, timings, "moderation", moderation)
+
+    posting_started = time.perf_counter()
+    await post_queued_advertisement(advertisement_id)
+    timings["queue posting"].append((time.perf_counter() - posting_started) * 1000)
+    timings["scenario total"].append((time.perf_counter() - started) * 1000)
+    return advertisement_id
+
+
+async def create_actors(session_pool, realtors: int) -> tuple[Actor, list[Actor]]:
+    tag = uuid.uuid4().hex[:6]
+    chat_ids = itertools.count(FIRST_CHAT_ID + int(tag, 16) % 1_000_000 * 1000)
+
+    async def create(role: UserRole, name: str, added_by: int | None) -> Actor:
+        chat_id = next(chat_ids)
+        async with session_pool() as session:
+            repo = RequestsRepo(session)
+            user = await repo.users.create_user(
+                first_name="Bench",
+                lastname=name,
+                phone_number=f"+{chat_id}"[:15],
+                tg_username=name,
+                profile_image="",
+                profile_image_hash="",
+                role=role,
+                added_by=added_by,
+            )
+            await repo.users.update_user_chat_id(tg_username=name, tg_chat_id=chat_id)
+        return Actor(user.id, chat_id, name)
+
+    director = await create(UserRole.GROUP_DIRECTOR, f"bench_{tag}_director", None)
+    return director, [
+        await create(UserRole.REALTOR, f"bench_{tag}_{i}", director.chat_id)
+        for i in range(realtors)
+    ]
+
+
+async def remove_actors(session_pool, actors: list[Actor], advertisement_ids: list[int]):
+    async with session_pool() as session:
+        images = await session.scalars(
+            select(AdvertisementImage.url).where(
+                AdvertisementImage.advertisement_id.in_(advertisement_ids)
+            )
+        )
+        previews = await session.scalars(
+            select(Advertisement.preview).where(Advertisement.id.in_(advertisement_ids))
+        )
+        paths = {*images.all(), *previews.all()}
+    for path in paths:
+        Path(path).unlink(missing_ok=True)
+
+    await cleanup(session_pool, advertisement_ids)
+    async with session_pool() as session:
+        repo = RequestsRepo(session)
+        for actor in actors:
+            await repo.users.delete_user(actor.id)
+
+
+def report_handlers():
+    handlers = summary_window.reset()
+    print("handler: updates, avg ms, db ms, telegram ms, errors")
+    for name, summary in sorted(handlers.items(), key=lambda item: -item[1].seconds):
+        print(
+            f"  {name}: {summary.updates}, "
+            f"{summary.seconds / summary.updates * 1000:.1f}, "
+            f"{summary.db_seconds / summary.updates * 1000:.1f}, "
+            f"{summary.telegram_seconds / summary.updates * 1000:.1f}, "
+            f"{summary.errors}"
+        )
+
+
+async def main(
+    realtors: int, rounds: int, latency_ms: float, jitter_ms: float, flood_rate: float
+):
+    config = load_config(".env")
+    if not config.tg_bot.api_server:
+        raise SystemExit(
+            "BOT_API_SERVER must point to the fake Bot API, e.g. http://127.0.0.1:8081"
+        )
+
+    api = urlparse(config.tg_bot.api_server)
+    fake = FakeTelegram(latency_ms=latency_ms, jitter_ms=jitter_ms, flood_rate=flood_rate)
+    runner = await fake.start(api.hostname, api.port)
+
+    session_pool = get_session_pool(config.db, role=SCRIPT)
+    async with session_pool() as session:
+        repo = RequestsRepo(session)
+        # у домов свой набор шагов, сценарий проходит общий
+        categories = await repo.categories.get_categories()
+        category = next(category for category in categories if category.slug != "doma")
+        district = (await repo.districts.get_districts())[0]
+
+    director, realtor_actors = await create_actors(session_pool, realtors)
+    bot = create_bot(
+        config,
+        default=DefaultBotProperties(
+            parse_mode=ParseMode.HTML, link_preview_is_disabled=True
+        ),
+    )
+    dp = create_dispatcher(config, session_pool)
+    summary_window.reset()
+
+    timings = defaultdict(list)
+    advertisement_ids = []
+    failed = 0
+
+    async def realtor_rounds(realtor: Actor):
+        nonlocal failed
+        for _ in range(rounds):
+            try:
+                advertisement_id = await run_scenario(
+                    dp,
+                    bot,
+                    session_pool,
+                    realtor,
+                    director,
+                    category.id,
+                    district.id,
+                    timings,
+                )
+            except Exception as e:
+                print(f"{realtor.username}: {type(e).__name__}: {e}")
+                advertisement_id = None
+            if advertisement_id is None:
+                failed += 1
+            else:
+                advertisement_ids.append(advertisement_id)
+
+    deferred = DeferredTask()
+    started = time.perf_counter()
+    try:
+        with (
+            mock.patch.object(admin_menu, "send_message_by_queue", deferred),
+            mock.patch.object(admin_menu, "fill_report", DeferredTask()),
+        ):
+            await asyncio.gather(*(realtor_rounds(realtor) for realtor in realtor_actors))
+        elapsed = time.perf_counter() - started
+    finally:
+        await close_bot(bot)
+        await remove_actors(session_pool, [director, *realtor_actors], advertisement_ids)
+        await runner.cleanup()
+        await dispose_engine()
+
+    print(
+        f"scenarios: {len(advertisement_ids)} completed, {failed} failed, "
+        f"{elapsed:.2f}s, {len(advertisement_ids) / elapsed * 60:.1f} advertisements/min"
+    )
+    print(f"queued by moderation: {len(deferred.calls)}")
+    for name, values in timings.items():
+        report_latency(name, values)
+
+    # ответы 429 повторяются клиентом, считаем только доставленные вызовы
+    delivered = [call for call in fake.calls if call.status != 429]
+    # аккаунт разработчика получает копию рассылки руководителям, ее не считаем
+    director_messages = {
+        (call.method, call.params.get("text"))
+        for call in delivered
+        if call.chat_id == director.chat_id
+    }
+    dev_chat_ids = {config.tg_bot.main_chat_id, config.tg_bot.test_main_chat_id}
+    errors_to_dev = [
+        call
+        for call in delivered
+        if call.chat_id in dev_chat_ids
+        and (call.method, call.params.get("text")) not in director_messages
+    ]
+    flood_waits = sum(call.status == 429 for call in fake.calls)
+    print(f"api calls: {len(fake.calls)}, 429 injected: {flood_waits}")
+    print(f"api calls by method: {fake.calls_by_method()}")
+    print(f"error reports sent to developer chats: {len(errors_to_dev)}")
+    report_handlers()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--realtors", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--flood-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(args.realtors, args.rounds, args.latency_ms, args.jitter_ms, args.flood_rate)
+    )
@@ -0,0 +1,173 @@
+"""Нагрузочная проверка бота в режиме вебхука.
+
+Поднимает заглушку Bot API и отправляет на вебхук записанные апдейты
+(JSON Lines, по объекту Update на строку, например из getUpdates) или
+сгенерированные команды /start от ``--users`` пользователей. Бот
+запускается после скрипта и ходит в заглушку, скрипт ждет его вебхук:
+
+    python -m scripts.benchmarks.bot_webhook_replay --users 200 --per-user 5
+    BOT_API_SERVER=http://127.0.0.1:8081 BOT_WEBHOOK_URL=http://127.0.0.1:8080/webhook \\
+        python bot.py
+
+Время до ответа считается от отправки апдейта до первого запроса бота
+в тот же чат, поэтому для обработчиков с несколькими сообщениями это оценка.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict, deque
+
+from aiohttp import ClientConnectionError, ClientSession
+
+from scripts.benchmarks.common import report_latency
+from scripts.benchmarks.fake_telegram import FakeTelegram
+
+FIRST_USER_ID = 10_000_000
+
+
+def load_updates(path: str | None, users: int, per_user: int) -> list[dict]:
+    if path:
+        with open(path, encoding="utf-8") as f:
+            updates = [json.loads(line) for line in f if line.strip()]
+    else:
+        # пользователи пишут вперемешку, как в реальном потоке апдейтов
+        updates = [
+            {
+                "message": {
+                    "message_id": n + 1,
+                    "date": int(time.time()),
+                    "chat": {"id": FIRST_USER_ID + user, "type": "private"},
+                    "from": {
+                        "id": FIRST_USER_ID + user,
+                        "is_bot": False,
+                        "first_name": f"user{user}",
+                    },
+                    "text": "/start",
+                }
+            }
+            for n in range(per_user)
+            for user in range(users)
+        ]
+    for update_id, update in enumerate(updates, start=1):
+        update["update_id"] = update_id
+    return updates
+
+
+async def wait_for_webhook(session: ClientSession, webhook: str):
+    print(f"waiting for the bot webhook at {webhook}")
+    while True:
+        try:
+            # на GET вебхук отвечает 405, нам важно только, что сервер поднят
+            async with session.get(webhook):
+                return
+        except ClientConnectionError:
+            await asyncio.sleep(0.5)
+
+
+def chat_id_of(update: dict) -> int | None:
+    event = update.get("message") or update.get("callback_query", {}).get("message")
+    return event["chat"]["id"] if event else None
+
+
+async def main(
+    webhook: str,
+    secret: str,
+    updates_path: str | None,
+    users: int,
+    per_user: int,
+    concurrency: int,
+    api_port: int,
+    drain_seconds: float,
+    latency_ms: float = 0.0,
+    flood_rate: float = 0.0,
+):
+    fake = FakeTelegram(latency_ms=latency_ms, flood_rate=flood_rate)
+    runner = await fake.start("127.0.0.1", api_port)
+
+    updates = load_updates(updates_path, users, per_user)
+    sent_at: dict[int, deque[float]] = defaultdict(deque)
+    ack_timings = []
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret} if secret else {}
+
+    chats: dict[int | None, list[dict]] = defaultdict(list)
+    for update in updates:
+        chats[chat_id_of(update)].append(update)
+
+    async def send_chat(session: ClientSession, chat_id: int | None, chat_updates):
+        # как и Telegram, следующий апдейт чата отправляем после ответа на предыдущий
+        for update in chat_updates:
+            async with semaphore:
+                started = time.perf_counter()
+                sent_at[chat_id].append(started)
+                async with session.post(webhook, json=update, headers=headers) as response:
+                    response.raise_for_status()
+                ack_timings.append((time.perf_counter() - started) * 1000)
+
+    async with ClientSession() as session:
+        await wait_for_webhook(session, webhook)
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(send_chat(session, chat_id, updates) for chat_id, updates in chats.items())
+        )
+    sent = time.perf_counter() - started
+
+    # ждем, пока бот перестанет обращаться к API
+    calls = 0
+    while True:
+        await asyncio.sleep(drain_seconds)
+        if len(fake.calls) == calls:
+            break
+        calls = len(fake.calls)
+    await runner.cleanup()
+
+    reply_timings = []
+    for call in sorted(fake.calls, key=lambda call: call.at):
+        pending = sent_at.get(call.chat_id)
+        if pending and pending[0] <= call.at:
+            reply_timings.append((call.at - pending.popleft()) * 1000)
+
+    finished = max((call.at for call in fake.calls), default=started + sent)
+    print(
+        f"updates: {len(updates)}, sent in {sent:.2f}s "
+        f"({len(updates) / sent:.0f} updates/s)"
+    )
+    print(
+        f"api calls: {len(fake.calls)}, handled in {finished - started:.2f}s "
+        f"({len(reply_timings) / (finished - started):.0f} replied updates/s)"
+    )
+    report_latency("webhook ack", ack_timings)
+    if reply_timings:
+        report_latency("time to first reply", reply_timings)
+    print(f"updates without reply: {len(updates) - len(reply_timings)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--webhook", default="http://127.0.0.1:8080/webhook")
+    parser.add_argument("--secret", default="")
+    parser.add_argument("--updates", help="JSON Lines с записанными апдейтами")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--per-user", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=40)
+    parser.add_argument("--api-port", type=int, default=8081)
+    parser.add_argument("--drain-seconds", type=float, default=2.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--flood-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(
+            args.webhook,
+            args.secret,
+            args.updates,
+            args.users,
+            args.per_user,
+            args.concurrency,
+            args.api_port,
+            args.drain_seconds,
+            args.latency_ms,
+            args.flood_rate,
+        )
+    )
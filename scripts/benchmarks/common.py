@@ -0,0 +1,76 @@
+"""Общие помощники нагрузочных скриптов: наполнение тестовой базы и отчет."""
+import statistics
+
+from sqlalchemy import delete, func, insert, select
+
+from infrastructure.database.models import Advertisement, AdvertisementUniqueId
+from infrastructure.database.repo.requests import RequestsRepo
+
+SEED_BATCH_SIZE = 1000
+
+
+async def seed(session_pool, total: int, make_row=None) -> list[int]:
+    """Копируем первое объявление, пока в таблице не станет ``total`` строк.
+
+    ``make_row`` может дополнить копию своими полями, например текстом.
+    """
+    async with session_pool() as session:
+        count = await session.scalar(select(func.count(Advertisement.id)))
+        template = (
+            await session.execute(select(Advertisement.__table__).limit(1))
+        ).mappings().one()
+
+    columns = Advertisement.__table__.c
+    row = {
+        key: value
+        for key, value in template.items()
+        # генерируемые колонки база заполняет сама
+        if key not in ("id", "unique_id", "created_at") and columns[key].computed is None
+    }
+    seeded_ids = []
+    while count < total:
+        batch_size = min(SEED_BATCH_SIZE, total - count)
+        async with session_pool() as session:
+            repo = RequestsRepo(session)
+            rows = []
+            for _ in range(batch_size):
+                unique_id = await repo.advertisement_unique_ids.allocate_unique_id()
+                rows.append(
+                    {**row, **(make_row() if make_row else {}), "unique_id": unique_id}
+                )
+            result = await session.execute(
+                insert(Advertisement).returning(Advertisement.id), rows
+            )
+            seeded_ids += result.scalars().all()
+            await session.commit()
+        count += batch_size
+        print(f"seeded {count}/{total}")
+    return seeded_ids
+
+
+async def cleanup(session_pool, seeded_ids: list[int]):
+    async with session_pool() as session:
+        for i in range(0, len(seeded_ids), SEED_BATCH_SIZE):
+            ids = seeded_ids[i:i + SEED_BATCH_SIZE]
+            unique_ids = select(Advertisement.unique_id).where(Advertisement.id.in_(ids))
+            await session.execute(
+                delete(AdvertisementUniqueId).where(
+                    AdvertisementUniqueId.unique_id.in_(unique_ids)
+                )
+            )
+            await session.execute(delete(Advertisement).where(Advertisement.id.in_(ids)))
+        await session.commit()
+
+
+def percentile(sorted_timings: list[float], share: float) -> float:
+    return sorted_timings[max(int(len(sorted_timings) * share) - 1, 0)]
+
+
+def report_latency(name: str, timings: list[float]) -> None:
+    """Печатаем медиану, p95, p99 и максимум задержек в миллисекундах."""
+    timings = sorted(timings)
+    print(
+        f"{name}: median {statistics.median(timings):.2f} ms, "
+        f"p95 {percentile(timings, 0.95):.2f} ms, "
+        f"p99 {percentile(timings, 0.99):.2f} ms, max {timings[-1]:.2f} ms"
+    )
@@ -0,0 +1,149 @@
+"""Локальная заглушка Telegram Bot API для нагрузочных и регрессионных проверок бота.
+
+Поддерживает методы, которыми пользуется бот: sendMessage, sendMediaGroup,
+editMessageText, deleteMessage, getFile и скачивание файла, на остальные
+отвечает успехом. Задержка ответа и доля ответов 429 настраиваются, каждый
+запрос запоминается вместе с параметрами.
+"""
+import asyncio
+import hashlib
+import io
+import itertools
+import json
+import random
+import time
+from dataclasses import dataclass, field
+
+from aiohttp import web
+from PIL import Image
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Fake bot", "username": "fake_bot"}
+
+MESSAGE_METHODS = {
+    "sendMessage",
+    "sendPhoto",
+    "sendDocument",
+    "editMessageText",
+    "editMessageCaption",
+    "editMessageReplyMarkup",
+    "forwardMessage",
+}
+IMAGE_SIZE = 64
+
+
+@dataclass
+class ApiCall:
+    method: str
+    chat_id: int | str | None
+    at: float
+    params: dict
+    status: int = 200
+
+
+@dataclass
+class FakeTelegram:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # доля запросов, на которые отвечаем 429 с retry_after
+    flood_rate: float = 0.0
+    retry_after: int = 1
+    calls: list[ApiCall] = field(default_factory=list)
+    _message_ids: itertools.count = field(default_factory=lambda: itertools.count(1))
+    _images: dict[str, bytes] = field(default_factory=dict)
+
+    def make_app(self) -> web.Application:
+        app = web.Application(client_max_size=20 * 1024 * 1024)
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        app.router.add_get("/file/bot{token}/{path:.+}", self.download)
+        return app
+
+    async def start(self, host: str, port: int) -> web.AppRunner:
+        runner = web.AppRunner(self.make_app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+    def calls_by_method(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for call in self.calls:
+            counts[call.method] = counts.get(call.method, 0) + 1
+        return counts
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        params = {key: value for key, value in (await request.post()).items()}
+        chat_id = params.get("chat_id")
+        if chat_id and chat_id.lstrip("-").isdigit():
+            chat_id = int(chat_id)
+        call = ApiCall(method, chat_id, time.perf_counter(), params)
+        self.calls.append(call)
+
+        await self._delay()
+        if self.flood_rate and random.random() < self.flood_rate:
+            call.status = 429
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {self.retry_after}",
+                    "parameters": {"retry_after": self.retry_after},
+                },
+                status=429,
+            )
+        return web.json_response({"ok": True, "result": self.result(method, params)})
+
+    async def download(self, request: web.Request) -> web.Response:
+        await self._delay()
+        file_id = request.match_info["path"].rsplit("/", 1)[-1].removesuffix(".jpg")
+        return web.Response(body=self.image(file_id), content_type="image/jpeg")
+
+    async def _delay(self):
+        if self.latency_ms or self.jitter_ms:
+            await asyncio.sleep(
+                (self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000
+            )
+
+    def result(self, method: str, params: dict):
+        if method == "getMe":
+            return BOT_USER
+        if method in MESSAGE_METHODS:
+            return self.message(params)
+        if method == "sendMediaGroup":
+            return [self.message(params) for _ in json.loads(params["media"])]
+        if method == "copyMessage":
+            return {"message_id": next(self._message_ids)}
+        if method == "getFile":
+            file_id = params["file_id"]
+            return {
+                "file_id": file_id,
+                "file_unique_id": file_id,
+                "file_size": len(self.image(file_id)),
+                "file_path": f"photos/{file_id}.jpg",
+            }
+        return True
+
+    def message(self, params: dict) -> dict:
+        chat_id = params.get("chat_id") or 0
+        chat_id = int(chat_id) if str(chat_id).lstrip("-").isdigit() else 0
+        return {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private" if chat_id > 0 else "supergroup"},
+            "from": BOT_USER,
+            "text": params.get("text", ""),
+        }
+
+    def image(self, file_id: str) -> bytes:
+        """Шум, зависящий от file_id, чтобы хеши разных фотографий различались."""
+        if file_id not in self._images:
+            seed = int.from_bytes(hashlib.sha1(file_id.encode()).digest()[:8], "big")
+            rnd = random.Random(seed)
+            image = Image.frombytes(
+                "L",
+                (IMAGE_SIZE, IMAGE_SIZE),
+                bytes(rnd.getrandbits(8) for _ in range(IMAGE_SIZE * IMAGE_SIZE)),
+            )
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG")
+            self._images[file_id] = buffer.getvalue()
+        return self._images[file_id]
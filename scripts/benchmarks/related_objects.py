@@ -0,0 +1,38 @@
+"""Замер расчета похожих объявлений на синтетическом каталоге.
+
+База не нужна: признаки генерируются случайно, замеряется время и пиковый
+объем матрицы оценок для одного блока.
+
+    python -m scripts.benchmarks.related_objects --size 100000
+"""
+import argparse
+import random
+import time
+
+from infrastructure.utils.recommendations import BLOCK_SIZE, top_related
+
+
+def main(size: int, categories: int, districts: int):
+    ids = list(range(1, size + 1))
+    category_ids = [random.choice([None, *range(1, categories + 1)]) for _ in ids]
+    district_ids = [random.randint(1, districts) for _ in ids]
+    prices = [random.randint(200, 3000) * 100 for _ in ids]
+    rooms = [random.choice([None, 1, 2, 3, 4, 5]) for _ in ids]
+
+    started = time.perf_counter()
+    rows = top_related(ids, category_ids, district_ids, prices, rooms)
+    elapsed = time.perf_counter() - started
+
+    print(f"advertisements: {size}, related rows: {len(rows)}")
+    print(f"build: {elapsed:.2f} s, {elapsed / size * 1e6:.1f} us per advertisement")
+    print(f"score block: {BLOCK_SIZE * size * 4 / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--categories", type=int, default=6)
+    parser.add_argument("--districts", type=int, default=12)
+    args = parser.parse_args()
+
+    main(args.size, args.categories, args.districts)
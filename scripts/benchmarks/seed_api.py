@@ -0,0 +1,248 @@
+"""Наполнение тестовой базы для нагрузочной проверки API.
+
+Создает агентов, объявления с фотографиями и, если их нет, категории и
+районы, затем пересобирает витрину каталога. Данные синтетические, но с
+разбросом цен, комнат, типов и районов, чтобы фильтры выбирали разные доли
+таблицы. Созданное помечается префиксом bench и удаляется флагом --cleanup:
+
+    python -m scripts.benchmarks.seed_api --advertisements 20000 --agents 50
+    python -m scripts.benchmarks.seed_api --cleanup
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from slugify import slugify
+from sqlalchemy import delete, insert, select
+
+from config.loader import load_config
+from infrastructure.database.models import (
+    Advertisement,
+    AdvertisementImage,
+    Category,
+    District,
+    User,
+)
+from infrastructure.database.models.advertisement import (
+    OperationType,
+    OperationTypeUz,
+    PropertyType,
+    PropertyTypeUz,
+    RepairType,
+    RepairTypeUz,
+)
+from infrastructure.database.models.user import UserRole
+from infrastructure.database.repo.requests import RequestsRepo
+from infrastructure.database.setup import dispose_engine, get_session_pool
+from scripts.benchmarks.common import SEED_BATCH_SIZE, cleanup
+
+PREFIX = "bench"
+CATEGORIES = ["Квартиры", "Дома", "Коммерческая недвижимость", "Участки"]
+DISTRICTS = [
+    "Юнусабадский",
+    "Мирзо-Улугбекский",
+    "Чиланзарский",
+    "Яккасарайский",
+    "Мирабадский",
+    "Шайхантахурский",
+    "Алмазарский",
+    "Сергелийский",
+]
+# цены аренды и продажи отличаются на порядки, как в реальных данных
+PRICE_RANGES = {OperationType.RENT: (200, 3000), OperationType.BUY: (20000, 400000)}
+REPAIR_TYPES = list(zip(RepairType, RepairTypeUz))
+
+
+async def ensure_dictionary(session_pool, model, names: list[str]) -> list[int]:
+    """Берем существующие категории или районы, создавая свои только в пустой таблице."""
+    async with session_pool() as session:
+        ids = (await session.scalars(select(model.id))).all()
+        if ids:
+            return list(ids)
+        result = await session.execute(
+            insert(model).returning(model.id),
+            [
+                {"name": name, "name_uz": name, "slug": f"{PREFIX}-{slugify(name)}"}
+                for name in names
+            ],
+        )
+        ids = result.scalars().all()
+        await session.commit()
+        return list(ids)
+
+
+async def ensure_agents(session_pool, total: int) -> list[int]:
+    async with session_pool() as session:
+        existing = (
+            await session.scalars(
+                select(User.id).where(User.tg_username.startswith(f"{PREFIX}_agent_"))
+            )
+        ).all()
+        missing = total - len(existing)
+        if missing > 0:
+            result = await session.execute(
+                insert(User).returning(User.id),
+                [
+                    {
+                        "first_name": "Агент",
+                        "lastname": f"{i}",
+                        "phone_number": f"+99800{i:07d}",
+                        "tg_username": f"{PREFIX}_agent_{i}",
+                        "role": UserRole.REALTOR,
+                    }
+                    for i in range(len(existing), total)
+                ],
+            )
+            existing = [*existing, *result.scalars().all()]
+            await session.commit()
+        return list(existing)
+
+
+def make_advertisement(
+    rnd: random.Random,
+    unique_id: str,
+    category_ids: list[int],
+    district_ids: list[int],
+    agent_ids: list[int],
+) -> dict:
+    operation_type = rnd.choice(list(OperationType))
+    property_type = rnd.choice(list(PropertyType))
+    repair_type, repair_type_uz = rnd.choice(REPAIR_TYPES)
+    rooms = rnd.choices([1, 2, 3, 4, 5], weights=[3, 5, 4, 2, 1])[0]
+    floor_to = rnd.randint(2, 16)
+    name = f"{rooms}-комнатная квартира, {rnd.randint(30, 160)} м²"
+    return {
+        "unique_id": unique_id,
+        "name": name,
+        "name_uz": name,
+        "description": "Синтетическое объявление для нагрузочной проверки. " * 4,
+        "description_uz": "Yuklama sinovi uchun e'lon. " * 4,
+        "address": f"ул. Тестовая, {rnd.randint(1, 200)}",
+        "address_uz": f"Test ko'chasi, {rnd.randint(1, 200)}",
+        "operation_type": operation_type,
+        "operation_type_uz": OperationTypeUz[operation_type.name],
+        "property_type": property_type,
+        "property_type_uz": PropertyTypeUz[property_type.name],
+        "repair_type": repair_type,
+        "repair_type_uz": repair_type_uz,
+        "category_id": rnd.choice(category_ids),
+        "district_id": rnd.choice(district_ids),
+        "user_id": rnd.choice(agent_ids),
+        "price": rnd.randint(*PRICE_RANGES[operation_type]),
+        "rooms_quantity": rooms,
+        "quadrature": rooms * rnd.randint(15, 35),
+        "floor_from": rnd.randint(1, floor_to),
+        "floor_to": floor_to,
+        "creation_year": rnd.randint(1970, 2025),
+        "is_moderated": True,
+        "preview": f"media/{PREFIX}/{unique_id}_0.jpg",
+        "created_at": datetime.now() - timedelta(minutes=rnd.randint(0, 60 * 24 * 365)),
+    }
+
+
+async def seed_advertisements(
+    session_pool,
+    total: int,
+    images: int,
+    category_ids: list[int],
+    district_ids: list[int],
+    agent_ids: list[int],
+    rnd: random.Random,
+):
+    seeded = 0
+    while seeded < total:
+        batch_size = min(SEED_BATCH_SIZE, total - seeded)
+        async with session_pool() as session:
+            repo = RequestsRepo(session)
+            rows = [
+                make_advertisement(
+                    rnd,
+                    await repo.advertisement_unique_ids.allocate_unique_id(),
+                    category_ids,
+                    district_ids,
+                    agent_ids,
+                )
+                for _ in range(batch_size)
+            ]
+            result = await session.execute(
+                insert(Advertisement).returning(
+                    Advertisement.id, Advertisement.unique_id
+                ),
+                rows,
+            )
+            image_rows = [
+                {
+                    "advertisement_id": advertisement_id,
+                    "url": f"media/{PREFIX}/{unique_id}_{i}.jpg",
+                    "tg_image_hash": f"{PREFIX}-{unique_id}-{i}",
+                    "image_hash": f"{rnd.getrandbits(64):016x}",
+                }
+                for advertisement_id, unique_id in result.all()
+                for i in range(images)
+            ]
+            if image_rows:
+                await session.execute(insert(AdvertisementImage), image_rows)
+            await session.commit()
+        seeded += batch_size
+        print(f"seeded {seeded}/{total}")
+
+
+async def remove_seeded(session_pool):
+    async with session_pool() as session:
+        agent_ids = select(User.id).where(User.tg_username.startswith(f"{PREFIX}_agent_"))
+        advertisement_ids = (
+            await session.scalars(
+                select(Advertisement.id).where(Advertisement.user_id.in_(agent_ids))
+            )
+        ).all()
+
+    await cleanup(session_pool, list(advertisement_ids))
+    async with session_pool() as session:
+        await session.execute(
+            delete(User).where(User.tg_username.startswith(f"{PREFIX}_agent_"))
+        )
+        for model in (Category, District):
+            await session.execute(delete(model).where(model.slug.startswith(f"{PREFIX}-")))
+        await session.commit()
+    print(f"removed {len(advertisement_ids)} advertisements")
+
+
+async def main(advertisements: int, agents: int, images: int, seed: int, remove: bool):
+    config = load_config(".env")
+    session_pool = get_session_pool(config.db)
+
+    if remove:
+        await remove_seeded(session_pool)
+    else:
+        rnd = random.Random(seed)
+        category_ids = await ensure_dictionary(session_pool, Category, CATEGORIES)
+        district_ids = await ensure_dictionary(session_pool, District, DISTRICTS)
+        agent_ids = await ensure_agents(session_pool, agents)
+        await seed_advertisements(
+            session_pool,
+            advertisements,
+            images,
+            category_ids,
+            district_ids,
+            agent_ids,
+            rnd,
+        )
+
+    async with session_pool() as session:
+        await RequestsRepo(session).catalogue.rebuild()
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--advertisements", type=int, default=10000)
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--images", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(args.advertisements, args.agents, args.images, args.seed, args.cleanup)
+    )
@@ -0,0 +1,61 @@
+"""Нагрузочная проверка выдачи уникальных номеров объявлений.
+
+Запускает много одновременных резервирований, каждое в своей сессии,
+и проверяет, что номера не повторяются. Зарезервированные номера после
+проверки удаляются, поэтому запускать стоит на тестовой базе.
+
+    python -m scripts.benchmarks.stress_unique_ids --total 5000 --concurrency 100
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete
+
+from config.loader import load_config
+from infrastructure.database.models import AdvertisementUniqueId
+from infrastructure.database.repo.requests import RequestsRepo
+from infrastructure.database.setup import create_engine, create_session_pool
+
+
+async def allocate(session_pool, semaphore: asyncio.Semaphore) -> str:
+    async with semaphore:
+        async with session_pool() as session:
+            return await RequestsRepo(session).advertisement_unique_ids.allocate_unique_id()
+
+
+async def main(total: int, concurrency: int):
+    config = load_config(".env")
+    engine = create_engine(config.db)
+    session_pool = create_session_pool(engine=engine)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    started = time.perf_counter()
+    unique_ids = await asyncio.gather(
+        *(allocate(session_pool, semaphore) for _ in range(total))
+    )
+    elapsed = time.perf_counter() - started
+
+    duplicates = len(unique_ids) - len(set(unique_ids))
+    print(f"allocated: {len(unique_ids)}, duplicates: {duplicates}")
+    print(f"elapsed: {elapsed:.2f}s, {len(unique_ids) / elapsed:.0f} allocations/s")
+
+    async with session_pool() as session:
+        await session.execute(
+            delete(AdvertisementUniqueId).where(
+                AdvertisementUniqueId.unique_id.in_(unique_ids)
+            )
+        )
+        await session.commit()
+    await engine.dispose()
+
+    assert duplicates == 0, "unique_id allocated twice"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--total", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.total, args.concurrency))
@@ -0,0 +1,118 @@
+"""Замер текстового поиска объявлений на сгенерированном корпусе.
+
+Сравнивает поиск по tsvector и триграммам с прежним способом, когда текст
+ищется через ILIKE по всем полям. Копии объявлений с текстом из словаря
+ниже добавляются через ``--seed`` и удаляются после замера.
+
+    python -m scripts.benchmarks.text_search --seed 100000 --repeat 20
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import or_, select
+
+from backend.core.filters.advertisement import AdvertisementSearchFilter
+from config.loader import load_config
+from infrastructure.database.models import Advertisement
+from infrastructure.database.repo.requests import RequestsRepo
+from infrastructure.database.setup import create_engine, create_session_pool
+from scripts.benchmarks.common import cleanup, report_latency, seed
+
+DISTRICTS = ["Чиланзар", "Юнусабад", "Мирзо-Улугбек", "Яккасарай", "Сергели", "Алмазар"]
+DISTRICTS_UZ = ["Chilonzor", "Yunusobod", "Mirzo Ulug'bek", "Yakkasaroy", "Sergeli", "Olmazor"]
+ROOMS = ["однокомнатная", "двухкомнатная", "трехкомнатная", "четырехкомнатная"]
+FEATURES = [
+    "евроремонт", "балкон", "мебель", "техника", "парковка", "кирпичный дом",
+    "панельный дом", "новостройка", "рядом метро", "тихий двор", "вид на парк",
+]
+FEATURES_UZ = ["yevroremont", "balkon", "mebel", "texnika", "avtoturargoh", "metro yaqin"]
+
+QUERIES = [
+    "Чиланзар",
+    "двухкомнатная квартира евроремонт",
+    "рядом метро",
+    "Yunusobod",
+    "metro yaqin",
+    "Юнусобад",  # опечатка, находится по триграммам
+    "новостройка балкон",
+]
+
+
+def make_row() -> dict:
+    district = random.randrange(len(DISTRICTS))
+    rooms = random.choice(ROOMS)
+    features = random.sample(FEATURES, 3)
+    return {
+        "name": f"{rooms} квартира, {DISTRICTS[district]}",
+        "name_uz": f"kvartira, {DISTRICTS_UZ[district]}",
+        "address": f"{DISTRICTS[district]}, квартал {random.randint(1, 30)}",
+        "address_uz": f"{DISTRICTS_UZ[district]}, {random.randint(1, 30)}-kvartal",
+        "description": f"Продается {rooms} квартира: " + ", ".join(features),
+        "description_uz": "Sotiladi: " + ", ".join(random.sample(FEATURES_UZ, 2)),
+    }
+
+
+def ilike_query(text_query: str):
+    pattern = f"%{text_query}%"
+    fields = (
+        Advertisement.name,
+        Advertisement.name_uz,
+        Advertisement.address,
+        Advertisement.address_uz,
+        Advertisement.description,
+        Advertisement.description_uz,
+    )
+    return (
+        select(Advertisement)
+        .where(Advertisement.is_moderated == True)
+        .where(or_(*(field.ilike(pattern) for field in fields)))
+        .order_by(Advertisement.created_at.desc())
+        .limit(15)
+    )
+
+
+async def measure(session_pool, repeat: int):
+    for text_query in QUERIES:
+        ilike_timings, search_timings = [], []
+        async with session_pool() as session:
+            repo = RequestsRepo(session)
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await session.execute(ilike_query(text_query))
+                ilike_timings.append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                result = await repo.advertisements.search_advertisements(
+                    AdvertisementSearchFilter(q=text_query)
+                )
+                search_timings.append((time.perf_counter() - started) * 1000)
+                session.expunge_all()
+
+        print(f"\n{text_query!r}: {result['total_count']} found")
+        report_latency("  ilike", ilike_timings)
+        report_latency("  search", search_timings)
+
+
+async def main(total: int, repeat: int):
+    config = load_config(".env")
+    engine = create_engine(config.db)
+    session_pool = create_session_pool(engine=engine)
+
+    seeded_ids = await seed(session_pool, total, make_row=make_row) if total else []
+    try:
+        await measure(session_pool, repeat)
+    finally:
+        if seeded_ids:
+            await cleanup(session_pool, seeded_ids)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.seed, args.repeat))
@@ -0,0 +1,92 @@
+"""Замер задержки поиска объявления по уникальному номеру.
+
+Сравнивает прежний запрос по unique_id с подгрузкой всех связей и новый путь
+через кеш unique_id -> id. При ``--seed`` база дополняется копиями
+существующего объявления до нужного количества, после замера копии удаляются.
+Запускать на тестовой базе.
+
+    python -m scripts.benchmarks.unique_id_search --seed 100000 --lookups 2000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import select
+
+from config.loader import load_config
+from infrastructure.cache.redis import close_redis
+from infrastructure.cache.unique_ids import find_advertisement_by_unique_id
+from infrastructure.database.models import Advertisement
+from infrastructure.database.repo.requests import RequestsRepo
+from infrastructure.database.setup import create_engine, create_session_pool
+from scripts.benchmarks.common import cleanup, report_latency, seed
+
+
+async def measure(name: str, session_pool, unique_ids: list[str], lookup):
+    timings = []
+    async with session_pool() as session:
+        repo = RequestsRepo(session)
+        for unique_id in unique_ids:
+            started = time.perf_counter()
+            advertisement = await lookup(repo, unique_id)
+            timings.append((time.perf_counter() - started) * 1000)
+            assert advertisement is not None, unique_id
+            # не даем identity map отдавать объекты без запроса
+            session.expunge_all()
+
+    report_latency(name, timings)
+
+
+async def main(total: int, lookups: int):
+    config = load_config(".env")
+    engine = create_engine(config.db)
+    session_pool = create_session_pool(engine=engine)
+
+    seeded_ids = await seed(session_pool, total) if total else []
+    try:
+        async with session_pool() as session:
+            all_unique_ids = (
+                await session.execute(
+                    select(Advertisement.unique_id).where(
+                        Advertisement.unique_id.is_not(None)
+                    )
+                )
+            ).scalars().all()
+        sample = random.choices(all_unique_ids, k=lookups)
+        print(f"advertisements: {len(all_unique_ids)}, lookups: {lookups}")
+
+        await measure(
+            "unique_id query with relations",
+            session_pool,
+            sample,
+            lambda repo, unique_id: repo.advertisements.get_advertisement_by_unique_id(
+                unique_id
+            ),
+        )
+        # первый проход заполняет кеш, второй показывает горячий путь
+        for name in ("cache cold", "cache warm"):
+            await measure(
+                name,
+                session_pool,
+                sample,
+                lambda repo, unique_id: find_advertisement_by_unique_id(
+                    unique_id,
+                    repo,
+                    load=repo.advertisements.get_advertisement_without_relations,
+                ),
+            )
+    finally:
+        if seeded_ids:
+            await cleanup(session_pool, seeded_ids)
+        await close_redis()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.seed, args.lookups))
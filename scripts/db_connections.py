@@ -0,0 +1,54 @@
+"""Соединения с базой по процессам приложения.
+
+Каждый процесс подключается с application_name вида ``realty:api``, поэтому
+по pg_stat_activity видно, какая роль сколько соединений держит.
+
+    python -m scripts.db_connections
+"""
+import asyncio
+
+from sqlalchemy import text
+
+from config.loader import load_config
+from infrastructure.database.setup import create_engine, create_session_pool
+
+CONNECTIONS_QUERY = text(
+    """
+    SELECT coalesce(nullif(application_name, ''), '<unknown>') AS application,
+           coalesce(state, '<none>') AS state,
+           count(*) AS connections
+    FROM pg_stat_activity
+    WHERE datname = current_database()
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    """
+)
+
+
+async def main():
+    config = load_config(".env")
+    engine = create_engine(config.db)
+    session_pool = create_session_pool(engine)
+
+    try:
+        async with session_pool() as session:
+            max_connections = await session.scalar(text("SHOW max_connections"))
+            rows = (await session.execute(CONNECTIONS_QUERY)).all()
+    finally:
+        await engine.dispose()
+
+    total = sum(row.connections for row in rows)
+    print(f"connections: {total} of max_connections {max_connections}")
+    for row in rows:
+        print(f"  {row.application:<24} {row.state:<28} {row.connections}")
+
+    print("\nconfigured pools:")
+    for role, pool in config.db.pool_profiles.items():
+        print(
+            f"  {role:<8} size {pool.size}, max_overflow {pool.max_overflow}, "
+            f"timeout {pool.timeout}s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
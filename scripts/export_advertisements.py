@@ -0,0 +1,57 @@
+"""Выгрузка опубликованных объявлений в CSV или XLSX.
+
+Фильтры те же, что у каталога (AdvertisementFilter), limit и offset не
+учитываются. Строки читаются пачками, поэтому память не растет с размером
+выборки:
+
+    python -m scripts.export_advertisements --format xlsx --output external/advertisements.xlsx
+    python -m scripts.export_advertisements --operation-type RENT --district-id 3
+"""
+import argparse
+import asyncio
+
+from backend.core.filters.advertisement import AdvertisementFilter
+from config.db_config import SCRIPT
+from config.loader import load_config
+from infrastructure.database.setup import dispose_engine, get_session_pool
+from infrastructure.export.advertisements import ExportFormat, iter_csv, write_xlsx
+
+FILTER_FIELDS = [
+    name for name in AdvertisementFilter.model_fields if name not in ("limit", "offset")
+]
+
+
+async def main(export_format: ExportFormat, output: str, _filter: AdvertisementFilter):
+    config = load_config(".env")
+    session_pool = get_session_pool(config.db, role=SCRIPT)
+
+    if export_format == ExportFormat.csv:
+        with open(output, "wb") as file:
+            async for chunk in iter_csv(session_pool, _filter):
+                file.write(chunk)
+    else:
+        await write_xlsx(session_pool, _filter, output)
+
+    await dispose_engine()
+    print(f"saved {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--format", type=ExportFormat, choices=list(ExportFormat), default=ExportFormat.csv
+    )
+    parser.add_argument("--output")
+    for name in FILTER_FIELDS:
+        parser.add_argument(f"--{name.replace('_', '-')}")
+    args = parser.parse_args()
+
+    _filter = AdvertisementFilter(
+        **{
+            name: getattr(args, name)
+            for name in FILTER_FIELDS
+            if getattr(args, name) is not None
+        }
+    )
+    output = args.output or f"advertisements.{args.format.value}"
+    asyncio.run(main(args.format, output, _filter))
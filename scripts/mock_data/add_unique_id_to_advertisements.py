@@ -11,7 +11,6 @@ from infrastructure.database.models.advertisement import (
 )
 from infrastructure.database.repo.requests import RequestsRepo
 from infrastructure.database.setup import create_engine, create_session_pool
-from infrastructure.utils.helpers import generate_code
 
 
 async def add_advertisements(session: AsyncSession):
@@ -22,7 +21,7 @@ async def add_advertisements(session: AsyncSession):
     for advertisement in advertisements:
         updated = await repo.advertisements.update_advertisement_unique_id(
             advertisement_id=advertisement.id,
-            unique_id=generate_code(),
+            unique_id=await repo.advertisement_unique_ids.allocate_unique_id(),
         )
         print(f"{updated.name} - {updated.unique_id}")
 
@@ -1,4 +1,5 @@
 from .admin.add_realtor import router as add_realtor_router
+from .admin.analytics import router as analytics_router
 from .admin.menu import router as admin_router
 from .admin.update_realtor import router as update_realtor_router
 
@@ -18,6 +19,7 @@ routers_list = [
     admin_router,
     add_realtor_router,
     update_realtor_router,
+    analytics_router,
 
     common_user_router,
 
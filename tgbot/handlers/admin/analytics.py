@@ -0,0 +1,30 @@
+import datetime
+
+from aiogram import Router
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message
+
+from infrastructure.analytics.monthly_report import get_monthly_report
+from infrastructure.database.repo.requests import RequestsRepo
+from tgbot.filters.role import RoleFilter
+from tgbot.templates.analytics import monthly_report_text
+
+router = Router()
+router.message.filter(RoleFilter(role="group_director"))
+
+
+@router.message(Command("stats"))
+async def monthly_stats(message: Message, command: CommandObject, repo: "RequestsRepo"):
+    # /stats - текущий месяц, /stats 09.2026 - указанный
+    today = datetime.date.today()
+    year, month = today.year, today.month
+    if command.args:
+        try:
+            month, year = map(int, command.args.strip().split("."))
+            datetime.date(year, month, 1)
+        except ValueError:
+            await message.answer("Укажите месяц в формате ММ.ГГГГ, например /stats 09.2026")
+            return
+
+    report = await get_monthly_report(repo, year, month)
+    await message.answer(monthly_report_text(report))
@@ -7,12 +7,10 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 
 from backend.core.interfaces.advertisement import AdvertisementForReportDTO
-from celery_tasks.tasks import (
-    fill_report,
-    remind_agent_to_update_advertisement_extended,
-    send_message_by_queue,
-)
+from celery_tasks.tasks import fill_report, send_message_by_queue
 from config.loader import load_config
+from infrastructure.cache.facets import invalidate_facets
+from infrastructure.cache.unique_ids import forget_unique_id
 from infrastructure.database.repo.requests import RequestsRepo
 from tgbot.filters.role import RoleFilter
 from tgbot.keyboards.admin.inline import (
@@ -31,16 +29,15 @@ from tgbot.misc.user_states import (
 
 # from tgbot.scheduler.main import scheduler
 from tgbot.templates.advertisement_creation import realtor_advertisement_completed_text
-from tgbot.templates.messages import (
-    buy_channel_advertisement_message,
-    advertisement_reminder_message,
-)
+from tgbot.templates.messages import advertisement_reminder_message
 from tgbot.templates.realtor_texts import get_realtor_info
-from tgbot.utils.helpers import (
-    get_media_group,
-    correct_advertisement_dict,
-    serialize_media_group,
-    get_channel_name_and_message_by_operation_type,
+from tgbot.utils.advertisement_sync import sync_advertisements
+from tgbot.utils.helpers import correct_advertisement_dict
+from tgbot.utils.media_cache import (
+    CHANNEL,
+    REALTOR,
+    get_advertisement_media_group,
+    invalidate_media_groups,
 )
 
 router = Router()
@@ -202,11 +199,10 @@ async def get_realtor_advertisement(
     advertisement_id = int(call.data.split(":")[-1])
     advertisement = await repo.advertisements.get_advertisement_by_id(advertisement_id)
     advertisement_message = realtor_advertisement_completed_text(advertisement)
-    photos = [obj.tg_image_hash for obj in advertisement.images]
 
     try:
-        media_group = (
-            get_media_group(photos, advertisement_message) if all(photos) else []
+        media_group = await get_advertisement_media_group(
+            advertisement_id, REALTOR, repo, advertisement=advertisement
         )
 
         if media_group:
@@ -238,19 +234,18 @@ async def process_moderation_confirm(
 
     advertisement_id = int(call.data.split(":")[-1])
 
-    advertisement = await repo.advertisements.update_advertisement(
-        advertisement_id=advertisement_id, is_moderated=True
-    )
+    # напоминание об актуальности отправит периодическая задача по reminder_time
+    advertisement = await repo.advertisements.confirm_moderation(advertisement_id)
+    await sync_advertisements(repo, advertisement_id)
+    await invalidate_facets()
 
     operation_type = advertisement.operation_type.value
-    photos = [obj.tg_image_hash for obj in advertisement.images]
 
     user = await repo.users.get_user_by_id(user_id=advertisement.user_id)
 
-    channel_name, advertisement_message = (
-        get_channel_name_and_message_by_operation_type(advertisement)
+    media_group = await get_advertisement_media_group(
+        advertisement.id, CHANNEL, repo, advertisement=advertisement
     )
-    media_group = get_media_group(photos, advertisement_message)
 
     month = datetime.datetime.now().month
 
@@ -293,18 +288,8 @@ async def process_moderation_confirm(
             advertisement_id=advertisement.id, time_to_send=time_to_send
         )
 
-    send_message_by_queue.apply_async(
-        args=[
-            advertisement.id,
-            advertisement.price,
-            serialize_media_group(media_group),
-            operation_type,
-            channel_name,
-            user.tg_chat_id,
-            call.message.chat.id,
-        ],
-        eta=time_to_send,
-    )
+    # задача получает только id, медиа группа берется из кеша
+    send_message_by_queue.apply_async(args=[advertisement.id], eta=time_to_send)
     
     await call.bot.send_message(
         chat_id=user.tg_chat_id, text="Объявление прошло модерацию"
@@ -323,25 +308,6 @@ async def process_moderation_confirm(
         f"Объявление добавлено в очередь, будет отправлено в {formatted_time_to_send}",
     )
 
-    # data for reminder
-    advertisement_message_for_remind = realtor_advertisement_completed_text(
-        advertisement, lang="uz"
-    )
-
-    advertisement_media_group_for_remind = get_media_group(
-        photos, advertisement_message_for_remind
-    )
-
-    # создаем задачу для проверки актуальности по определенному времени
-    remind_agent_to_update_advertisement_extended.apply_async(
-        args=[
-            advertisement.unique_id,
-            advertisement.id,
-            user.tg_chat_id,
-            serialize_media_group(advertisement_media_group_for_remind),
-        ],
-        eta=advertisement.reminder_time,
-    )
 
     await call.message.edit_text("Спасибо! Объявление отправлено в канал")
     
@@ -371,7 +337,6 @@ async def get_advertisement_for_base_channel(
     user = await repo.users.get_user_by_id(user_id=advertisement.user_id)
 
     chat_id = config.tg_bot.base_channel_name
-    photos = [obj.tg_image_hash for obj in advertisement.images]
 
     if advertisement.operation_type.value == "Аренда":
         return await call.bot.send_message(
@@ -379,9 +344,10 @@ async def get_advertisement_for_base_channel(
             "Пропускаем объявление, так как Аренда",
         )
 
-    advertisement_message = buy_channel_advertisement_message(advertisement)
-
-    media_group = get_media_group(photos, advertisement_message)
+    # для покупки пост канала совпадает с постом для резервного канала
+    media_group = await get_advertisement_media_group(
+        advertisement_id, CHANNEL, repo, advertisement=advertisement
+    )
 
     try:
         await call.bot.send_media_group(
@@ -418,6 +384,8 @@ async def process_moderation_deny(
         advertisement = await repo.advertisements.update_advertisement(
             advertisement_id=advertisement_id, is_moderated=False
         )
+        await sync_advertisements(repo, advertisement_id)
+        await invalidate_facets()
         user = await repo.users.get_user_by_id(user_id=advertisement.user_id)
 
         await state.update_data(user=user, advertisement=advertisement)
@@ -473,6 +441,9 @@ async def delete_realtor_advertisement(
     )
     await call.message.answer("Объявление успешно удалено")
     await repo.advertisements.delete_advertisement(advertisement_id)
+    await invalidate_media_groups(advertisement_id)
+    await invalidate_facets()
+    await forget_unique_id(advertisement.unique_id)
 
 
 @router.callback_query(F.data.startswith("confirm_advertisement_delete"))
@@ -493,6 +464,9 @@ async def confirm_advertisement_delete(
     )
     await call.message.answer("Объявление успешно удалено")
     await repo.advertisements.delete_advertisement(advertisement_id)
+    await invalidate_media_groups(advertisement_id)
+    await invalidate_facets()
+    await forget_unique_id(advertisement.unique_id)
 
 
 @router.callback_query(F.data.startswith("deny_advertisement_delete"))
@@ -12,6 +12,7 @@ from tgbot.keyboards.admin.inline import realtor_fields_kb, directors_kb, realto
 from tgbot.misc.realtor_states import RealtorUpdatingState
 from tgbot.templates.realtor_texts import get_realtor_info
 from tgbot.utils.helpers import download_file
+from tgbot.utils.advertisement_sync import sync_advertisements
 
 config = load_config(".env")
 
@@ -121,6 +122,11 @@ async def update_name(
     cur_message = data.pop("realtor_message")
 
     updated = await repo.users.update_user(user_id=realtor_id, first_name=message.text)
+    # контакты агента выводятся в подписях и в витрине его объявлений
+    await sync_advertisements(
+        repo,
+        *await repo.advertisements.get_user_advertisement_ids(realtor_id),
+    )
     await cur_message.edit_caption(
         caption=get_realtor_info(updated),
         reply_markup=realtor_fields_kb(realtor_id),
@@ -160,6 +166,11 @@ async def update_lastname(
     cur_message = data.pop("realtor_message")
 
     updated = await repo.users.update_user(user_id=realtor_id, lastname=message.text)
+    # контакты агента выводятся в подписях и в витрине его объявлений
+    await sync_advertisements(
+        repo,
+        *await repo.advertisements.get_user_advertisement_ids(realtor_id),
+    )
     await cur_message.edit_caption(
         caption=get_realtor_info(updated),
         reply_markup=realtor_fields_kb(realtor_id),
@@ -201,6 +212,11 @@ async def update_phone_number(
     updated = await repo.users.update_user(
         user_id=realtor_id, phone_number=message.text
     )
+    # контакты агента выводятся в подписях и в витрине его объявлений
+    await sync_advertisements(
+        repo,
+        *await repo.advertisements.get_user_advertisement_ids(realtor_id),
+    )
     await cur_message.edit_caption(
         caption=get_realtor_info(updated),
         reply_markup=realtor_fields_kb(realtor_id),
@@ -240,6 +256,11 @@ async def update_tg_username(
     cur_message = data.pop("realtor_message")
 
     updated = await repo.users.update_user(user_id=realtor_id, tg_username=message.text)
+    # контакты агента выводятся в подписях и в витрине его объявлений
+    await sync_advertisements(
+        repo,
+        *await repo.advertisements.get_user_advertisement_ids(realtor_id),
+    )
     await cur_message.edit_caption(
         caption=get_realtor_info(updated),
         reply_markup=realtor_fields_kb(realtor_id),
@@ -297,6 +318,11 @@ async def update_profile_image(
         profile_image=str(file_location),
         profile_image_hash=photo_id,
     )
+    # фото агента выводится в подписях и в витрине его объявлений
+    await sync_advertisements(
+        repo,
+        *await repo.advertisements.get_user_advertisement_ids(realtor_id),
+    )
 
     await cur_message.delete()
     await state.clear()
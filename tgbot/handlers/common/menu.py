@@ -2,6 +2,7 @@ from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message, ContentType
 
+from infrastructure.cache.unique_ids import find_advertisement_by_unique_id
 from infrastructure.database.repo.requests import RequestsRepo
 from tgbot.keyboards.admin.inline import admin_start_kb, delete_advertisement_kb
 from tgbot.keyboards.user.inline import (
@@ -11,8 +12,7 @@ from tgbot.keyboards.user.inline import (
     return_home_kb,
 )
 from tgbot.misc.common import AdvertisementSearchStates
-from tgbot.templates.advertisement_creation import realtor_advertisement_completed_text
-from tgbot.utils.helpers import get_media_group
+from tgbot.utils.media_cache import REALTOR, get_advertisement_media_group
 
 router = Router()
 
@@ -123,12 +123,11 @@ async def _send_searched_advertisement(
     message: Message,
     advertisement,
     is_group_director,
+    repo: RequestsRepo,
 ):
-    advertisement_message = realtor_advertisement_completed_text(
-        advertisement=advertisement,
+    media_group = await get_advertisement_media_group(
+        advertisement.id, REALTOR, repo, advertisement=advertisement
     )
-    photos = [obj.tg_image_hash for obj in advertisement.images]
-    media_group = get_media_group(photos, advertisement_message)
     if media_group:
         await message.answer_media_group(media=media_group)  # type: ignore
 
@@ -145,8 +144,8 @@ async def _send_searched_advertisement(
 
 @router.message(AdvertisementSearchStates.id)
 async def get_searched_advertisement(message: Message, repo: RequestsRepo):
-    advertisement = await repo.advertisements.get_advertisement_by_unique_id(
-        unique_id=message.text
+    advertisement = await find_advertisement_by_unique_id(
+        message.text, repo, load=repo.advertisements.get_advertisement_by_id
     )
     user = await repo.users.get_user_by_chat_id(tg_chat_id=message.chat.id)
 
@@ -154,7 +153,7 @@ async def get_searched_advertisement(message: Message, repo: RequestsRepo):
 
     if user.is_superadmin:
         return await _send_searched_advertisement(
-            message, advertisement, is_group_director
+            message, advertisement, is_group_director, repo
         )
 
     if not advertisement:
@@ -174,7 +173,7 @@ async def get_searched_advertisement(message: Message, repo: RequestsRepo):
 
     try:
         return await _send_searched_advertisement(
-            message, advertisement, is_group_director
+            message, advertisement, is_group_director, repo
         )
     except Exception as e:
         error_message = (
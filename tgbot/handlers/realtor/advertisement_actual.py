@@ -5,21 +5,51 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 
 from backend.app.config import config
-from celery_tasks.tasks import remind_agent_to_update_advertisement_extended
 from infrastructure.database.repo.requests import RequestsRepo
 from tgbot.keyboards.admin.inline import (
     advertisement_moderation_kb,
     delete_advertisement_kb,
 )
-from tgbot.keyboards.user.inline import is_price_actual_kb
+from tgbot.keyboards.user.inline import is_advertisement_actual_kb, is_price_actual_kb
 from tgbot.misc.user_states import AdvertisementRelevanceState
-from tgbot.templates.advertisement_creation import realtor_advertisement_completed_text
 from tgbot.templates.messages import advertisement_reminder_message
 from tgbot.utils import helpers
+from tgbot.utils.advertisement_sync import sync_advertisements
+from tgbot.utils.media_cache import (
+    CHANNEL,
+    REALTOR,
+    REALTOR_UZ,
+    get_advertisement_media_group,
+)
 
 router = Router()
 
 
+@router.callback_query(F.data.startswith("remind_advertisement"))
+async def send_advertisement_for_actuality_check(
+    call: CallbackQuery,
+    repo: RequestsRepo,
+):
+    """Показываем объявление из дайджеста напоминаний."""
+    await call.answer()
+
+    advertisement_id = int(call.data.split(":")[-1])
+    advertisement = await repo.advertisements.get_advertisement_summary(
+        advertisement_id
+    )
+    if advertisement is None:
+        return await call.message.answer("Объявление уже удалено")
+
+    media_group = await get_advertisement_media_group(
+        advertisement_id, REALTOR_UZ, repo
+    )
+    await call.message.answer_media_group(media=media_group)
+    await call.message.answer(
+        text=f"Объявление: №{advertisement.unique_id} актуально?",
+        reply_markup=is_advertisement_actual_kb(advertisement_id),
+    )
+
+
 @router.callback_query(F.data.startswith("actual"))
 async def react_to_advertisement_actual(call: CallbackQuery):
     """Если объявление является актуальным"""
@@ -72,10 +102,11 @@ async def set_actual_price_for_advertisement(
         new_price=int(new_price),
         reminder_time=reminder_time,
     )
+    await sync_advertisements(repo, advertisement_id)
 
     # подготавливаем медиа группу для отправки
-    media_group = await helpers.collect_media_group_for_advertisement(
-        updated_advertisement, repo
+    media_group = await get_advertisement_media_group(
+        advertisement_id, REALTOR, repo, advertisement=updated_advertisement
     )
 
     await message.answer("Объявление отправлено руководителю на проверку")
@@ -105,13 +136,6 @@ async def react_to_advertisement_price_not_changed(
     advertisement_id = int(call.data.split(":")[-1])
 
     advertisement = await repo.advertisements.get_advertisement_by_id(advertisement_id)
-    advertisement_message_for_remind = realtor_advertisement_completed_text(
-        advertisement
-    )
-
-    advertisement_photos = await helpers.get_advertisement_photos(
-        advertisement_id, repo
-    )
 
     # получаем новое время обновления
     operation_type = advertisement.operation_type.value
@@ -120,21 +144,18 @@ async def react_to_advertisement_price_not_changed(
         "%Y-%m-%d %H:%M:%S"
     )
 
-    # медиа группа для проверки актуальности
-    advertisement_media_group_for_remind = helpers.get_media_group(
-        advertisement_photos, advertisement_message_for_remind
+    channel_name = helpers.get_channel_name_by_operation_type(operation_type)
+    media_group = await get_advertisement_media_group(
+        advertisement_id, CHANNEL, repo, advertisement=advertisement
     )
 
-    channel_name, advertisement_message = (
-        helpers.get_channel_name_and_message_by_operation_type(advertisement)
-    )
-    media_group = helpers.get_media_group(advertisement_photos, advertisement_message)
-
     agent = await repo.users.get_user_by_id(advertisement.user_id)
 
-    # обновляем дату проверки актуальности
+    # обновляем дату проверки актуальности, напоминание отправит периодическая задача
     await repo.advertisements.update_advertisement(
-        reminder_time=reminder_time, advertisement_id=advertisement_id
+        reminder_time=reminder_time,
+        is_reminded=False,
+        advertisement_id=advertisement_id,
     )
 
     # отправляем сообщение в супер группу по топикам
@@ -163,16 +184,6 @@ async def react_to_advertisement_price_not_changed(
             text=f"ошибка при отправке медиа группы\n{str(e)}",
         )
 
-    remind_agent_to_update_advertisement_extended.apply_async(
-        args=[
-            advertisement.unique_id,
-            advertisement.id,
-            agent.tg_chat_id,
-            helpers.serialize_media_group(advertisement_media_group_for_remind),
-        ],
-        eta=reminder_time,
-    )
-
     await call.message.answer(
         f"Уведомление для проверки актуальности отправится агенту в \n<b>{formatted_reminder_time}</b>"
     )
@@ -189,8 +200,8 @@ async def react_to_advertisement_not_actual(call: CallbackQuery, repo: RequestsR
 
     advertisement_id = int(call.data.split(":")[-1])
     advertisement = await repo.advertisements.get_advertisement_by_id(advertisement_id)
-    media_group = await helpers.collect_media_group_for_advertisement(
-        advertisement, repo
+    media_group = await get_advertisement_media_group(
+        advertisement_id, REALTOR, repo, advertisement=advertisement
     )
 
     # данные агента, который добавил объявление
@@ -32,7 +32,12 @@ from tgbot.templates.advertisement_updating import (
     update_rooms_text,
 )
 
+from tgbot.utils.advertisement_sync import sync_advertisements
 from tgbot.utils.helpers import get_media_group, download_file
+from tgbot.utils.media_cache import (
+    REALTOR,
+    get_advertisement_media_group,
+)
 
 router = Router()
 
@@ -82,6 +87,7 @@ async def get_new_name(
         advertisement_id=data["advertisement_id"],
         name=message.text,
     )
+    await sync_advertisements(repo, updated.id)
     await message.answer(
         realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id=data["advertisement_id"]),
@@ -120,6 +126,7 @@ async def get_new_name_uz(
         advertisement_id=data["advertisement_id"],
         name_uz=message.text,
     )
+    await sync_advertisements(repo, updated.id)
     await message.answer(
         realtor_advertisement_completed_text(updated, lang="uz"),
         reply_markup=advertisement_update_kb(advertisement_id=data["advertisement_id"]),
@@ -155,6 +162,7 @@ async def update_advertisement_owner_phone_number(
         advertisement_id=advertisement_id,
         owner_phone_number=message.text,
     )
+    await sync_advertisements(repo, updated.id)
     await message.answer(
         realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id=data["advertisement_id"]),
@@ -193,6 +201,7 @@ async def get_new_operation_type(
         advertisement_id=data["advertisement_id"],
         operation_type=operation_type.upper(),
     )
+    await sync_advertisements(repo, updated.id)
     await call.message.edit_text(
         text=realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id=data["advertisement_id"]),
@@ -258,6 +267,7 @@ async def get_new_description(
         advertisement_id=advertisement_id,
         description=message.text,
     )
+    await sync_advertisements(repo, updated.id)
     await message.answer(
         text=realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id),
@@ -297,6 +307,7 @@ async def get_new_description(
         advertisement_id=advertisement_id,
         description_uz=message.text,
     )
+    await sync_advertisements(repo, updated.id)
     await message.answer(
         text=realtor_advertisement_completed_text(updated, lang="uz"),
         reply_markup=advertisement_update_kb(advertisement_id),
@@ -340,6 +351,7 @@ async def get_new_district(
         advertisement_id=advertisement_id,
         district_id=district_id,
     )
+    await sync_advertisements(repo, updated.id)
     await call.message.edit_text(
         text=realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id),
@@ -377,6 +389,7 @@ async def get_new_address(
         advertisement_id=advertisement_id,
         address=message.text,
     )
+    await sync_advertisements(repo, updated.id)
     await message.answer(
         text=realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id),
@@ -414,6 +427,7 @@ async def get_new_address(
         advertisement_id=advertisement_id,
         address_uz=message.text,
     )
+    await sync_advertisements(repo, updated.id)
 
     await message.answer(
         text=realtor_advertisement_completed_text(updated, lang="uz"),
@@ -458,6 +472,7 @@ async def get_new_category(
         advertisement_id=advertisement_id,
         category_id=category_id,
     )
+    await sync_advertisements(repo, updated.id)
 
     await call.message.edit_text(
         text=realtor_advertisement_completed_text(updated),
@@ -500,6 +515,7 @@ async def get_new_property_type(
         advertisement_id=advertisement_id,
         property_type=property_type.upper(),
     )
+    await sync_advertisements(repo, updated.id)
     await call.message.edit_text(
         text=realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id),
@@ -538,6 +554,7 @@ async def get_new_price(
         advertisement_id=advertisement_id,
         price=int(message.text),
     )
+    await sync_advertisements(repo, updated.id)
     await message.answer(
         text=realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id=advertisement_id),
@@ -580,6 +597,7 @@ async def get_new_quadrature(
         advertisement_id=advertisement_id,
         quadrature=int(message.text),
     )
+    await sync_advertisements(repo, updated.id)
     await message.answer(
         text=realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id),
@@ -617,6 +635,7 @@ async def get_new_creation_year(
         advertisement_id=advertisement_id,
         creation_year=int(message.text),
     )
+    await sync_advertisements(repo, updated.id)
 
     await message.answer(
         realtor_advertisement_completed_text(updated),
@@ -656,6 +675,7 @@ async def get_new_rooms_qty(
     updated = await repo.advertisements.update_advertisement(
         advertisement_id=advertisement_id, rooms_quantity=int(message.text)
     )
+    await sync_advertisements(repo, updated.id)
     await message.answer(
         text=realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id),
@@ -696,6 +716,7 @@ async def get_new_repair_type(
         advertisement_id=advertisement_id,
         repair_type=repair_type.upper(),
     )
+    await sync_advertisements(repo, updated.id)
     await call.message.edit_text(
         text=realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id),
@@ -742,6 +763,7 @@ async def get_new_house_quadrature(
         house_quadrature_from=int(_from),
         house_quadrature_to=int(to),
     )
+    await sync_advertisements(repo, updated.id)
     await message.answer(
         text=realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id),
@@ -786,6 +808,7 @@ async def get_new_floor(
         floor_from=int(_from),
         floor_to=int(to),
     )
+    await sync_advertisements(repo, updated.id)
     await message.answer(
         text=realtor_advertisement_completed_text(updated),
         reply_markup=advertisement_update_kb(advertisement_id),
@@ -825,9 +848,6 @@ async def get_new_image(
     image_id = state_data.get("image_id")
     advertisement_id = state_data.get("advertisement_id")
 
-    advertisement = await repo.advertisements.get_advertisement_by_id(
-        advertisement_id=advertisement_id
-    )
     image = await repo.advertisement_images.get_image_by_id(image_id=image_id)
 
     # adding new image
@@ -847,15 +867,10 @@ async def get_new_image(
         url=str(file_location),
         tg_image_hash=new_image_id,
     )
+    await sync_advertisements(repo, advertisement_id)
 
-    # advertisement message
-    advertisement_message = realtor_advertisement_completed_text(advertisement)
-    images = advertisement.images
-    photos = [obj.tg_image_hash for obj in images if obj.tg_image_hash]
-    if not photos:
-        photos = [obj.url for obj in images]
-
-    media_group = get_media_group(photos, advertisement_message)
+    # медиа группа собирается заново уже с новой фотографией
+    media_group = await get_advertisement_media_group(advertisement_id, REALTOR, repo)
 
     await message.answer_media_group(media=media_group)
     await message.answer(
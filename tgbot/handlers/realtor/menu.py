@@ -18,7 +18,7 @@ from tgbot.templates.advertisement_creation import (
     choose_operation_type_text,
     realtor_advertisement_completed_text,
 )
-from tgbot.utils.helpers import get_media_group
+from tgbot.utils.media_cache import REALTOR, get_advertisement_media_group
 
 config = load_config()
 
@@ -99,8 +99,9 @@ async def get_realtor_advertisement_detail(
         advertisement=advertisement,
     )
     try:
-        photos = [obj.tg_image_hash for obj in advertisement.images]
-        media_group = get_media_group(photos, advertisement_message)
+        media_group = await get_advertisement_media_group(
+            advertisement_id, REALTOR, repo, advertisement=advertisement
+        )
         await call.message.edit_text(text=advertisement_message)
         if media_group:
             await call.message.answer_media_group(media=media_group)
@@ -130,9 +131,9 @@ async def delete_advertisement(
         advertisement_id=advertisement_id
     )
 
-    message = realtor_advertisement_completed_text(advertisement=advertisement)
-    photos = [obj.tg_image_hash for obj in advertisement.images]
-    media_group = get_media_group(photos, message)
+    media_group = await get_advertisement_media_group(
+        advertisement_id, REALTOR, repo, advertisement=advertisement
+    )
 
     director = await repo.users.get_user_by_chat_id(
         tg_chat_id=advertisement.user.added_by
@@ -1,11 +1,12 @@
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from aiogram import F, Router
+from aiogram import Bot, F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 
 from config.loader import load_config
+from infrastructure.cache.unique_ids import remember_unique_id
 from infrastructure.database.models.advertisement import (
     OperationType,
     OperationTypeUz,
@@ -46,6 +47,7 @@ from tgbot.templates.advertisement_creation import (
     price_text,
     realtor_advertisement_completed_text,
 )
+from tgbot.utils.broadcaster import schedule_broadcast
 from tgbot.utils.helpers import (
     filter_digits,
     get_media_group,
@@ -751,6 +753,7 @@ async def get_repair_type(
         new_advertisement = await repo.advertisements.update_advertisement(
             advertisement_id=new_advertisement.id, old_price=int(price)
         )
+        await remember_unique_id(new_advertisement.unique_id, new_advertisement.id)
 
         advertisement_message = realtor_advertisement_completed_text(
             new_advertisement, lang="uz"
@@ -772,34 +775,47 @@ async def get_repair_type(
         )
 
         group_directors = await repo.users.get_users_by_role(role="GROUP_DIRECTOR")
-        group_directors.append(dev_user)
+        # в тестовом чате может не быть зарегистрированного пользователя
+        if dev_user is not None:
+            group_directors.append(dev_user)
 
         await call.message.answer_media_group(media=media_group)
 
-        for director in group_directors:
-            try:
-                if (
-                    director.tg_chat_id
-                    and director.tg_chat_id == new_advertisement.user.added_by
-                ):
-                    realtor_fullname = f"{new_advertisement.user.first_name} {new_advertisement.user.lastname}"
-                    await call.bot.send_message(
-                        director.tg_chat_id,
-                        f"Риелтор: {realtor_fullname} добавил новое объявление",
-                    )
-                    await call.bot.send_media_group(
-                        director.tg_chat_id, media=media_group
-                    )
-                    await call.bot.send_message(
-                        director.tg_chat_id,
-                        f"Объявление прошло модерацию?",
-                        reply_markup=advertisement_moderation_kb(new_advertisement.id),
-                    )
-            except Exception as e:
-                await call.bot.send_message(
-                    chat_id=config.tg_bot.main_chat_id,
-                    text=f"ошибка при отправке руководителям\n{e}\n{e.__class__.__name__}",
-                )
+        realtor_fullname = (
+            f"{new_advertisement.user.first_name} {new_advertisement.user.lastname}"
+        )
+        moderation_kb = advertisement_moderation_kb(new_advertisement.id)
+
+        async def send_to_director(bot: Bot, chat_id: int):
+            await bot.send_message(
+                chat_id,
+                f"Риелтор: {realtor_fullname} добавил новое объявление",
+            )
+            await bot.send_media_group(chat_id, media=media_group)
+            await bot.send_message(
+                chat_id,
+                "Объявление прошло модерацию?",
+                reply_markup=moderation_kb,
+            )
+
+        async def report_director_error(bot: Bot, chat_id: int, e: Exception):
+            await bot.send_message(
+                chat_id=config.tg_bot.main_chat_id,
+                text=f"ошибка при отправке руководителям\n{e}\n{e.__class__.__name__}",
+            )
+
+        # рассылка руководителям идет в фоне, риелтор не ждет ее завершения
+        schedule_broadcast(
+            bot=call.bot,
+            chat_ids=[
+                director.tg_chat_id
+                for director in group_directors
+                if director.tg_chat_id
+                and director.tg_chat_id == new_advertisement.user.added_by
+            ],
+            send=send_to_director,
+            on_error=report_director_error,
+        )
 
         await call.message.answer(
             text="Выберите действие над этим объявлением",
@@ -194,6 +194,19 @@ def is_advertisement_actual_kb(advertisement_id: int):
     return kb.as_markup()
 
 
+def reminder_digest_kb(advertisements):
+    kb = InlineKeyboardBuilder()
+    for advertisement in advertisements:
+        kb.add(
+            InlineKeyboardButton(
+                text=f'№{advertisement.unique_id}',
+                callback_data=f'remind_advertisement:{advertisement.id}',
+            )
+        )
+    kb.adjust(3)
+    return kb.as_markup()
+
+
 def is_price_actual_kb(advertisement_id: int):
     kb = InlineKeyboardBuilder()
     kb.add(InlineKeyboardButton(text='Да', callback_data=f'price_changed:{advertisement_id}'))
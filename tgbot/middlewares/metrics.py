@@ -0,0 +1,197 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject
+from prometheus_client import Counter, Histogram
+
+from infrastructure.database.query_stats import collect_query_stats
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+UNHANDLED_HANDLER = "<unhandled>"
+
+UPDATE_DURATION = Histogram(
+    "bot_update_duration_seconds",
+    "Время обработки апдейта вместе с фильтрами и middleware",
+    ["event", "handler", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+UPDATE_DB_DURATION = Histogram(
+    "bot_update_db_duration_seconds",
+    "Суммарное время запросов к базе за апдейт",
+    ["event", "handler"],
+    buckets=LATENCY_BUCKETS,
+)
+UPDATE_TELEGRAM_CALLS = Histogram(
+    "bot_update_telegram_calls",
+    "Количество запросов к Telegram API за апдейт",
+    ["event", "handler"],
+    buckets=(0, 1, 2, 3, 5, 10, 20),
+)
+TELEGRAM_API_DURATION = Histogram(
+    "bot_telegram_api_duration_seconds",
+    "Время запроса к Telegram API без ожидания лимитера",
+    ["method"],
+    buckets=LATENCY_BUCKETS,
+)
+TELEGRAM_API_ERRORS = Counter(
+    "bot_telegram_api_errors_total",
+    "Ошибки запросов к Telegram API",
+    ["method", "error"],
+)
+
+
+@dataclass
+class UpdateStats:
+    handler: str = UNHANDLED_HANDLER
+    telegram_calls: int = 0
+    telegram_seconds: float = 0.0
+
+
+@dataclass
+class HandlerSummary:
+    updates: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    db_seconds: float = 0.0
+    telegram_seconds: float = 0.0
+
+
+class SummaryWindow:
+    """Накопленная статистика по обработчикам для периодической сводки."""
+
+    def __init__(self):
+        self._handlers: dict[str, HandlerSummary] = {}
+
+    def add(
+        self,
+        handler: str,
+        seconds: float,
+        failed: bool,
+        db_seconds: float,
+        telegram_seconds: float,
+    ):
+        summary = self._handlers.setdefault(handler, HandlerSummary())
+        summary.updates += 1
+        summary.errors += failed
+        summary.seconds += seconds
+        summary.max_seconds = max(summary.max_seconds, seconds)
+        summary.db_seconds += db_seconds
+        summary.telegram_seconds += telegram_seconds
+
+    def reset(self) -> dict[str, HandlerSummary]:
+        handlers, self._handlers = self._handlers, {}
+        return handlers
+
+
+summary_window = SummaryWindow()
+
+_update_stats: ContextVar[UpdateStats | None] = ContextVar("update_stats", default=None)
+
+
+def _handler_name(callback) -> str:
+    module = callback.__module__.removeprefix("tgbot.handlers.")
+    return f"{module}.{callback.__name__}"
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """Внешний middleware: время обработки апдейта, работа с базой и Telegram API.
+
+    Регистрируется первым, чтобы в замер попали остальные middleware и фильтры.
+    """
+
+    def __init__(self, event: str) -> None:
+        self.event = event
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        stats = UpdateStats()
+        token = _update_stats.set(stats)
+        failed = True
+        started = time.perf_counter()
+        try:
+            with collect_query_stats() as db_stats:
+                result = await handler(event, data)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            _update_stats.reset(token)
+
+            status = "error" if failed else "ok"
+            UPDATE_DURATION.labels(self.event, stats.handler, status).observe(elapsed)
+            UPDATE_DB_DURATION.labels(self.event, stats.handler).observe(
+                db_stats.seconds
+            )
+            UPDATE_TELEGRAM_CALLS.labels(self.event, stats.handler).observe(
+                stats.telegram_calls
+            )
+            summary_window.add(
+                stats.handler,
+                elapsed,
+                failed,
+                db_seconds=db_stats.seconds,
+                telegram_seconds=stats.telegram_seconds,
+            )
+
+
+class HandlerNameMiddleware(BaseMiddleware):
+    """Внутренний middleware: запоминаем, какой обработчик выбрал диспетчер."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        stats = _update_stats.get()
+        if stats is None:
+            return await handler(event, data)
+
+        stats.handler = _handler_name(data["handler"].callback)
+        try:
+            return await handler(event, data)
+        except SkipHandler:
+            # диспетчер перейдет к следующему подходящему обработчику
+            stats.handler = UNHANDLED_HANDLER
+            raise
+
+
+class TelegramApiMetricsMiddleware(BaseRequestMiddleware):
+    """Время и ошибки запросов к Telegram API."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        name = type(method).__name__
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception as e:
+            TELEGRAM_API_ERRORS.labels(name, type(e).__name__).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            TELEGRAM_API_DURATION.labels(name).observe(elapsed)
+
+            stats = _update_stats.get()
+            if stats is not None:
+                stats.telegram_calls += 1
+                stats.telegram_seconds += elapsed
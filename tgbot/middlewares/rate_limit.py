@@ -0,0 +1,86 @@
+import asyncio
+import logging
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    CopyMessage,
+    ForwardMessage,
+    Response,
+    SendMediaGroup,
+    SendMessage,
+    SendPhoto,
+    TelegramMethod,
+)
+from aiogram.methods.base import TelegramType
+
+from tgbot.utils.rate_limiter import TokenBucketLimiter
+
+logger = logging.getLogger(__name__)
+
+LIMITED_METHODS = (SendMessage, SendMediaGroup, SendPhoto, CopyMessage, ForwardMessage)
+
+# лимиты Telegram: ~30 сообщений в секунду на бота,
+# ~1 сообщение в секунду в личный чат и ~20 в минуту в группу или канал
+GLOBAL_RATE, GLOBAL_CAPACITY = 30, 30
+PRIVATE_CHAT_RATE, PRIVATE_CHAT_CAPACITY = 1, 3
+GROUP_CHAT_RATE, GROUP_CHAT_CAPACITY = 20 / 60, 20
+
+MAX_RETRIES = 5
+
+
+def _is_private_chat(chat_id: int | str) -> bool:
+    return isinstance(chat_id, int) and chat_id > 0
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """Ограничивает исходящие сообщения бота и повторяет их после flood wait.
+
+    Ведра общие для процесса бота и задач Celery, поэтому всплески после
+    модерации не приводят к ошибкам 429.
+    """
+
+    def __init__(self, limiter: TokenBucketLimiter) -> None:
+        self.limiter = limiter
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        if not isinstance(method, LIMITED_METHODS):
+            return await make_request(bot, method)
+
+        chat_id = method.chat_id
+        global_key = f"tg:{bot.id}:global"
+        chat_key = f"tg:{bot.id}:chat:{chat_id}"
+        # медиа группа считается Telegram как несколько сообщений
+        cost = len(method.media) if isinstance(method, SendMediaGroup) else 1
+
+        if _is_private_chat(chat_id):
+            chat_rate, chat_capacity = PRIVATE_CHAT_RATE, PRIVATE_CHAT_CAPACITY
+        else:
+            chat_rate, chat_capacity = GROUP_CHAT_RATE, GROUP_CHAT_CAPACITY
+
+        for attempt in range(MAX_RETRIES + 1):
+            await self.limiter.acquire(chat_key, chat_rate, chat_capacity, cost)
+            await self.limiter.acquire(global_key, GLOBAL_RATE, GLOBAL_CAPACITY, cost)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                logger.warning(
+                    "%s to %s hit flood wait, retry after %s sec",
+                    type(method).__name__,
+                    chat_id,
+                    e.retry_after,
+                )
+                # блокируем ведро чата, чтобы остальные процессы тоже подождали
+                await self.limiter.block(chat_key, e.retry_after)
+                await asyncio.sleep(e.retry_after)
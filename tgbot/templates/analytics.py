@@ -0,0 +1,57 @@
+from html import escape
+
+from backend.core.interfaces.analytics import GroupPriceStatsDTO, MonthlyReportDTO
+from tgbot.misc.constants import MONTHS_DICT
+
+OPERATION_TYPES = {"RENT": "Аренда", "BUY": "Покупка"}
+# сообщение Telegram ограничено 4096 символами, поэтому показываем верх списков
+TOP_SIZE = 10
+
+
+def _prices(title: str, groups: list[GroupPriceStatsDTO]) -> str:
+    lines = [f"\n<b>{title}</b>"]
+    for operation_type, name in OPERATION_TYPES.items():
+        rows = [group for group in groups if group.operation_type == operation_type]
+        if not rows:
+            continue
+        lines.append(f"{name}:")
+        lines += [
+            f"  {escape(group.name or 'Без названия')}: {group.listings} шт., "
+            f"медиана {group.median_price:,.0f}$"
+            for group in rows[:TOP_SIZE]
+        ]
+    return "\n".join(lines)
+
+
+def monthly_report_text(report: MonthlyReportDTO) -> str:
+    lines = [
+        f"<b>Статистика: {MONTHS_DICT[report.month]} {report.year}</b>",
+        f"Новых объявлений: {report.listings}",
+        "\n<b>Агенты</b>",
+    ]
+    lines += [
+        f"  {escape(agent.agent or 'Без имени')}: {agent.listings} шт., "
+        f"опубликовано {agent.moderated}"
+        for agent in report.agents[:TOP_SIZE]
+    ]
+
+    moderation = report.moderation
+    lines.append("\n<b>Модерация</b>")
+    if moderation.moderated:
+        lines.append(
+            f"  Опубликовано {moderation.moderated}, медиана {moderation.median_hours} ч., "
+            f"90% быстрее {moderation.p90_hours} ч."
+        )
+    else:
+        lines.append("  Нет данных")
+
+    lines.append(_prices("Цены по районам", report.districts))
+    lines.append(_prices("Цены по категориям", report.categories))
+
+    lines.append("\n<b>Изменения цены</b>")
+    lines += [
+        f"  {OPERATION_TYPES.get(change.operation_type, change.operation_type)}: "
+        f"{change.changed} шт., медиана {change.median_change_percent:+}%"
+        for change in report.price_changes
+    ] or ["  Нет данных"]
+    return "\n".join(lines)
@@ -71,4 +71,39 @@ ID: {advertisement.unique_id}
 
 
 def advertisement_reminder_message(reminder_time):
-    return f"Уведомление для проверки актуальности данного объявления будет отправлено в <b>{reminder_time}</b>"
\ No newline at end of file
+    return f"Уведомление для проверки актуальности данного объявления будет отправлено в <b>{reminder_time}</b>"
+
+
+def advertisement_reminder_digest_message(unique_ids: list[str]):
+    advertisements = "\n".join(f"№{unique_id}" for unique_id in unique_ids)
+    return f"""
+Проверка актуальности
+
+Пора проверить объявления:
+{advertisements}
+
+Выберите объявление, чтобы отметить его актуальность
+"""
+
+
+def bot_metrics_summary_message(interval_minutes: int, handlers: dict) -> str:
+    updates = sum(summary.updates for summary in handlers.values())
+    errors = sum(summary.errors for summary in handlers.values())
+    # сверху обработчики, на которые ушло больше всего времени
+    slowest = sorted(handlers.items(), key=lambda item: item[1].seconds, reverse=True)
+    rows = "\n".join(
+        f"<code>{name}</code>: {summary.updates} шт., "
+        f"ср. {summary.seconds / summary.updates * 1000:.0f} мс, "
+        f"макс. {summary.max_seconds * 1000:.0f} мс, "
+        f"БД {summary.db_seconds / summary.updates * 1000:.0f} мс, "
+        f"Telegram {summary.telegram_seconds / summary.updates * 1000:.0f} мс, "
+        f"ошибок {summary.errors}"
+        for name, summary in slowest[:10]
+    )
+    return f"""
+Сводка бота за {interval_minutes} мин.
+
+Апдейтов: {updates}, ошибок: {errors}
+
+{rows}
+"""
@@ -0,0 +1,8 @@
+from infrastructure.database.repo.requests import RequestsRepo
+from tgbot.utils.media_cache import invalidate_media_groups
+
+
+async def sync_advertisements(repo: RequestsRepo, *advertisement_ids: int) -> None:
+    """После изменения объявлений сбрасываем кеш медиа групп и обновляем витрину."""
+    await invalidate_media_groups(*advertisement_ids)
+    await repo.catalogue.refresh_advertisements(list(advertisement_ids))
@@ -0,0 +1,31 @@
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+
+from config.loader import Config
+from tgbot.middlewares.metrics import TelegramApiMetricsMiddleware
+from tgbot.middlewares.rate_limit import RateLimitMiddleware
+from tgbot.utils.rate_limiter import TokenBucketLimiter
+
+
+def create_bot(config: Config, default: DefaultBotProperties | None = None) -> Bot:
+    """Создаем бота, все исходящие сообщения которого проходят через общий лимитер."""
+    session = None
+    if config.tg_bot.api_server:
+        session = AiohttpSession(
+            api=TelegramAPIServer.from_base(config.tg_bot.api_server)
+        )
+    bot = Bot(token=config.tg_bot.token, session=session, default=default)
+    limiter = TokenBucketLimiter(redis_url=config.redis_config.cache_url)
+    bot.session.middleware(RateLimitMiddleware(limiter))
+    # после лимитера, чтобы ожидание токенов не считалось временем Telegram API
+    bot.session.middleware(TelegramApiMetricsMiddleware())
+    return bot
+
+
+async def close_bot(bot: Bot) -> None:
+    for middleware in bot.session.middleware:
+        if isinstance(middleware, RateLimitMiddleware):
+            await middleware.limiter.close()
+    await bot.session.close()
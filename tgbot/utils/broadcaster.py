@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Iterable
+
+from aiogram import Bot
+
+logger = logging.getLogger(__name__)
+
+# Telegram позволяет ~30 сообщений в секунду на бота, оставляем запас
+GLOBAL_CONCURRENCY = 25
+
+SendCallback = Callable[[Bot, int], Awaitable[None]]
+ErrorCallback = Callable[[Bot, int, Exception], Awaitable[None]]
+
+# держим ссылки на фоновые задачи, чтобы их не собрал GC до завершения
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _send(
+    bot: Bot,
+    chat_id: int,
+    send: SendCallback,
+    semaphore: asyncio.Semaphore,
+) -> None:
+    async with semaphore:
+        return await send(bot, chat_id)
+
+
+async def broadcast(
+    bot: Bot,
+    chat_ids: Iterable[int],
+    send: SendCallback,
+    on_error: ErrorCallback | None = None,
+    concurrency: int = GLOBAL_CONCURRENCY,
+) -> None:
+    """Рассылаем сообщения всем получателям одновременно.
+
+    Вызовы ``send`` для одного получателя выполняются последовательно внутри
+    callback, поэтому порядок сообщений в каждом чате сохраняется. Лимиты
+    Telegram и повтор после flood wait обеспечивает ``RateLimitMiddleware``.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    # один и тот же чат не должен получить сообщение дважды
+    unique_chat_ids = list(dict.fromkeys(chat_ids))
+
+    results = await asyncio.gather(
+        *(
+            _send(bot, chat_id, send, semaphore)
+            for chat_id in unique_chat_ids
+        ),
+        return_exceptions=True,
+    )
+
+    for chat_id, result in zip(unique_chat_ids, results):
+        if not isinstance(result, Exception):
+            continue
+        logger.error("failed to send message to %s: %r", chat_id, result)
+        if on_error is not None:
+            try:
+                await on_error(bot, chat_id, result)
+            except Exception:
+                logger.exception("error callback failed for %s", chat_id)
+
+
+def schedule_broadcast(
+    bot: Bot,
+    chat_ids: Iterable[int],
+    send: SendCallback,
+    on_error: ErrorCallback | None = None,
+) -> asyncio.Task:
+    """Запускаем рассылку в фоне и сразу возвращаем управление обработчику."""
+    task = asyncio.create_task(
+        broadcast(bot, list(chat_ids), send, on_error=on_error)
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
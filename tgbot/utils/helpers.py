@@ -6,8 +6,6 @@ from aiogram import Bot
 from aiogram.types import InputMediaPhoto
 
 from backend.app.config import config
-from infrastructure.database.repo.requests import RequestsRepo
-from tgbot.templates.advertisement_creation import realtor_advertisement_completed_text
 from tgbot.templates.messages import (
     rent_channel_advertisement_message,
     buy_channel_advertisement_message,
@@ -56,8 +54,9 @@ async def send_message_to_rent_topic(
 ) -> None:
     """Отправляем сообщение в супер группу фильтруя по цене."""
 
-    topic_data = config.super_group.make_forum_topics_data(operation_type)
-    prices = list(topic_data.items())
+    thread_ids = config.super_group.get_topic_thread_ids_by_price(
+        operation_type, price
+    )
 
     # supergroups ids
     rent_supergroup_id = config.super_group.rent_supergroup_id
@@ -67,12 +66,7 @@ async def send_message_to_rent_topic(
         rent_supergroup_id if operation_type == "Аренда" else buy_supergroup_id
     )
 
-    for thread_id, _price in prices:
-        a, b = _price
-
-        price_range = list(range(a, b))
-        if price not in price_range:
-            continue
+    for thread_id in thread_ids:
         await bot.send_media_group(
             chat_id=supergroup_id, message_thread_id=thread_id, media=media_group
         )
@@ -112,29 +106,18 @@ def get_reminder_time_by_operation_type(operation_type: str) -> datetime:
     )  # для аренды
 
 
-async def get_advertisement_photos(advertisement_id: int, repo: "RequestsRepo"):
-    photos = await repo.advertisement_images.get_advertisement_images(
-        advertisement_id=advertisement_id
-    )
-    return [item.tg_image_hash for item in photos]
-
-
-async def collect_media_group_for_advertisement(
-    advertisement, repo: RequestsRepo
-) -> list[InputMediaPhoto]:
-    """собираем медиа группу для отправки."""
-    advertisement_photos = await get_advertisement_photos(advertisement.id, repo)
-    advertisement_message = realtor_advertisement_completed_text(advertisement)
-    media_group = get_media_group(advertisement_photos, advertisement_message)
-    return media_group
+def get_channel_name_by_operation_type(operation_type: str) -> str:
+    if operation_type == "Аренда":
+        return config.tg_bot.rent_channel_name
+    return config.tg_bot.buy_channel_name
 
 
 def get_channel_name_and_message_by_operation_type(advertisement) -> tuple[str, str]:
-    if advertisement.operation_type.value == "Аренда":
-        channel_name = config.tg_bot.rent_channel_name
+    operation_type = advertisement.operation_type.value
+    channel_name = get_channel_name_by_operation_type(operation_type)
+    if operation_type == "Аренда":
         advertisement_message = rent_channel_advertisement_message(advertisement)
     else:
-        channel_name = config.tg_bot.buy_channel_name
         advertisement_message = buy_channel_advertisement_message(advertisement)
 
     return channel_name, advertisement_message
@@ -0,0 +1,111 @@
+import json
+import logging
+
+from aiogram.types import InputMediaPhoto
+from redis.exceptions import RedisError
+
+from backend.app.config import config
+from infrastructure.cache.redis import get_redis
+from infrastructure.database.repo.requests import RequestsRepo
+from tgbot.templates.advertisement_creation import realtor_advertisement_completed_text
+from tgbot.utils.helpers import (
+    deserialize_media_group,
+    get_channel_name_and_message_by_operation_type,
+    get_media_group,
+    serialize_media_group,
+)
+
+logger = logging.getLogger(__name__)
+
+# увеличиваем при изменении шаблонов, чтобы не отдавать подписи старого вида
+MEDIA_GROUP_TEMPLATE_VERSION = 1
+MEDIA_GROUP_TTL = 60 * 60 * 24
+
+# виды подписей медиа группы
+REALTOR = "realtor"  # карточка для агента и руководителя
+REALTOR_UZ = "realtor_uz"  # карточка с полями на узбекском
+CHANNEL = "channel"  # пост для канала по типу операции
+
+MEDIA_GROUP_KINDS = (REALTOR, REALTOR_UZ, CHANNEL)
+
+
+def _cache_key(advertisement_id: int, kind: str) -> str:
+    return f"media_group:v{MEDIA_GROUP_TEMPLATE_VERSION}:{advertisement_id}:{kind}"
+
+
+def _render_caption(advertisement, kind: str) -> str:
+    if kind == REALTOR:
+        return realtor_advertisement_completed_text(advertisement)
+    if kind == REALTOR_UZ:
+        return realtor_advertisement_completed_text(advertisement, lang="uz")
+    if kind == CHANNEL:
+        _, advertisement_message = get_channel_name_and_message_by_operation_type(
+            advertisement
+        )
+        return advertisement_message
+    raise ValueError(f"Invalid media group kind: {kind}")
+
+
+async def get_advertisement_media_group(
+    advertisement_id: int,
+    kind: str,
+    repo: "RequestsRepo",
+    advertisement=None,
+) -> list[InputMediaPhoto]:
+    """Получаем медиа группу объявления из кеша, собирая ее только при промахе.
+
+    Фотографии отправляются по file_id телеграма, поэтому кешируются только
+    идентификаторы и подпись. ``advertisement`` можно передать, если объявление
+    уже загружено, чтобы не делать повторный запрос в базу.
+    """
+    key = _cache_key(advertisement_id, kind)
+    redis = get_redis(config.redis_config.cache_url)
+
+    try:
+        cached = await redis.get(key)
+    except RedisError as e:
+        logger.warning("media group cache is unavailable: %s", e)
+        cached, redis = None, None
+
+    if cached is not None:
+        return deserialize_media_group(json.loads(cached))
+
+    if advertisement is None:
+        advertisement = await repo.advertisements.get_advertisement_by_id(
+            advertisement_id
+        )
+
+    photos = [
+        image.tg_image_hash
+        for image in sorted(advertisement.images, key=lambda image: image.id)
+        if image.tg_image_hash
+    ]
+    media_group = get_media_group(photos, _render_caption(advertisement, kind))
+
+    if redis is not None:
+        try:
+            await redis.set(
+                key,
+                json.dumps(serialize_media_group(media_group), ensure_ascii=False),
+                ex=MEDIA_GROUP_TTL,
+            )
+        except RedisError as e:
+            logger.warning("media group cache is unavailable: %s", e)
+
+    return media_group
+
+
+async def invalidate_media_groups(*advertisement_ids: int) -> None:
+    """Сбрасываем кеш медиа групп после изменения объявлений."""
+    keys = [
+        _cache_key(advertisement_id, kind)
+        for advertisement_id in advertisement_ids
+        for kind in MEDIA_GROUP_KINDS
+    ]
+    if not keys:
+        return
+
+    try:
+        await get_redis(config.redis_config.cache_url).delete(*keys)
+    except RedisError as e:
+        logger.warning("failed to invalidate media group cache: %s", e)
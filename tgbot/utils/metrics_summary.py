@@ -0,0 +1,28 @@
+import asyncio
+import logging
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+
+from tgbot.middlewares.metrics import summary_window
+from tgbot.templates.messages import bot_metrics_summary_message
+
+logger = logging.getLogger(__name__)
+
+
+async def send_metrics_summaries(bot: Bot, chat_id: int, interval_minutes: int) -> None:
+    """Периодически отправляем сводку по времени обработки апдейтов."""
+    summary_window.reset()
+    while True:
+        await asyncio.sleep(interval_minutes * 60)
+        handlers = summary_window.reset()
+        if not handlers:
+            continue
+        try:
+            await bot.send_message(
+                chat_id,
+                bot_metrics_summary_message(interval_minutes, handlers),
+                parse_mode="HTML",
+            )
+        except TelegramAPIError as e:
+            logger.warning("failed to send metrics summary: %s", e)
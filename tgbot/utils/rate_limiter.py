@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] - ключ ведра, ARGV: rate (токенов в секунду), capacity, cost, ttl
+# возвращает время ожидания в секундах (0 - токены выданы)
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local data = redis.call('HMGET', key, 'tokens', 'ts', 'blocked')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+local blocked = tonumber(data[3]) or 0
+
+if blocked > now then
+    return tostring(blocked - now)
+end
+
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+
+redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', key, ttl)
+return tostring(wait)
+"""
+
+BLOCK_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local blocked = now + tonumber(ARGV[1])
+local current = tonumber(redis.call('HGET', KEYS[1], 'blocked')) or 0
+if blocked > current then
+    redis.call('HSET', KEYS[1], 'blocked', blocked)
+end
+redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[1])) + 60)
+return 1
+"""
+
+BUCKET_TTL = 3600
+# таймауты соединения с Redis, после них работают локальные ведра
+REDIS_TIMEOUT = 0.25
+
+
+class LocalTokenBucket:
+    """Ведро токенов в памяти процесса, используется когда Redis недоступен."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._blocked: dict[str, float] = {}
+
+    def reserve(self, key: str, rate: float, capacity: float, cost: float) -> float:
+        now = time.monotonic()
+
+        blocked = self._blocked.get(key, 0)
+        if blocked > now:
+            return blocked - now
+
+        tokens, ts = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - ts) * rate)
+        wait = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        return wait
+
+    def block(self, key: str, seconds: float) -> None:
+        blocked = time.monotonic() + seconds
+        self._blocked[key] = max(self._blocked.get(key, 0), blocked)
+
+
+class TokenBucketLimiter:
+    """Ограничитель частоты запросов, общий для всех процессов через Redis.
+
+    Если Redis не настроен или недоступен, лимиты соблюдаются только внутри
+    текущего процесса.
+    """
+
+    def __init__(self, redis_url: str | None = None, prefix: str = "rate_limit"):
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self._redis: Redis | None = None
+        self._local = LocalTokenBucket()
+
+    def _get_redis(self) -> Redis | None:
+        if self.redis_url is None:
+            return None
+        if self._redis is None:
+            # недоступный Redis не должен задерживать запросы к Telegram
+            self._redis = Redis.from_url(
+                self.redis_url,
+                socket_connect_timeout=REDIS_TIMEOUT,
+                socket_timeout=REDIS_TIMEOUT,
+            )
+        return self._redis
+
+    async def _reserve(self, key: str, rate: float, capacity: float, cost: float):
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                wait = await redis.eval(
+                    TOKEN_BUCKET_SCRIPT,
+                    1,
+                    f"{self.prefix}:{key}",
+                    rate,
+                    capacity,
+                    cost,
+                    BUCKET_TTL,
+                )
+                return float(wait)
+            except RedisError as e:
+                logger.warning("rate limiter falls back to local buckets: %s", e)
+        return self._local.reserve(key, rate, capacity, cost)
+
+    async def acquire(
+        self, key: str, rate: float, capacity: float, cost: float = 1
+    ) -> None:
+        """Ждем, пока в ведре ``key`` не наберется ``cost`` токенов."""
+        cost = min(cost, capacity)
+        while True:
+            wait = await self._reserve(key, rate, capacity, cost)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def block(self, key: str, seconds: float) -> None:
+        """Запрещаем выдачу токенов из ведра ``key`` на ``seconds`` секунд."""
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                await redis.eval(BLOCK_SCRIPT, 1, f"{self.prefix}:{key}", seconds)
+                return
+            except RedisError as e:
+                logger.warning("rate limiter falls back to local buckets: %s", e)
+        self._local.block(key, seconds)
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
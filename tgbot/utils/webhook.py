@@ -0,0 +1,52 @@
+import asyncio
+import logging
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from config.tg_config import TgBot
+
+logger = logging.getLogger(__name__)
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot, tg_bot: TgBot) -> None:
+    """Принимаем апдейты через вебхук на aiohttp сервере.
+
+    Каждый апдейт обрабатывается в отдельной задаче, а Telegram сразу
+    получает ответ 200, поэтому медленный обработчик не задерживает остальных.
+    """
+
+    async def set_webhook(bot: Bot):
+        await bot.set_webhook(
+            url=tg_bot.webhook_url,
+            secret_token=tg_bot.webhook_secret or None,
+            max_connections=tg_bot.webhook_max_connections,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+
+    dp.startup.register(set_webhook)
+
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        handle_in_background=True,
+        secret_token=tg_bot.webhook_secret or None,
+    ).register(app, path=tg_bot.webhook_path)
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, tg_bot.webhook_host, tg_bot.webhook_port)
+    await site.start()
+    logger.info(
+        "Webhook server listening on %s:%s%s",
+        tg_bot.webhook_host,
+        tg_bot.webhook_port,
+        tg_bot.webhook_path,
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()